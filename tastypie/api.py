@@ -1,13 +1,49 @@
 import warnings
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpResponse, HttpResponseBadRequest
-from tastypie.compat import reverse
+from tastypie.compat import Resolver404, get_script_prefix, reverse
 from tastypie.exceptions import NotRegistered, BadRequest
 from tastypie.serializers import Serializer
 from tastypie.utils import is_valid_jsonp_callback_value, string_to_python, trailing_slash
+from tastypie.utils.http import conditional_response, make_etag
 from tastypie.utils.mime import determine_format, build_content_type
 from tastypie.resources import Resource
+from django.urls import URLResolver
 from django.urls.conf import re_path, include
+from django.urls.resolvers import RegexPattern
+
+
+class ResourceNameResolver(URLResolver):
+    """
+    Routes requests for an ``Api``'s resources by their ``resource_name``.
+
+    Rather than trying every resource's patterns in turn, the path segment
+    after the ``api_name`` is looked up directly & only that resource's
+    patterns are tried. Anything else (custom ``prepend_urls`` on a resource
+    with a differing prefix, unknown names, etc.) falls back to trying all
+    the patterns in order.
+
+    All the patterns are still included, so ``reverse`` works as usual.
+    """
+    def __init__(self, api_name, resource_patterns):
+        super(ResourceNameResolver, self).__init__(RegexPattern(r'^'), [pattern for name, pattern in resource_patterns])
+        self.prefix = '%s/' % api_name
+        self.resource_patterns = dict(resource_patterns)
+
+    def resolve(self, path):
+        path = str(path)
+
+        if path.startswith(self.prefix):
+            resource_name = path[len(self.prefix):].split('/', 1)[0]
+            pattern = self.resource_patterns.get(resource_name)
+
+            if pattern is not None:
+                try:
+                    return pattern.resolve(path)
+                except Resolver404:
+                    pass
+
+        return super(ResourceNameResolver, self).resolve(path)
 
 
 class Api(object):
@@ -21,12 +57,21 @@ class Api(object):
     Optionally supplying ``api_name`` allows you to name the API. Generally,
     this is done with version numbers (i.e. ``v1``, ``v2``, etc.) but can
     be named any string.
+
+    The URL patterns are built once & rebuilt only when resources are
+    registered or unregistered. Passing ``dispatch_by_name=True`` routes
+    requests straight to the resource named in the URL, instead of trying
+    each resource's patterns in turn, which is considerably faster for APIs
+    with many resources.
     """
-    def __init__(self, api_name="v1", serializer_class=Serializer):
+    def __init__(self, api_name="v1", serializer_class=Serializer, dispatch_by_name=False):
         self.api_name = api_name
         self._registry = {}
         self._canonicals = {}
+        self._urls = None
+        self._top_level_cache = {}
         self.serializer = serializer_class()
+        self.dispatch_by_name = dispatch_by_name
 
     def register(self, resource, canonical=True):
         """
@@ -45,6 +90,7 @@ class Api(object):
             raise ImproperlyConfigured("Resource %r must define a 'resource_name'." % resource)
 
         self._registry[resource_name] = resource
+        self.clear_caches()
 
         if canonical is True:
             if resource_name in self._canonicals:
@@ -61,11 +107,26 @@ class Api(object):
         If present, unregisters a resource from the API.
         """
         if resource_name in self._registry:
+            self._registry[resource_name].clear_schema_cache()
             del self._registry[resource_name]
 
+        self.clear_caches()
+
         if resource_name in self._canonicals:
             del self._canonicals[resource_name]
 
+    def clear_caches(self):
+        """
+        Discards the cached URL patterns, top-level documents & the schemas
+        cached by the registered resources, as the related schema URIs may
+        have changed.
+        """
+        self._urls = None
+        self._top_level_cache = {}
+
+        for resource in self._registry.values():
+            resource.clear_schema_cache()
+
     def canonical_resource_for(self, resource_name):
         """
         Returns the canonical resource for a given ``resource_name``.
@@ -100,14 +161,31 @@ class Api(object):
         """
         Provides URLconf details for the ``Api`` and all registered
         ``Resources`` beneath it.
+
+        The patterns are cached until the next ``register``/``unregister``.
+        """
+        if self._urls is None:
+            self._urls = self.build_urls()
+
+        return list(self._urls)
+
+    def build_urls(self):
+        """
+        Builds the URL patterns for the ``Api`` & its resources.
         """
         pattern_list = [
             re_path(r"^(?P<api_name>%s)%s$" % (self.api_name, trailing_slash), self.wrap_view('top_level'), name="api_%s_top_level" % self.api_name),
         ]
+        resource_patterns = []
 
         for name in sorted(self._registry.keys()):
             self._registry[name].api_name = self.api_name
-            pattern_list.append(re_path(r"^(?P<api_name>%s)/" % self.api_name, include(self._registry[name].urls)))
+            resource_patterns.append((name, re_path(r"^(?P<api_name>%s)/" % self.api_name, include(self._registry[name].urls))))
+
+        if self.dispatch_by_name:
+            pattern_list.append(ResourceNameResolver(self.api_name, resource_patterns))
+        else:
+            pattern_list.extend(pattern for name, pattern in resource_patterns)
 
         urlpatterns = self.prepend_urls()
 
@@ -123,15 +201,44 @@ class Api(object):
         """
         A view that returns a serialized list of all resources registers
         to the ``Api``. Useful for discovery.
+
+        The serialized document is cached per format (until a resource is
+        registered or unregistered) & served with an ``ETag``.
         """
         fullschema = request.GET.get('fullschema', False)
         fullschema = string_to_python(fullschema)
 
-        available_resources = {}
-
         if api_name is None:
             api_name = self.api_name
 
+        desired_format = determine_format(request, self.serializer)
+
+        if 'text/javascript' in desired_format:
+            # JSONP output varies by callback, so isn't worth caching.
+            callback = request.GET.get('callback', 'callback')
+
+            if not is_valid_jsonp_callback_value(callback):
+                raise BadRequest('JSONP callback name is invalid.')
+
+            serialized = self.serializer.serialize(self.build_top_level(api_name, fullschema), desired_format, {'callback': callback})
+            return HttpResponse(content=serialized, content_type=build_content_type(desired_format))
+
+        cache_key = (api_name, getattr(self, 'urlconf_namespace', None), bool(fullschema), desired_format, get_script_prefix())
+
+        if cache_key not in self._top_level_cache:
+            serialized = self.serializer.serialize(self.build_top_level(api_name, fullschema), desired_format)
+            self._top_level_cache[cache_key] = (serialized, make_etag(serialized))
+
+        serialized, etag = self._top_level_cache[cache_key]
+        return conditional_response(request, serialized, build_content_type(desired_format), etag)
+
+    def build_top_level(self, api_name, fullschema=False):
+        """
+        Returns the data for the ``top_level`` view, listing the endpoints
+        (& optionally the full schema) of every registered resource.
+        """
+        available_resources = {}
+
         for name, resource in self._registry.items():
             if not fullschema:
                 schema = self._build_reverse_url("api_get_schema", kwargs={
@@ -149,20 +256,7 @@ class Api(object):
                 'schema': schema,
             }
 
-        desired_format = determine_format(request, self.serializer)
-
-        options = {}
-
-        if 'text/javascript' in desired_format:
-            callback = request.GET.get('callback', 'callback')
-
-            if not is_valid_jsonp_callback_value(callback):
-                raise BadRequest('JSONP callback name is invalid.')
-
-            options['callback'] = callback
-
-        serialized = self.serializer.serialize(available_resources, desired_format, options)
-        return HttpResponse(content=serialized, content_type=build_content_type(desired_format))
+        return available_resources
 
     def _build_reverse_url(self, name, args=None, kwargs=None):
         """
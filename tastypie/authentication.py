@@ -2,11 +2,12 @@ import base64
 from hashlib import sha1
 import hmac
 import time
-import uuid
 import warnings
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import authenticate
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 
 from django.utils.translation import gettext as _
@@ -17,21 +18,16 @@ from tastypie.compat import (
     get_user_model, get_username_field, compare_sanitized_tokens, InvalidTokenFormat, check_token_format
 )
 from tastypie.http import HttpUnauthorized
+from tastypie.utils.asynchronous import is_overridden
+from tastypie.utils.imports import LazyImports, optional_import
 
-try:
-    import python_digest
-except ImportError:
-    python_digest = None
-
-try:
-    import oauth2
-except ImportError:
-    oauth2 = None
-
-try:
-    import oauth_provider
-except ImportError:
-    oauth_provider = None
+# The optional dependencies are only imported when first used.
+_imports = LazyImports(globals(), {
+    'python_digest': lambda: {'python_digest': optional_import('python_digest')},
+    'oauth2': lambda: {'oauth2': optional_import('oauth2')},
+    'oauth_provider': lambda: {'oauth_provider': optional_import('oauth_provider')},
+})
+__getattr__ = _imports.get
 
 
 def same_origin(url1, url2):
@@ -51,6 +47,31 @@ def same_origin(url1, url2):
         return False
 
 
+class AuthenticationResult(object):
+    """
+    The outcome of authenticating a request: the backend that accepted it,
+    the user it resolved to & (lazily) the requestor's identifier.
+
+    ``Resource.is_authenticated`` stores one of these on the request, so the
+    rest of the request cycle (throttling, nested resources handed the same
+    request) can reuse it instead of re-parsing the credentials.
+    """
+    def __init__(self, backend, user=None):
+        self.backend = backend
+        self.user = user
+        self._identifier = None
+
+    def get_identifier(self, request):
+        """
+        Returns the backend's identifier for the requestor, computing it only
+        once.
+        """
+        if self._identifier is None:
+            self._identifier = self.backend.get_identifier(request)
+
+        return self._identifier
+
+
 class Authentication(object):
     """
     A simple base class to establish the protocol for auth.
@@ -93,6 +114,19 @@ class Authentication(object):
         """
         return True
 
+    async def ais_authenticated(self, request, **kwargs):
+        """
+        The async counterpart of ``is_authenticated``, used by
+        ``AsyncResource``.
+
+        Runs ``is_authenticated`` in a thread if a subclass overrides it (as
+        it may block) & calls it directly otherwise.
+        """
+        if is_overridden(self, 'is_authenticated', Authentication):
+            return await sync_to_async(self.is_authenticated)(request, **kwargs)
+
+        return self.is_authenticated(request, **kwargs)
+
     def get_identifier(self, request):
         """
         Provides a unique string identifier for the requestor.
@@ -256,6 +290,43 @@ class ApiKeyAuthentication(Authentication):
 
         return key_auth_check
 
+    async def ais_authenticated(self, request, **kwargs):
+        """
+        The async counterpart of ``is_authenticated``, which looks the user
+        (& their key) up with the async ORM.
+
+        Runs ``is_authenticated`` in a thread instead if a subclass overrides
+        it or ``get_key``.
+        """
+        if is_overridden(self, 'is_authenticated', ApiKeyAuthentication) or is_overridden(self, 'get_key', ApiKeyAuthentication):
+            return await sync_to_async(self.is_authenticated)(request, **kwargs)
+
+        try:
+            username, api_key = self.extract_credentials(request)
+        except ValueError:
+            return self._unauthorized()
+
+        if not username or not api_key:
+            return self._unauthorized()
+
+        User = get_user_model()
+
+        try:
+            user = await User.objects.select_related('api_key').aget(**{get_username_field(): username})
+        except (User.DoesNotExist, User.MultipleObjectsReturned):
+            return self._unauthorized()
+
+        if not self.check_active(user):
+            return False
+
+        # The key came with the user, so this doesn't query.
+        key_auth_check = self.get_key(user, api_key)
+
+        if key_auth_check and not isinstance(key_auth_check, HttpUnauthorized):
+            request.user = user
+
+        return key_auth_check
+
     def get_key(self, user, api_key):
         """
         Attempts to find the API key for the user. Uses ``ApiKey`` by default
@@ -299,6 +370,34 @@ class SessionAuthentication(Authentication):
         """
         Checks to make sure the user is logged in & has a Django session.
         """
+        if not self.check_csrf(request):
+            return False
+
+        return request.user.is_authenticated
+
+    async def ais_authenticated(self, request, **kwargs):
+        """
+        The async counterpart of ``is_authenticated``, which loads the user
+        with ``request.auser()`` (on Django 5.0+).
+
+        Runs ``is_authenticated`` in a thread instead if a subclass overrides
+        it.
+        """
+        if is_overridden(self, 'is_authenticated', SessionAuthentication) or not hasattr(request, 'auser'):
+            return await sync_to_async(self.is_authenticated)(request, **kwargs)
+
+        if not self.check_csrf(request):
+            return False
+
+        # Swap the lazy user for the loaded one, so later (sync) access
+        # doesn't hit the database again.
+        request.user = await request.auser()
+        return request.user.is_authenticated
+
+    def check_csrf(self, request):
+        """
+        Checks the CSRF token for requests that aren't safe.
+        """
         # Cargo-culted from Django 1.3/1.4's ``django/middleware/csrf.py``.
         # We can't just use what's there, since the return values will be
         # wrong.
@@ -306,10 +405,10 @@ class SessionAuthentication(Authentication):
         # the serialized bodies.
 
         if request.method in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
-            return request.user.is_authenticated
+            return True
 
         if getattr(request, '_dont_enforce_csrf_checks', False):
-            return request.user.is_authenticated
+            return True
         csrf_token = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
 
         try:
@@ -340,7 +439,7 @@ class SessionAuthentication(Authentication):
         except AssertionError:
             return False
 
-        return request.user.is_authenticated
+        return True
 
     def get_identifier(self, request):
         """
@@ -359,6 +458,10 @@ class DigestAuthentication(Authentication):
     ``authenticate`` method from ``django.contrib.auth``. However, instead of
     the user's password, their API key should be used.
 
+    Nonces may be reused by clients for as long as they're valid, but each
+    use must carry a higher nonce count (``nc``) than the last, which
+    prevents replaying a captured request.
+
     Optional keyword arguments:
 
     ``backend``
@@ -368,31 +471,110 @@ class DigestAuthentication(Authentication):
     ``realm``
         The realm to use in the ``HttpUnauthorized`` response.  Default:
         ``django-tastypie``.
+    ``nonce_timeout``
+        How long (in seconds) a nonce stays valid. Once expired, clients are
+        sent a ``stale`` challenge & should retry with a fresh nonce.
+        Default: ``300``.
+    ``cache_name``
+        The name of the cache (from Django's ``CACHES`` setting) used to
+        track the nonce counts. It should be shared by every process (see
+        the docs). Default: ``default``.
     """
     auth_type = 'digest'
 
-    def __init__(self, backend=None, realm='django-tastypie', **kwargs):
+    def __init__(self, backend=None, realm='django-tastypie', nonce_timeout=300, cache_name='default', **kwargs):
         super(DigestAuthentication, self).__init__(**kwargs)
         self.backend = backend
         self.realm = realm
+        self.nonce_timeout = nonce_timeout
+        self.cache_name = cache_name
+        self._opaque = None
 
-        if python_digest is None:
+        if _imports.get('python_digest') is None:
             raise ImproperlyConfigured(
                 "The 'python_digest' package could not be imported. It is required for use with the 'DigestAuthentication' class.")
 
-    def _unauthorized(self):
+    @property
+    def opaque(self):
+        # Clients hand the ``opaque`` value back untouched, so there's no
+        # need to generate a new one per challenge.
+        if self._opaque is None:
+            self._opaque = hmac.new(settings.SECRET_KEY.encode('utf-8'), self.realm.encode('utf-8'), digestmod=sha1).hexdigest()
+
+        return self._opaque
+
+    def _unauthorized(self, stale=False):
+        python_digest = _imports.get('python_digest')
         response = HttpUnauthorized()
-        new_uuid = uuid.uuid4()
-        opaque = hmac.new(str(new_uuid).encode('utf-8'), digestmod=sha1).hexdigest()
         response['WWW-Authenticate'] = python_digest.build_digest_challenge(
             timestamp=time.time(),
             secret=settings.SECRET_KEY,
             realm=self.realm,
-            opaque=opaque,
-            stale=False
+            opaque=self.opaque,
+            stale=stale
         )
         return response
 
+    def nonce_cache_key(self, nonce, nonce_count=None):
+        if nonce_count is None:
+            return 'tastypie_digest_nonce:%s' % nonce
+
+        return 'tastypie_digest_nonce:%s:%x' % (nonce, nonce_count)
+
+    def _nonce_count(self, digest_response):
+        # ``python_digest`` normally parses ``nc`` to an int already.
+        nonce_count = digest_response.nc
+
+        if isinstance(nonce_count, int):
+            return nonce_count
+
+        return int(nonce_count, 16)
+
+    def check_nonce(self, digest_response):
+        """
+        Checks that the (correctly signed) nonce hasn't expired & that the
+        nonce count is higher than the last one seen for it.
+
+        A nonce the cache has no count for (say, one issued by another
+        process with its own cache) is accepted on its signature alone.
+        """
+        python_digest = _imports.get('python_digest')
+        timestamp = python_digest.get_nonce_timestamp(digest_response.nonce)
+
+        if timestamp is None or time.time() - timestamp > self.nonce_timeout:
+            return False
+
+        try:
+            nonce_count = self._nonce_count(digest_response)
+        except (TypeError, ValueError):
+            return False
+
+        last_count = caches[self.cache_name].get(self.nonce_cache_key(digest_response.nonce))
+        return last_count is None or nonce_count > last_count
+
+    def use_nonce(self, digest_response):
+        """
+        Records the nonce count of a successfully authenticated request,
+        returning ``False`` if it's been used already (a replay).
+
+        Each count is claimed with ``cache.add``, which is atomic, so
+        concurrent replays can't both get through.
+        """
+        cache = caches[self.cache_name]
+        nonce_count = self._nonce_count(digest_response)
+
+        if not cache.add(self.nonce_cache_key(digest_response.nonce, nonce_count), True, self.nonce_timeout):
+            return False
+
+        # The highest count only lets ``check_nonce`` refuse older counts
+        # early, so it doesn't matter if concurrent requests race here.
+        key = self.nonce_cache_key(digest_response.nonce)
+
+        if nonce_count > (cache.get(key) or 0):
+            cache.set(key, nonce_count, self.nonce_timeout)
+
+        return True
+
     def is_authenticated(self, request, **kwargs):
         """
         Finds the user and checks their API key.
@@ -405,16 +587,28 @@ class DigestAuthentication(Authentication):
         except ValueError:
             return self._unauthorized()
 
+        python_digest = _imports.get('python_digest')
         digest_response = python_digest.parse_digest_credentials(request.META['HTTP_AUTHORIZATION'])
 
+        if digest_response is None:
+            return self._unauthorized()
+
         # FIXME: Should the nonce be per-user?
         if not python_digest.validate_nonce(digest_response.nonce, settings.SECRET_KEY):
             return self._unauthorized()
 
+        if not self.check_nonce(digest_response):
+            # Expired or replayed. Ask for a fresh nonce.
+            return self._unauthorized(stale=True)
+
         user = self.get_user(digest_response.username)
+
+        if user is False:
+            return self._unauthorized()
+
         api_key = self.get_key(user)
 
-        if user is False or api_key is False:
+        if api_key is False:
             return self._unauthorized()
 
         expected = python_digest.calculate_request_digest(
@@ -425,6 +619,9 @@ class DigestAuthentication(Authentication):
         if not digest_response.response == expected:
             return self._unauthorized()
 
+        if not self.use_nonce(digest_response):
+            return self._unauthorized(stale=True)
+
         if not self.check_active(user):
             return False
 
@@ -432,12 +629,15 @@ class DigestAuthentication(Authentication):
         return True
 
     def get_user(self, username):
+        """
+        Fetches the user, along with their API key in the same query.
+        """
         username_field = get_username_field()
         User = get_user_model()
 
         try:
             lookup_kwargs = {username_field: username}
-            user = User.objects.get(**lookup_kwargs)
+            user = User.objects.select_related('api_key').get(**lookup_kwargs)
         except (User.DoesNotExist, User.MultipleObjectsReturned):
             return False
 
@@ -454,7 +654,7 @@ class DigestAuthentication(Authentication):
         from tastypie.models import ApiKey
 
         try:
-            key = ApiKey.objects.get(user=user)
+            key = user.api_key
         except ApiKey.DoesNotExist:
             return False
 
@@ -485,16 +685,18 @@ class OAuthAuthentication(Authentication):
     def __init__(self, **kwargs):
         super(OAuthAuthentication, self).__init__(**kwargs)
 
-        if oauth2 is None:
+        if _imports.get('oauth2') is None:
             raise ImproperlyConfigured(
                 "The 'python-oauth2' package could not be imported. It is required for use with the 'OAuthAuthentication' class.")
 
-        if oauth_provider is None:
+        if _imports.get('oauth_provider') is None:
             raise ImproperlyConfigured(
                 "The 'django-oauth-plus' package could not be imported. It is required for use with the 'OAuthAuthentication' class.")
 
     def is_authenticated(self, request, **kwargs):
         from oauth_provider.store import store
+        oauth2 = _imports.get('oauth2')
+        oauth_provider = _imports.get('oauth_provider')
 
         if self.is_valid_request(request):
             oauth_request = oauth_provider.utils.get_oauth_request(request)
@@ -550,6 +752,7 @@ class OAuthAuthentication(Authentication):
                 or self.is_in(request.GET))
 
     def validate_token(self, request, consumer, token):
+        oauth_provider = _imports.get('oauth_provider')
         oauth_server, oauth_request = oauth_provider.utils.initialize_server_request(request)
         return oauth_server.verify_request(oauth_request, consumer, token)
 
@@ -584,6 +787,25 @@ class MultiAuthentication(object):
 
         return unauthorized
 
+    async def ais_authenticated(self, request, **kwargs):
+        """
+        The async counterpart of ``is_authenticated``, trying each backend's
+        ``ais_authenticated`` in order.
+        """
+        unauthorized = False
+
+        for backend in self.backends:
+            check = await backend.ais_authenticated(request, **kwargs)
+
+            if check:
+                if isinstance(check, HttpUnauthorized):
+                    unauthorized = unauthorized or check
+                else:
+                    request._authentication_backend = backend
+                    return check
+
+        return unauthorized
+
     def get_identifier(self, request):
         """
         Provides a unique string identifier for the requestor.
@@ -1,5 +1,8 @@
+from asgiref.sync import sync_to_async
+
 from tastypie.exceptions import Unauthorized
 from tastypie.compat import get_module_name
+from tastypie.utils.asynchronous import is_overridden
 
 
 class Authorization(object):
@@ -34,6 +37,30 @@ class Authorization(object):
         """
         return True
 
+    async def aread_list(self, object_list, bundle):
+        """
+        The async counterpart of ``read_list``, used by ``AsyncResource``.
+
+        Runs ``read_list`` in a thread if a subclass overrides it (as it may
+        query) & calls it directly otherwise.
+        """
+        if is_overridden(self, 'read_list', Authorization):
+            return await sync_to_async(self.read_list)(object_list, bundle)
+
+        return self.read_list(object_list, bundle)
+
+    async def aread_detail(self, object_list, bundle):
+        """
+        The async counterpart of ``read_detail``, used by ``AsyncResource``.
+
+        Runs ``read_detail`` in a thread if a subclass overrides it & calls it
+        directly otherwise.
+        """
+        if is_overridden(self, 'read_detail', Authorization):
+            return await sync_to_async(self.read_detail)(object_list, bundle)
+
+        return self.read_detail(object_list, bundle)
+
     def create_list(self, object_list, bundle):
         """
         Unimplemented, as Tastypie never creates entire new lists, but
@@ -88,6 +115,27 @@ class Authorization(object):
         """
         return True
 
+    def batch_detail(self, action, object_list, bundles):
+        """
+        Checks ``action`` (one of ``read``, ``create``, ``update`` or
+        ``delete``) for a whole batch of bundles at once, such as the objects
+        of a ``PUT``/``PATCH`` to a list endpoint.
+
+        Returns ``True`` if every bundle is allowed or throws ``Unauthorized``
+        if any of them is not.
+
+        By default, this simply runs the matching ``<action>_detail`` check
+        for each bundle. Override it if your rules can be decided for many
+        objects at once.
+        """
+        check = getattr(self, '%s_detail' % action)
+
+        for bundle in bundles:
+            if not check(object_list, bundle):
+                raise Unauthorized("You are not allowed to access that resource.")
+
+        return True
+
 
 class ReadOnlyAuthorization(Authorization):
     """
@@ -135,6 +183,47 @@ class DjangoAuthorization(Authorization):
     # https://docs.djangoproject.com/es/1.9/topics/auth/default/#permissions-and-authorization
     READ_PERM_CODE = 'change'
 
+    # Permission names only depend on the model & the code, so they're built
+    # once per model & shared by every instance.
+    _permission_names = {}
+
+    def __get__(self, instance, owner):
+        authorization = super(DjangoAuthorization, self).__get__(instance, owner)
+        object_class = getattr(instance, 'object_class', None)
+
+        if object_class is not None and object_class not in self._permission_names:
+            self.permission_names(object_class)
+
+        return authorization
+
+    def permission_names(self, model_klass):
+        """
+        Returns a dictionary mapping each permission code (``add``, ``change``,
+        ``delete``, ``view`` & ``READ_PERM_CODE``) to the full permission name
+        (``app_label.code_model``) for ``model_klass``.
+        """
+        try:
+            return self._permission_names[model_klass]
+        except KeyError:
+            pass
+
+        opts = model_klass._meta
+        codes = set(['add', 'change', 'delete', 'view', self.READ_PERM_CODE])
+        names = {
+            code: '%s.%s_%s' % (opts.app_label, code, get_module_name(opts))
+            for code in codes
+        }
+        self._permission_names[model_klass] = names
+        return names
+
+    def permission_name(self, model_klass, code):
+        names = self.permission_names(model_klass)
+
+        try:
+            return names[code]
+        except KeyError:
+            return '%s.%s_%s' % (model_klass._meta.app_label, code, get_module_name(model_klass._meta))
+
     def base_checks(self, request, model_klass):
         # If it doesn't look like a model, we can't check permissions.
         if not model_klass or not getattr(model_klass, '_meta', None):
@@ -149,18 +238,40 @@ class DjangoAuthorization(Authorization):
     def check_user_perm(self, user, permission, obj_or_list):
         return user.has_perm(permission)
 
+    def cached_check_user_perm(self, request, permission, obj_or_list):
+        """
+        A version of ``check_user_perm`` that remembers the answer on the
+        request, so each permission is only checked once per user per
+        request no matter how many objects a bulk write touches.
+
+        Not cached if ``check_user_perm`` is overridden, as it may then
+        vary per object.
+        """
+        user = request.user
+
+        if is_overridden(self, 'check_user_perm', DjangoAuthorization):
+            return self.check_user_perm(user, permission, obj_or_list)
+
+        cache = getattr(request, '_tastypie_perms', None)
+
+        if cache is None or cache[0] is not user:
+            cache = (user, {})
+            request._tastypie_perms = cache
+
+        try:
+            return cache[1][permission]
+        except KeyError:
+            allowed = cache[1][permission] = self.check_user_perm(user, permission, obj_or_list)
+            return allowed
+
     def perm_list_checks(self, request, code, obj_list):
         klass = self.base_checks(request, obj_list.model)
         if klass is False:
             return []
 
-        permission = '%s.%s_%s' % (
-            klass._meta.app_label,
-            code,
-            get_module_name(klass._meta)
-        )
+        permission = self.permission_name(klass, code)
 
-        if self.check_user_perm(request.user, permission, obj_list):
+        if self.cached_check_user_perm(request, permission, obj_list):
             return obj_list
 
         return obj_list.none()
@@ -170,17 +281,46 @@ class DjangoAuthorization(Authorization):
         if klass is False:
             raise Unauthorized("You are not allowed to access that resource.")
 
-        permission = '%s.%s_%s' % (
-            klass._meta.app_label,
-            code,
-            get_module_name(klass._meta)
-        )
+        permission = self.permission_name(klass, code)
 
-        if self.check_user_perm(request.user, permission, obj):
+        if self.cached_check_user_perm(request, permission, obj):
             return True
 
         raise Unauthorized("You are not allowed to access that resource.")
 
+    def batch_detail(self, action, object_list, bundles):
+        """
+        Checks ``action`` for a batch of bundles with a single permission
+        check per model, as Django's permissions don't vary per object.
+
+        Falls back to checking each bundle if a subclass overrides the
+        per-object checks (such as ``update_detail`` or ``check_user_perm``),
+        as those may vary per object.
+        """
+        per_object = ('%s_detail' % action, 'perm_obj_checks', 'check_user_perm')
+
+        if any(is_overridden(self, name, DjangoAuthorization) for name in per_object):
+            return super(DjangoAuthorization, self).batch_detail(action, object_list, bundles)
+
+        codes = {
+            'read': self.READ_PERM_CODE,
+            'create': 'add',
+            'update': 'change',
+            'delete': 'delete',
+        }
+        seen = set()
+
+        for bundle in bundles:
+            klass = bundle.obj.__class__
+
+            if klass in seen:
+                continue
+
+            self.perm_obj_checks(bundle.request, codes[action], bundle.obj)
+            seen.add(klass)
+
+        return True
+
     def read_list(self, object_list, bundle):
         return self.perm_list_checks(bundle.request, self.READ_PERM_CODE, object_list)
 
@@ -204,3 +344,119 @@ class DjangoAuthorization(Authorization):
 
     def delete_detail(self, object_list, bundle):
         return self.perm_obj_checks(bundle.request, 'delete', bundle.obj)
+
+
+class RowLevelAuthorization(Authorization):
+    """
+    Row-level authorization, with the rules expressed as ``Q`` objects so
+    they can be applied by the database rather than object-by-object in
+    Python.
+
+    Subclasses implement ``rule``, which is given the ``bundle`` & returns
+    the ``Q`` object a row must match to be accessible. Override
+    ``read_rule``, ``update_rule`` or ``delete_rule`` for rules that differ
+    per action. For example::
+
+        class OwnerAuthorization(RowLevelAuthorization):
+            def rule(self, bundle):
+                return Q(owner=bundle.request.user)
+
+    The ``*_list`` variants filter the ``QuerySet``. The ``*_detail``
+    variants (and ``batch_detail``, for bulk requests) check all their
+    bundles with a single ``COUNT`` query.
+
+    As there's no row to match a new object against, creates are refused;
+    override ``create_detail`` to allow them.
+    """
+    def rule(self, bundle):
+        """
+        Returns the ``Q`` object a row must match to be accessible.
+
+        This needs to be implemented at the user level.
+        """
+        raise NotImplementedError()
+
+    def read_rule(self, bundle):
+        return self.rule(bundle)
+
+    def update_rule(self, bundle):
+        return self.rule(bundle)
+
+    def delete_rule(self, bundle):
+        return self.rule(bundle)
+
+    def get_queryset(self, object_list, bundles):
+        """
+        Returns the ``QuerySet`` the detail checks are run against.
+
+        Uses ``object_list`` when it's an (unsliced) ``QuerySet``, falling
+        back to the default manager of the bundles' model.
+        """
+        if hasattr(object_list, 'filter') and hasattr(object_list, 'model'):
+            if not getattr(object_list.query, 'is_sliced', False):
+                return object_list
+
+        return bundles[0].obj.__class__._default_manager.all()
+
+    def read_list(self, object_list, bundle):
+        return object_list.filter(self.read_rule(bundle))
+
+    async def aread_list(self, object_list, bundle):
+        # Filtering doesn't query, so this only needs a thread if
+        # ``read_list`` itself is overridden.
+        if is_overridden(self, 'read_list', RowLevelAuthorization):
+            return await sync_to_async(self.read_list)(object_list, bundle)
+
+        return self.read_list(object_list, bundle)
+
+    def read_detail(self, object_list, bundle):
+        return self.batch_detail('read', object_list, [bundle])
+
+    def create_list(self, object_list, bundle):
+        return []
+
+    def create_detail(self, object_list, bundle):
+        raise Unauthorized("You are not allowed to access that resource.")
+
+    def update_list(self, object_list, bundle):
+        return object_list.filter(self.update_rule(bundle))
+
+    def update_detail(self, object_list, bundle):
+        return self.batch_detail('update', object_list, [bundle])
+
+    def delete_list(self, object_list, bundle):
+        return object_list.filter(self.delete_rule(bundle))
+
+    def delete_detail(self, object_list, bundle):
+        return self.batch_detail('delete', object_list, [bundle])
+
+    def batch_detail(self, action, object_list, bundles):
+        """
+        Checks every bundle against the rule for ``action`` with one
+        ``filter(pk__in=..., rule).count()`` query.
+        """
+        if action == 'create':
+            return super(RowLevelAuthorization, self).batch_detail(action, object_list, bundles)
+
+        if not bundles:
+            return True
+
+        pks = set(bundle.obj.pk for bundle in bundles)
+
+        if None in pks:
+            if action != 'read':
+                raise Unauthorized("You are not allowed to access that resource.")
+
+            # Nothing saved to match against, such as for the schema.
+            pks.discard(None)
+
+            if not pks:
+                return True
+
+        rule = getattr(self, '%s_rule' % action)(bundles[0])
+        queryset = self.get_queryset(object_list, bundles)
+
+        if queryset.filter(rule, pk__in=pks).values('pk').distinct().count() != len(pks):
+            raise Unauthorized("You are not allowed to access that resource.")
+
+        return True
@@ -10,6 +10,31 @@ class Bundle(object):
     Necessary because the ``dehydrate/hydrate`` cycle needs to access data at
     different points.
     """
+    __slots__ = (
+        'obj',
+        'data',
+        'related_obj',
+        'related_name',
+        'via_uri',
+        # The ``(action, pk)`` pairs already authorized for this bundle as
+        # part of a batch, so the per-object check can be skipped.
+        'preauthorized',
+        # The ``SparseFieldset`` restricting which fields get dehydrated, if
+        # any.
+        'fieldset',
+        # Field values already dehydrated for a whole page at once, by name.
+        'predehydrated',
+        # The fields a ``PATCH`` changed, set by ``update_in_place``.
+        'update_fields',
+        'm2m_update_fields',
+        '_request',
+        '_errors',
+        '_objects_saved',
+        '_related_objects_to_save',
+        # Still allows setting other attributes in custom code.
+        '__dict__',
+    )
+
     def __init__(self,
                  obj=None,
                  data=None,
@@ -22,13 +47,62 @@ class Bundle(object):
                  ):
         self.obj = obj
         self.data = data or {}
-        self.request = request or HttpRequest()
         self.related_obj = related_obj
         self.related_name = related_name
-        self.errors = {}
-        self.objects_saved = objects_saved or set()
-        self.related_objects_to_save = related_objects_to_save or {}
         self.via_uri = via_uri
+        self.preauthorized = frozenset()
+        self.fieldset = None
+        self.predehydrated = None
+        # Most bundles never touch these, so they're only created when
+        # first needed.
+        self._request = request or None
+        self._errors = None
+        self._objects_saved = objects_saved or None
+        self._related_objects_to_save = related_objects_to_save or None
+
+    @property
+    def request(self):
+        if self._request is None:
+            self._request = HttpRequest()
+
+        return self._request
+
+    @request.setter
+    def request(self, request):
+        self._request = request
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            self._errors = {}
+
+        return self._errors
+
+    @errors.setter
+    def errors(self, errors):
+        self._errors = errors
+
+    @property
+    def objects_saved(self):
+        if self._objects_saved is None:
+            self._objects_saved = set()
+
+        return self._objects_saved
+
+    @objects_saved.setter
+    def objects_saved(self, objects_saved):
+        self._objects_saved = objects_saved
+
+    @property
+    def related_objects_to_save(self):
+        if self._related_objects_to_save is None:
+            self._related_objects_to_save = {}
+
+        return self._related_objects_to_save
+
+    @related_objects_to_save.setter
+    def related_objects_to_save(self, related_objects_to_save):
+        self._related_objects_to_save = related_objects_to_save
 
     def __repr__(self):
         repr_string = "<Bundle for obj: '%r' and with data: '%r'>"
@@ -1,5 +1,8 @@
+from asgiref.sync import sync_to_async
 from django.core.cache import caches
 
+from tastypie.utils.asynchronous import is_overridden
+
 
 class NoCache(object):
     """
@@ -30,6 +33,27 @@ class NoCache(object):
         """
         pass
 
+    async def aget(self, key):
+        """
+        The async counterpart of ``get``, used by ``AsyncResource``.
+
+        Runs ``get`` in a thread if a subclass overrides it & calls it
+        directly otherwise.
+        """
+        if is_overridden(self, 'get', NoCache):
+            return await sync_to_async(self.get)(key)
+
+        return self.get(key)
+
+    async def aset(self, key, value, timeout=60):
+        """
+        The async counterpart of ``set``, used by ``AsyncResource``.
+        """
+        if is_overridden(self, 'set', NoCache):
+            return await sync_to_async(self.set)(key, value, timeout)
+
+        return self.set(key, value, timeout)
+
     def cacheable(self, request, response):
         """
         Returns True or False if the request -> response is capable of being
@@ -82,6 +106,27 @@ class SimpleCache(NoCache):
 
         self.cache.set(key, value, timeout)
 
+    async def aget(self, key, **kwargs):
+        """
+        The async counterpart of ``get``, using Django's async cache API.
+        """
+        if is_overridden(self, 'get', SimpleCache):
+            return await sync_to_async(self.get)(key, **kwargs)
+
+        return await self.cache.aget(key, **kwargs)
+
+    async def aset(self, key, value, timeout=None):
+        """
+        The async counterpart of ``set``, using Django's async cache API.
+        """
+        if is_overridden(self, 'set', SimpleCache):
+            return await sync_to_async(self.set)(key, value, timeout)
+
+        if timeout is None:
+            timeout = self.timeout
+
+        await self.cache.aset(key, value, timeout)
+
     def cache_control(self):
         control = {
             'max_age': self.timeout,
@@ -99,6 +99,14 @@ class InvalidSortError(BadRequest):
     pass
 
 
+class QueryTooExpensive(BadRequest):
+    """
+    Raised when the end user's filtering or ordering would be too expensive
+    for the database, as decided by the resource's ``Meta.query_cost``.
+    """
+    pass
+
+
 class ImmediateHttpResponse(TastypieError):
     """
     This exception is used to interrupt the flow of processing to immediately
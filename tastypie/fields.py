@@ -1,11 +1,14 @@
+import copy
 import datetime
 from dateutil.parser import parse
 import decimal
 from decimal import Decimal
 import importlib
 
-from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, MultipleObjectsReturned
 from django.db import models
+from django.db.models import prefetch_related_objects
 try:
     from django.db.models.fields.related import\
         SingleRelatedObjectDescriptor as ReverseOneToOneDescriptor
@@ -32,6 +35,9 @@ class ApiField(object):
     is_related = False
     dehydrated_type = 'string'
     help_text = ''
+    # The type ``convert`` passes through untouched, which lets
+    # ``convert_column`` skip converting values that already have it.
+    column_type = None
 
     def __init__(self, attribute=None, default=NOT_PROVIDED, null=False, blank=False, readonly=False, unique=False, help_text=None, use_in='all', verbose_name=None):
         """
@@ -157,6 +163,24 @@ class ApiField(object):
         """
         return value
 
+    def convert_column(self, values):
+        """
+        Converts a whole column of values, as ``convert`` would each of them.
+
+        Values that already have the field's ``column_type`` are passed
+        through as-is, unless ``convert`` has been overridden since.
+        """
+        convert = self.convert
+        column_type = self.column_type
+
+        if column_type is not None:
+            owner = next(klass for klass in type(self).__mro__ if 'column_type' in vars(klass))
+
+            if owner.convert is type(self).convert:
+                return [value if value.__class__ is column_type else convert(value) for value in values]
+
+        return [convert(value) for value in values]
+
     def hydrate(self, bundle):
         """
         Takes data stored in the bundle for the field and returns it. Used for
@@ -207,6 +231,7 @@ class CharField(ApiField):
     """
     dehydrated_type = 'string'
     help_text = 'Unicode string data. Ex: "Hello World"'
+    column_type = str
 
     def convert(self, value):
         if value is None:
@@ -245,6 +270,7 @@ class IntegerField(ApiField):
     """
     dehydrated_type = 'integer'
     help_text = 'Integer data. Ex: 2673'
+    column_type = int
 
     def convert(self, value):
         if value is None:
@@ -259,6 +285,7 @@ class FloatField(ApiField):
     """
     dehydrated_type = 'float'
     help_text = 'Floating point numeric data. Ex: 26.73'
+    column_type = float
 
     def convert(self, value):
         if value is None:
@@ -273,6 +300,7 @@ class DecimalField(ApiField):
     """
     dehydrated_type = 'decimal'
     help_text = 'Fixed precision numeric data. Ex: 26.73'
+    column_type = Decimal
 
     def convert(self, value):
         if value is None:
@@ -300,6 +328,7 @@ class BooleanField(ApiField):
     """
     dehydrated_type = 'boolean'
     help_text = 'Boolean data. Ex: True'
+    column_type = bool
 
     def convert(self, value):
         if value is None:
@@ -314,6 +343,7 @@ class ListField(ApiField):
     """
     dehydrated_type = 'list'
     help_text = "A list of data. Ex: ['abc', 26.73, 8]"
+    column_type = list
 
     def convert(self, value):
         if value is None:
@@ -328,6 +358,7 @@ class DictField(ApiField):
     """
     dehydrated_type = 'dict'
     help_text = "A dictionary of data. Ex: {'price': 26.73, 'name': 'Daniel'}"
+    column_type = dict
 
     def convert(self, value):
         if value is None:
@@ -342,6 +373,7 @@ class DateField(ApiField):
     """
     dehydrated_type = 'date'
     help_text = 'A date as a string. Ex: "2010-11-10"'
+    column_type = datetime.date
 
     def convert(self, value):
         if value is None:
@@ -379,6 +411,7 @@ class DateTimeField(ApiField):
     """
     dehydrated_type = 'datetime'
     help_text = 'A date & time as a string. Ex: "2010-11-10T03:07:43"'
+    column_type = datetime.datetime
 
     def convert(self, value):
         if value is None:
@@ -432,7 +465,7 @@ class RelatedField(ApiField):
     is_related = True
     help_text = 'A related resource. Can be either a URI or set of nested resource data.'
 
-    def __init__(self, to, attribute, related_name=None, default=NOT_PROVIDED, null=False, blank=False, readonly=False, full=False, unique=False, help_text=None, use_in='all', verbose_name=None, full_list=True, full_detail=True):
+    def __init__(self, to, attribute, related_name=None, default=NOT_PROVIDED, null=False, blank=False, readonly=False, full=False, unique=False, help_text=None, use_in='all', verbose_name=None, full_list=True, full_detail=True, memoize=True):
 
         """
         Builds the field and prepares it to access to related data.
@@ -491,6 +524,13 @@ class RelatedField(ApiField):
         resource. Accepts ``True``, ``False`` or a callable that accepts a
         bundle and returns ``True`` or ``False``.Depends on ``full``
         being ``True``. Defaults to ``True``.
+
+        Optionally accepts ``memoize``, which indicates whether the dehydrated
+        data for a related object may be reused when the same object shows up
+        again in the same response (i.e. many notes by one author). Each
+        parent still gets its own copy, so a ``dehydrate`` method may change
+        it. Set it to ``False`` if the related data depends on the parent
+        object. Defaults to ``True``.
         """
         super(RelatedField, self).__init__(attribute=attribute, default=default, null=null, blank=blank, readonly=readonly, unique=unique, help_text=help_text, use_in=use_in, verbose_name=verbose_name)
         self.related_name = related_name
@@ -500,9 +540,41 @@ class RelatedField(ApiField):
         self.full = full
         self.full_list = full_list if callable(full_list) else lambda bundle: full_list
         self.full_detail = full_detail if callable(full_detail) else lambda bundle: full_detail
+        self.memoize = memoize
+
+        # Set to override the ``api_name``/``resource_name`` of the resource
+        # the field belongs to.
+        self._api_name = None
+        self._resource_name = None
+
+    @property
+    def api_name(self):
+        if self._api_name is None and self._resource is not None:
+            return self._resource._meta.api_name
+
+        return self._api_name
+
+    @api_name.setter
+    def api_name(self, api_name):
+        self._api_name = api_name
+
+    @property
+    def resource_name(self):
+        if self._resource_name is None and self._resource is not None:
+            return self._resource._meta.resource_name
+
+        return self._resource_name
 
-        self.api_name = None
-        self.resource_name = None
+    @resource_name.setter
+    def resource_name(self, resource_name):
+        self._resource_name = resource_name
+
+    def contribute_to_class(self, cls, name):
+        super(RelatedField, self).contribute_to_class(cls, name)
+        # Subclasses get a copy of the field, which mustn't keep what was
+        # looked up for the parent (like ``'self'``).
+        self._to_class = None
+        self._rel_resources = {}
 
     def get_related_resource(self, related_instance):
         """
@@ -566,18 +638,147 @@ class RelatedField(ApiField):
         from ``full_dehydrate`` for the related resource.
         """
         should_dehydrate_full_resource = self.should_full_dehydrate(bundle, for_list=for_list)
+        memo = self.get_dehydration_memo(bundle)
+        memo_key = None
+
+        if memo is not None:
+            memo_key = self.dehydration_memo_key(bundle, related_resource, for_list, should_dehydrate_full_resource)
+
+            if memo_key in memo:
+                return self.copy_dehydrated(memo[memo_key])
 
         if not should_dehydrate_full_resource:
             # Be a good netizen.
-            return related_resource.get_resource_uri(bundle)
+            dehydrated = related_resource.get_resource_uri(bundle)
         else:
             # ZOMG extra data and big payloads.
-            bundle = related_resource.build_bundle(
-                obj=bundle.obj,
-                request=bundle.request,
-                objects_saved=bundle.objects_saved
-            )
-            return related_resource.full_dehydrate(bundle)
+            bundle = self.build_related_bundle(bundle, related_resource)
+            dehydrated = related_resource.full_dehydrate(bundle)
+
+        if memo_key is not None:
+            memo[memo_key] = dehydrated
+            return self.copy_dehydrated(dehydrated)
+
+        return dehydrated
+
+    async def adehydrate_related(self, bundle, related_resource, for_list=True):
+        """
+        The async counterpart of ``dehydrate_related``, which uses
+        ``afull_dehydrate`` if the related resource is an ``AsyncResource``
+        (& ``full_dehydrate`` in a thread otherwise).
+        """
+        should_dehydrate_full_resource = self.should_full_dehydrate(bundle, for_list=for_list)
+        memo = self.get_dehydration_memo(bundle)
+        memo_key = None
+
+        if memo is not None:
+            memo_key = self.dehydration_memo_key(bundle, related_resource, for_list, should_dehydrate_full_resource)
+
+            if memo_key in memo:
+                return self.copy_dehydrated(memo[memo_key])
+
+        if not should_dehydrate_full_resource:
+            dehydrated = related_resource.get_resource_uri(bundle)
+        else:
+            bundle = self.build_related_bundle(bundle, related_resource)
+            afull_dehydrate = getattr(related_resource, 'afull_dehydrate', None)
+
+            if afull_dehydrate is None:
+                dehydrated = await sync_to_async(related_resource.full_dehydrate)(bundle)
+            else:
+                dehydrated = await afull_dehydrate(bundle)
+
+        if memo_key is not None:
+            memo[memo_key] = dehydrated
+            return self.copy_dehydrated(dehydrated)
+
+        return dehydrated
+
+    def build_related_bundle(self, bundle, related_resource):
+        """
+        Builds the bundle the related resource fully dehydrates.
+        """
+        fieldset = bundle.fieldset
+        bundle = related_resource.build_bundle(
+            obj=bundle.obj,
+            request=bundle.request,
+            objects_saved=bundle.objects_saved
+        )
+        bundle.fieldset = fieldset
+        return bundle
+
+    async def adehydrate(self, bundle, for_list=True):
+        """
+        The async counterpart of ``dehydrate``, which ``AsyncResource`` uses
+        to resolve fields with an async ``attribute`` concurrently.
+
+        Runs ``dehydrate`` in a thread by default.
+        """
+        return await sync_to_async(self.dehydrate)(bundle, for_list=for_list)
+
+    def dehydrate_many(self, bundles, for_list=True):
+        """
+        Dehydrates the field for a whole page of ``bundles`` at once.
+
+        Should return a list of the dehydrated values, in the same order as
+        ``bundles``, or ``None`` to have each bundle dehydrated on its own
+        (via ``dehydrate``), which is what this default does.
+        """
+        return None
+
+    def get_dehydration_memo(self, bundle):
+        """
+        Returns the dictionary of related objects already dehydrated for the
+        current response, or ``None`` if they shouldn't be reused.
+
+        The memo is set up by the ``GET`` views of ``Resource``.
+        """
+        if not self.memoize:
+            return None
+
+        return getattr(bundle.request, '_tastypie_dehydrated', None)
+
+    def copy_dehydrated(self, dehydrated):
+        """
+        Returns a copy of memoized dehydrated data for one parent, so changing
+        it (say, in the parent's ``dehydrate``) doesn't change it for the
+        others.
+
+        Bundles (including those nested in their data) get their own shallow
+        copy of ``data``.
+        """
+        if isinstance(dehydrated, Bundle):
+            dehydrated = copy.copy(dehydrated)
+            dehydrated.data = self.copy_dehydrated(dehydrated.data)
+        elif isinstance(dehydrated, dict):
+            dehydrated = {key: self.copy_dehydrated(value) for key, value in dehydrated.items()}
+        elif isinstance(dehydrated, list):
+            dehydrated = [self.copy_dehydrated(value) for value in dehydrated]
+
+        return dehydrated
+
+    def dehydration_memo_key(self, bundle, related_resource, for_list, full):
+        """
+        Returns the key identifying the dehydrated data for the related
+        object in the memo, or ``None`` if it can't be told apart.
+        """
+        pk = getattr(bundle.obj, 'pk', None)
+
+        if pk is None:
+            return None
+
+        fieldset_key = bundle.fieldset.key if bundle.fieldset is not None else None
+        return (type(related_resource), type(bundle.obj), pk, for_list, full, fieldset_key)
+
+    def child_fieldset(self, bundle):
+        """
+        Returns the ``SparseFieldset`` for the related resource, based on the
+        selection for the parent ``bundle``.
+        """
+        if bundle.fieldset is None:
+            return None
+
+        return bundle.fieldset.child(self.instance_name)
 
     def resource_from_uri(self, fk_resource, uri, request=None, related_obj=None, related_name=None):
         """
@@ -726,13 +927,13 @@ class ToOneField(RelatedField):
     def __init__(self, to, attribute, related_name=None, default=NOT_PROVIDED,
                  null=False, blank=False, readonly=False, full=False,
                  unique=False, help_text=None, use_in='all', verbose_name=None,
-                 full_list=True, full_detail=True):
+                 full_list=True, full_detail=True, memoize=True):
         super(ToOneField, self).__init__(
             to, attribute, related_name=related_name, default=default,
             null=null, blank=blank, readonly=readonly, full=full,
             unique=unique, help_text=help_text, use_in=use_in,
             verbose_name=verbose_name, full_list=full_list,
-            full_detail=full_detail
+            full_detail=full_detail, memoize=memoize
         )
 
     def contribute_to_class(self, cls, name):
@@ -751,7 +952,10 @@ class ToOneField(RelatedField):
     def dehydrate(self, bundle, for_list=True):
         foreign_obj = None
 
-        if callable(self.attribute):
+        if iscoroutinefunction(self.attribute):
+            previous_obj = bundle.obj
+            foreign_obj = async_to_sync(self.attribute)(bundle)
+        elif callable(self.attribute):
             previous_obj = bundle.obj
             foreign_obj = self.attribute(bundle)
         elif isinstance(self.attribute, str):
@@ -774,8 +978,29 @@ class ToOneField(RelatedField):
 
         fk_resource = self.get_related_resource(foreign_obj)
         fk_bundle = Bundle(obj=foreign_obj, request=bundle.request)
+        fk_bundle.fieldset = self.child_fieldset(bundle)
         return self.dehydrate_related(fk_bundle, fk_resource, for_list=for_list)
 
+    async def adehydrate(self, bundle, for_list=True):
+        """
+        Awaits an async ``attribute`` (like a call to another service) & the
+        related resource's ``afull_dehydrate``.
+        """
+        if not iscoroutinefunction(self.attribute):
+            return await super(ToOneField, self).adehydrate(bundle, for_list=for_list)
+
+        foreign_obj = await self.attribute(bundle)
+
+        if not foreign_obj:
+            if not self.null:
+                raise ApiFieldError("The related resource for resource %s could not be found." % (bundle.obj))
+            return None
+
+        fk_resource = self.get_related_resource(foreign_obj)
+        fk_bundle = Bundle(obj=foreign_obj, request=bundle.request)
+        fk_bundle.fieldset = self.child_fieldset(bundle)
+        return await self.adehydrate_related(fk_bundle, fk_resource, for_list=for_list)
+
     def hydrate(self, bundle):
         value = super(ToOneField, self).hydrate(bundle)
 
@@ -815,13 +1040,13 @@ class ToManyField(RelatedField):
     def __init__(self, to, attribute, related_name=None, default=NOT_PROVIDED,
                  null=False, blank=False, readonly=False, full=False,
                  unique=False, help_text=None, use_in='all', verbose_name=None,
-                 full_list=True, full_detail=True):
+                 full_list=True, full_detail=True, memoize=True):
         super(ToManyField, self).__init__(
             to, attribute, related_name=related_name, default=default,
             null=null, blank=blank, readonly=readonly, full=full,
             unique=unique, help_text=help_text, use_in=use_in,
             verbose_name=verbose_name, full_list=full_list,
-            full_detail=full_detail
+            full_detail=full_detail, memoize=memoize
         )
 
     def dehydrate(self, bundle, for_list=True):
@@ -835,7 +1060,9 @@ class ToManyField(RelatedField):
         previous_obj = bundle.obj
         attr = self.attribute
 
-        if callable(self.attribute):
+        if iscoroutinefunction(self.attribute):
+            the_m2ms = async_to_sync(self.attribute)(bundle)
+        elif callable(self.attribute):
             the_m2ms = self.attribute(bundle)
         elif isinstance(self.attribute, str):
             the_m2ms = bundle.obj
@@ -858,17 +1085,100 @@ class ToManyField(RelatedField):
         if isinstance(the_m2ms, models.Manager):
             the_m2ms = the_m2ms.all()
 
-        m2m_dehydrated = [
-            self.dehydrate_related(
-                Bundle(obj=m2m, request=bundle.request),
-                self.get_related_resource(m2m),
-                for_list=for_list
-            )
-            for m2m in the_m2ms
-        ]
+        fieldset = self.child_fieldset(bundle)
+        m2m_dehydrated = []
+
+        for m2m in the_m2ms:
+            m2m_bundle = Bundle(obj=m2m, request=bundle.request)
+            m2m_bundle.fieldset = fieldset
+            m2m_dehydrated.append(self.dehydrate_related(m2m_bundle, self.get_related_resource(m2m), for_list=for_list))
+
+        return m2m_dehydrated
+
+    async def adehydrate(self, bundle, for_list=True):
+        """
+        Awaits an async ``attribute`` (like a call to another service) & the
+        related resources' ``afull_dehydrate``, one after the other.
+        """
+        if not iscoroutinefunction(self.attribute):
+            return await super(ToManyField, self).adehydrate(bundle, for_list=for_list)
+
+        if not bundle.obj or not bundle.obj.pk:
+            if not self.null:
+                raise ApiFieldError("The model '%r' does not have a primary key and can not be used in a ToMany context." % bundle.obj)
+
+            return []
+
+        the_m2ms = await self.attribute(bundle)
+
+        if the_m2ms is None:
+            if not self.null:
+                raise ApiFieldError("The related resources for resource %s could not be found." % (bundle.obj))
+            return []
+
+        fieldset = self.child_fieldset(bundle)
+        m2m_dehydrated = []
+
+        for m2m in the_m2ms:
+            m2m_bundle = Bundle(obj=m2m, request=bundle.request)
+            m2m_bundle.fieldset = fieldset
+            m2m_dehydrated.append(await self.adehydrate_related(m2m_bundle, self.get_related_resource(m2m), for_list=for_list))
 
         return m2m_dehydrated
 
+    def dehydrate_many(self, bundles, for_list=True):
+        """
+        Loads the related objects for every bundle in a single query (grouped
+        by parent, via ``prefetch_related_objects``), then dehydrates them.
+
+        Returns ``None`` (so each bundle is dehydrated on its own) for
+        callable or multi-level attributes, attributes that aren't a
+        relation, or objects that aren't saved instances of one model.
+        """
+        if not isinstance(self.attribute, str) or len(self._attrs) != 1:
+            return None
+
+        objs = [bundle.obj for bundle in bundles]
+
+        if not objs:
+            return []
+
+        model = type(objs[0])
+
+        if not issubclass(model, models.Model) or any(type(obj) is not model or obj.pk is None for obj in objs):
+            return None
+
+        try:
+            model_field = model._meta.get_field(self.attribute)
+        except FieldDoesNotExist:
+            return None
+
+        if not (model_field.many_to_many or model_field.one_to_many):
+            return None
+
+        # A no-op for anything already prefetched.
+        prefetch_related_objects(objs, self.attribute)
+        related_resources = {}
+        dehydrated = []
+
+        for bundle in bundles:
+            fieldset = self.child_fieldset(bundle)
+            m2m_dehydrated = []
+
+            for m2m in getattr(bundle.obj, self.attribute).all():
+                related_class = type(m2m)
+
+                if related_class not in related_resources:
+                    related_resources[related_class] = self.get_related_resource(m2m)
+
+                m2m_bundle = Bundle(obj=m2m, request=bundle.request)
+                m2m_bundle.fieldset = fieldset
+                m2m_dehydrated.append(self.dehydrate_related(m2m_bundle, related_resources[related_class], for_list=for_list))
+
+            dehydrated.append(m2m_dehydrated)
+
+        return dehydrated
+
     def hydrate(self, bundle):
         pass
 
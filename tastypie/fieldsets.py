@@ -0,0 +1,117 @@
+from tastypie.constants import ALL
+from tastypie.exceptions import BadRequest
+
+
+def parse_field_paths(value):
+    """
+    Turns a comma-separated list of (possibly dotted) field names into a
+    tree of nested dictionaries.
+
+    For example, ``id,author.username,author.email`` becomes
+    ``{'id': {}, 'author': {'username': {}, 'email': {}}}``.
+    """
+    tree = {}
+
+    for path in value.split(','):
+        path = path.strip()
+
+        if not path:
+            continue
+
+        node = tree
+
+        for bit in path.split('.'):
+            if not bit:
+                raise BadRequest("Invalid field selection '%s'." % path)
+
+            node = node.setdefault(bit, {})
+
+    return tree
+
+
+def freeze_field_paths(tree):
+    """
+    Returns a hashable version of a tree from ``parse_field_paths``.
+    """
+    if tree is None:
+        return None
+
+    return frozenset((name, freeze_field_paths(subtree)) for name, subtree in tree.items())
+
+
+class SparseFieldset(object):
+    """
+    The fields requested (via ``fields=``) or refused (via ``exclude=``) for
+    a resource, along with any selection for its nested resources.
+
+    ``include`` is ``None`` when every field is wanted. A name present in
+    ``include`` with no children selects that whole field. A name present
+    in ``exclude`` with no children drops that field, while children only
+    drop those fields from the nested resource.
+    """
+    def __init__(self, include=None, exclude=None):
+        self.include = include
+        self.exclude = exclude or {}
+
+    def __repr__(self):
+        return "<SparseFieldset include=%r exclude=%r>" % (self.include, self.exclude)
+
+    @property
+    def key(self):
+        """
+        A hashable version of the selection.
+        """
+        return (freeze_field_paths(self.include), freeze_field_paths(self.exclude))
+
+    def allows(self, field_name):
+        """
+        Returns whether the field should be dehydrated at all.
+        """
+        if self.include is not None and field_name not in self.include:
+            return False
+
+        return self.exclude.get(field_name) != {}
+
+    def child(self, field_name):
+        """
+        Returns the ``SparseFieldset`` for a nested resource, or ``None`` if
+        everything on it is wanted.
+        """
+        include = None
+
+        if self.include:
+            include = self.include.get(field_name) or None
+
+        exclude = self.exclude.get(field_name)
+
+        if include is None and not exclude:
+            return None
+
+        return SparseFieldset(include=include, exclude=exclude)
+
+
+def check_field_paths(resource_class, tree, fields=None):
+    """
+    Checks that every field in the tree may be selected on the resource, as
+    allowed by ``Meta.sparse_fields``. Nested selections must point at related
+    fields & are checked against the related resource.
+
+    Raises ``BadRequest`` for anything else.
+    """
+    allowed = resource_class._meta.sparse_fields
+    resource_name = resource_class._meta.resource_name
+
+    if fields is None:
+        fields = resource_class.base_fields
+
+    for field_name, subtree in tree.items():
+        if allowed is None or field_name not in fields or (allowed != ALL and field_name not in allowed):
+            raise BadRequest("The '%s' field can not be selected on the '%s' resource." % (field_name, resource_name))
+
+        if subtree:
+            field_object = fields[field_name]
+
+            if not getattr(field_object, 'is_related', False):
+                raise BadRequest("The '%s' field on the '%s' resource is not a related resource." % (field_name, resource_name))
+
+            check_field_paths(field_object.to_class, subtree)
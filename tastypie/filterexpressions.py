@@ -0,0 +1,142 @@
+from tastypie.exceptions import InvalidFilterError
+
+
+OPERATORS = ('and', 'or', 'not')
+
+_special_chars = frozenset(['(', ')', ',', ':', '"', "'"])
+
+
+class FilterExpressionParser(object):
+    """
+    Parses a compound filter expression, like::
+
+        or(status:draft,and(author:1,not(title__startswith:"Re: ")))
+
+    Each term is a filter expression (as used in the querystring), a ``:``
+    & the value. Values containing any of ``(),:`` or quotes must be quoted
+    (with ``"`` or ``'``, escaping the quote with ``\\``). Terms are combined
+    with the ``and(...)``, ``or(...)`` & ``not(...)`` operators.
+
+    The result is a tree of tuples: ``('term', filter_expr, value)`` or
+    ``(operator, [children])``.
+    """
+    def __init__(self, expression, max_terms=None, max_depth=None):
+        self.expression = expression
+        self.max_terms = max_terms
+        self.max_depth = max_depth
+        self.position = 0
+        self.terms = 0
+
+    def error(self, message):
+        raise InvalidFilterError("Invalid filter expression at position %s: %s." % (self.position, message))
+
+    def peek(self):
+        if self.position < len(self.expression):
+            return self.expression[self.position]
+
+        return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.error("expected '%s'" % char)
+
+        self.position += 1
+
+    def skip_spaces(self):
+        while self.peek() is not None and self.peek().isspace():
+            self.position += 1
+
+    def read_word(self):
+        start = self.position
+
+        while self.peek() is not None and self.peek() not in _special_chars:
+            self.position += 1
+
+        return self.expression[start:self.position].strip()
+
+    def read_quoted(self):
+        quote = self.peek()
+        self.position += 1
+        bits = []
+
+        while True:
+            char = self.peek()
+
+            if char is None:
+                self.error("unterminated quoted value")
+
+            self.position += 1
+
+            if char == quote:
+                return ''.join(bits)
+
+            if char == '\\' and self.peek() is not None:
+                char = self.peek()
+                self.position += 1
+
+            bits.append(char)
+
+    def parse(self):
+        tree = self.parse_node(0)
+
+        if self.position != len(self.expression):
+            self.error("unexpected '%s'" % self.peek())
+
+        return tree
+
+    def parse_node(self, depth):
+        name = self.read_word()
+
+        if not name:
+            self.error("expected a filter or one of %s" % ', '.join(OPERATORS))
+
+        if self.peek() == '(':
+            return self.parse_operator(name, depth + 1)
+
+        self.expect(':')
+        self.terms += 1
+
+        if self.max_terms is not None and self.terms > self.max_terms:
+            raise InvalidFilterError("The filter expression has too many terms. No more than %s are allowed." % self.max_terms)
+
+        self.skip_spaces()
+
+        if self.peek() in ('"', "'"):
+            value = self.read_quoted()
+            self.skip_spaces()
+        else:
+            value = self.read_word()
+
+        return ('term', name, value)
+
+    def parse_operator(self, operator, depth):
+        if operator not in OPERATORS:
+            self.error("unknown operator '%s'" % operator)
+
+        if self.max_depth is not None and depth > self.max_depth:
+            raise InvalidFilterError("The filter expression is nested too deeply. No more than %s levels are allowed." % self.max_depth)
+
+        self.expect('(')
+        children = [self.parse_node(depth)]
+
+        while self.peek() == ',':
+            self.position += 1
+            children.append(self.parse_node(depth))
+
+        self.expect(')')
+        self.skip_spaces()
+
+        if operator == 'not' and len(children) != 1:
+            self.error("'not' takes a single filter")
+
+        return (operator, children)
+
+
+def parse_filter_expression(expression, max_terms=None, max_depth=None):
+    """
+    Parses a compound filter expression into a tree (see
+    ``FilterExpressionParser``).
+
+    Raises ``InvalidFilterError`` if it's malformed or goes over the limits.
+    """
+    return FilterExpressionParser(expression, max_terms=max_terms, max_depth=max_depth).parse()
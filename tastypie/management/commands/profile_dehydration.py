@@ -0,0 +1,48 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from django.test.client import RequestFactory
+from django.utils.module_loading import import_string
+
+from tastypie.exceptions import BadRequest, ImmediateHttpResponse
+from tastypie.timing import DehydrationProfiler
+
+
+class Command(BaseCommand):
+    help = "Runs a resource's get_list against the current database & ranks the time & queries spent dehydrating each field."
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', help="The dotted path to the resource class, like 'myapp.api.NoteResource'.")
+        parser.add_argument('--requests', type=int, default=10, help="How many times to run get_list. Defaults to 10.")
+        parser.add_argument('--limit', type=int, default=None, help="How many objects per page. Defaults to the resource's limit.")
+        parser.add_argument('--query', default='', help="A querystring for filtering or ordering, like 'title__startswith=a&order_by=title'.")
+        parser.add_argument('--top', type=int, default=None, help="Only show the slowest fields & hooks.")
+
+    def handle(self, **options):
+        try:
+            resource_class = import_string(options['resource'])
+        except ImportError as e:
+            raise CommandError("Couldn't import the resource '%s': %s" % (options['resource'], e))
+
+        resource = resource_class()
+        data = QueryDict(options['query'], mutable=True)
+
+        if options['limit'] is not None:
+            data['limit'] = options['limit']
+
+        profiler = DehydrationProfiler()
+
+        with profiler:
+            for i in range(options['requests']):
+                request = RequestFactory().get('/%s/' % resource._meta.resource_name, data=data)
+                request.user = AnonymousUser()
+
+                try:
+                    resource.get_list(request)
+                except BadRequest as e:
+                    raise CommandError("The request failed: %s" % e)
+                except ImmediateHttpResponse as e:
+                    raise CommandError("The request failed with a %s response." % e.response.status_code)
+
+        self.stdout.write("Profiled %s requests to %s.get_list.\n\n" % (options['requests'], resource_class.__name__))
+        self.stdout.write(profiler.format_table(limit=options['top']))
@@ -1,6 +1,8 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
 from tastypie.exceptions import BadRequest
+from tastypie.utils.asynchronous import is_overridden
 
 try:
     from urllib.parse import urlencode
@@ -125,6 +127,21 @@ class Paginator(object):
             # If it's not a QuerySet (or it's ilk), fallback to ``len``.
             return len(self.objects)
 
+    async def aget_count(self):
+        """
+        The async counterpart of ``get_count``, using ``acount`` on a
+        ``QuerySet``.
+        """
+        if is_overridden(self, 'get_count', Paginator):
+            return await sync_to_async(self.get_count)()
+
+        try:
+            acount = self.objects.acount
+        except AttributeError:
+            return await sync_to_async(self.get_count)()
+
+        return await acount()
+
     def get_previous(self, limit, offset):
         """
         If a previous page is available, will generate a URL to request that
@@ -187,7 +204,27 @@ class Paginator(object):
         """
         limit = self.get_limit()
         offset = self.get_offset()
-        count = self.get_count()
+        return self.build_page(limit, offset, self.get_count())
+
+    async def apage(self):
+        """
+        The async counterpart of ``page``, used by ``AsyncResource``.
+
+        The objects are sliced but not fetched, so iterate over them with
+        ``async for``. Runs ``page`` in a thread if a subclass overrides it.
+        """
+        if is_overridden(self, 'page', Paginator):
+            return await sync_to_async(self.page)()
+
+        limit = self.get_limit()
+        offset = self.get_offset()
+        return self.build_page(limit, offset, await self.aget_count())
+
+    def build_page(self, limit, offset, count):
+        """
+        Slices off the results for the ``limit`` & ``offset`` and adds the
+        metadata.
+        """
         objects = self.get_slice(limit, offset)
         meta = {
             'offset': offset,
@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+
+
+# The pools shared by every resource, keyed by kind & number of workers.
+_executors = {}
+_lock = threading.Lock()
+
+# The resources a worker process has set up, by class & ``api_name``.
+_resources = {}
+
+
+def get_executor(kind, workers):
+    """
+    Returns the pool (``'thread'`` or ``'process'``) with ``workers``
+    workers, creating it the first time it's asked for.
+    """
+    key = (kind, workers)
+
+    with _lock:
+        if key not in _executors:
+            if kind == 'thread':
+                _executors[key] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tastypie-dehydrate')
+            elif kind == 'process':
+                _executors[key] = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+            else:
+                raise ImproperlyConfigured("'dehydrate_pool' must be either 'thread' or 'process', not %r." % kind)
+
+        return _executors[key]
+
+
+def split(items, chunks):
+    """
+    Splits ``items`` into (at most) ``chunks`` lists of nearly equal size,
+    in order.
+    """
+    size = -(-len(items) // chunks)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def dehydrate_bundles(resource, bundles, simplify):
+    """
+    Dehydrates a chunk of ``bundles`` in a worker thread, turning their data
+    into simple types as well if ``simplify``.
+    """
+    try:
+        for bundle in bundles:
+            resource.full_dehydrate(bundle, for_list=True)
+
+            if simplify:
+                bundle.data = resource._meta.serializer.to_simple(bundle, {})
+
+        return bundles
+    finally:
+        # Worker threads don't see the end of the request.
+        close_old_connections()
+
+
+def dehydrate_objects(resource_class, api_name, objs, fieldset, simplify):
+    """
+    Dehydrates a chunk of objects in a worker process, returning the data
+    for each (in simple types if ``simplify``).
+
+    The bundles have no request, as it can't be sent to the process.
+    """
+    key = (resource_class, api_name)
+
+    if key not in _resources:
+        _resources[key] = resource_class(api_name=api_name)
+
+    resource = _resources[key]
+    dehydrated = []
+
+    for obj in objs:
+        bundle = resource.build_bundle(obj=obj)
+        bundle.fieldset = fieldset
+        resource.full_dehydrate(bundle, for_list=True)
+
+        if simplify:
+            dehydrated.append(resource._meta.serializer.to_simple(bundle, {}))
+        else:
+            dehydrated.append(bundle.data)
+
+    return dehydrated
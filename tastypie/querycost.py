@@ -0,0 +1,267 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import QuerySet
+
+from tastypie.exceptions import QueryTooExpensive
+
+
+# Cost classes for lookups.
+# Fine on any field.
+CHEAP = 'cheap'
+# Fine on an indexed field, or alongside a cheap filter on an indexed field.
+NEEDS_INDEX = 'needs_index'
+# Never allowed.
+FORBIDDEN = 'forbidden'
+
+DEFAULT_LOOKUP_COSTS = {
+    'contains': NEEDS_INDEX,
+    'icontains': NEEDS_INDEX,
+    'endswith': NEEDS_INDEX,
+    'iendswith': NEEDS_INDEX,
+    'regex': NEEDS_INDEX,
+    'iregex': NEEDS_INDEX,
+    'search': NEEDS_INDEX,
+}
+
+# Full table scans, as reported by SQLite (``SCAN core_note``, or
+# ``SCAN TABLE core_note`` on older versions) & PostgreSQL.
+_sqlite_scan_re = re.compile(r'\bSCAN (?:TABLE )?(\w+)( USING)?')
+_postgres_scan_re = re.compile(r'\bSeq Scan on (\w+)')
+_postgres_cost_re = re.compile(r'\bcost=[\d.]+\.\.([\d.]+)')
+
+
+class BaseQueryCostGuard(object):
+    """
+    A simplified, swappable base class for guarding against expensive
+    queries.
+
+    Allows any query.
+    """
+    def check_filters(self, resource, applicable_filters):
+        """
+        Checks the ORM filters built for a list request.
+
+        Should raise ``QueryTooExpensive`` if they aren't allowed.
+        """
+        pass
+
+    def check_ordering(self, resource, order_by_args):
+        """
+        Checks the ORM ordering requested by the client (like
+        ``['-title']``).
+
+        Should raise ``QueryTooExpensive`` if it isn't allowed.
+        """
+        pass
+
+    def check_query(self, resource, object_list):
+        """
+        Checks the filtered & sorted ``QuerySet`` before it's paginated.
+
+        Should raise ``QueryTooExpensive`` if it isn't allowed.
+        """
+        pass
+
+
+class QueryCostGuard(BaseQueryCostGuard):
+    """
+    Refuses filters & ordering the database can't serve from an index.
+
+    Accepts a number of optional kwargs::
+
+        * ``lookup_costs`` - a dictionary mapping lookup types (like
+          ``icontains``) to their cost class: ``CHEAP``, ``NEEDS_INDEX`` or
+          ``FORBIDDEN``. Lookups that aren't listed are ``CHEAP``. Default
+          is ``DEFAULT_LOOKUP_COSTS``, which needs an index for the
+          ``contains``, ``endswith``, ``regex`` & ``search`` lookups.
+        * ``max_relation_depth`` - the most relations a filter or ordering
+          may follow. Default is ``None`` (no limit).
+        * ``allow_unindexed_ordering`` - whether clients may order on fields
+          without an index. Default is ``False``.
+        * ``explain`` - whether to ``EXPLAIN`` each query before running it.
+          Default is ``None``, which follows the
+          ``TASTYPIE_EXPLAIN_QUERIES`` setting (``False`` by default).
+          Meant for tests & benchmarks, as it costs an extra query.
+        * ``max_cost`` - the highest total cost the planner may estimate
+          (PostgreSQL only). Default is ``None`` (no limit).
+        * ``allow_table_scans`` - whether the planner may scan whole tables.
+          Default is ``True``.
+    """
+    def __init__(self, lookup_costs=None, max_relation_depth=None,
+                 allow_unindexed_ordering=False, explain=None, max_cost=None,
+                 allow_table_scans=True):
+        if lookup_costs is None:
+            lookup_costs = DEFAULT_LOOKUP_COSTS
+
+        self.lookup_costs = lookup_costs
+        self.max_relation_depth = max_relation_depth
+        self.allow_unindexed_ordering = allow_unindexed_ordering
+        self.explain = explain
+        self.max_cost = max_cost
+        self.allow_table_scans = allow_table_scans
+
+    def resolve_path(self, model, path):
+        """
+        Follows an ORM path (like ``author__username__startswith``) from the
+        ``model``.
+
+        Returns the last model field reached (or ``None`` if the path doesn't
+        start with one), the number of relations followed & the lookup type
+        (``exact`` if there's none).
+        """
+        bits = path.split(LOOKUP_SEP)
+        field = None
+        depth = 0
+
+        for index, bit in enumerate(bits):
+            if field is None:
+                current_model = model
+            elif field.is_relation and field.related_model is not None:
+                current_model = field.related_model
+            else:
+                # The rest are transforms/lookups on the field.
+                return field, depth, bits[-1]
+
+            try:
+                if bit == 'pk':
+                    next_field = current_model._meta.pk
+                else:
+                    next_field = current_model._meta.get_field(bit)
+            except FieldDoesNotExist:
+                return field, depth, bits[-1]
+
+            if field is not None:
+                depth += 1
+
+            field = next_field
+
+        return field, depth, 'exact'
+
+    def is_indexed(self, field):
+        """
+        Returns whether the database can look the model field up via an
+        index (one that starts with the field).
+        """
+        if field is None:
+            return False
+
+        if not field.concrete:
+            # Reverse relations join on the other side's foreign key.
+            return field.is_relation
+
+        if field.primary_key or field.unique or getattr(field, 'db_index', False):
+            return True
+
+        if field.is_relation and field.many_to_many:
+            return True
+
+        opts = field.model._meta
+        leading = set()
+
+        for index in opts.indexes:
+            if index.fields:
+                leading.add(index.fields[0].lstrip('-'))
+
+        for constraint in opts.constraints:
+            if getattr(constraint, 'fields', None):
+                leading.add(constraint.fields[0])
+
+        for field_names in list(opts.unique_together) + list(getattr(opts, 'index_together', [])):
+            if field_names:
+                leading.add(field_names[0])
+
+        return field.name in leading or field.attname in leading
+
+    def check_depth(self, path, depth):
+        """
+        Checks the number of relations the ORM path follows.
+        """
+        if self.max_relation_depth is not None and depth > self.max_relation_depth:
+            raise QueryTooExpensive("'%s' follows too many relations. No more than %s may be followed." % (path, self.max_relation_depth))
+
+    def check_filters(self, resource, applicable_filters):
+        model = resource._meta.object_class
+        resolved = []
+        has_indexed_filter = False
+
+        for path in applicable_filters:
+            field, depth, lookup = self.resolve_path(model, path)
+            cost = self.lookup_costs.get(lookup, CHEAP)
+            indexed = self.is_indexed(field)
+            self.check_depth(path, depth)
+
+            if cost == FORBIDDEN:
+                raise QueryTooExpensive("The '%s' filter is not allowed, as it's too expensive for the database." % lookup)
+
+            if cost == CHEAP and indexed:
+                has_indexed_filter = True
+
+            resolved.append((path, field, lookup, cost, indexed))
+
+        if has_indexed_filter:
+            return
+
+        for path, field, lookup, cost, indexed in resolved:
+            if cost == NEEDS_INDEX and not indexed:
+                raise QueryTooExpensive("Filtering with '%s' is too expensive on its own, as the field isn't indexed. Narrow the query with a filter on an indexed field as well." % path)
+
+    def check_ordering(self, resource, order_by_args):
+        model = resource._meta.object_class
+
+        for order_by in order_by_args:
+            path = order_by.lstrip('-')
+            field, depth, lookup = self.resolve_path(model, path)
+            self.check_depth(path, depth)
+
+            if not self.allow_unindexed_ordering and not self.is_indexed(field):
+                raise QueryTooExpensive("Ordering by '%s' is not allowed, as the field isn't indexed." % path)
+
+    def should_explain(self):
+        """
+        Returns whether queries should be ``EXPLAIN``-ed.
+        """
+        if self.explain is None:
+            return getattr(settings, 'TASTYPIE_EXPLAIN_QUERIES', False)
+
+        return self.explain
+
+    def get_plan_cost(self, plan):
+        """
+        Returns the total cost the planner estimated, or ``None`` if the
+        database doesn't report one.
+        """
+        match = _postgres_cost_re.search(plan)
+
+        if match is None:
+            return None
+
+        return float(match.group(1))
+
+    def get_plan_scans(self, plan):
+        """
+        Returns the names of the tables the planner will scan in full.
+        """
+        tables = _postgres_scan_re.findall(plan)
+        tables.extend(table for table, using in _sqlite_scan_re.findall(plan) if not using)
+        return tables
+
+    def check_query(self, resource, object_list):
+        if not self.should_explain() or not isinstance(object_list, QuerySet):
+            return
+
+        plan = object_list.explain()
+
+        if self.max_cost is not None:
+            cost = self.get_plan_cost(plan)
+
+            if cost is not None and cost > self.max_cost:
+                raise QueryTooExpensive("The query is too expensive, with an estimated cost of %s (the limit is %s). Narrow the query with more filters." % (cost, self.max_cost))
+
+        if not self.allow_table_scans:
+            tables = self.get_plan_scans(plan)
+
+            if tables:
+                raise QueryTooExpensive("The query would scan the whole '%s' table. Narrow the query with a filter on an indexed field." % tables[0])
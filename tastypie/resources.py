@@ -1,26 +1,31 @@
+import asyncio
+from contextlib import nullcontext
 from copy import copy, deepcopy
 from datetime import datetime
+from itertools import chain, repeat
 import logging
 import sys
+import threading
 from time import mktime
 import traceback
 import warnings
 from wsgiref.handlers import format_date_time
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.conf import settings
 from django.core.exceptions import (
     ObjectDoesNotExist, MultipleObjectsReturned, ValidationError, FieldDoesNotExist
 )
 from django.core.signals import got_request_exception
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
 from django.db.models.fields.related import ForeignKey
 from django.urls.conf import re_path
 from tastypie.utils.timezone import make_naive_utc
-try:
-    from django.contrib.gis.db.models.fields import GeometryField
-except (ImproperlyConfigured, ImportError):
-    GeometryField = None
 from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable, QuerySet
+from django.db.models.aggregates import Avg, Count, Max, Min, Sum
+from django.db.models.query_utils import DeferredAttribute, Q
 try:
     from django.db.models.fields.related import\
         SingleRelatedObjectDescriptor as ReverseOneToOneDescriptor
@@ -33,12 +38,14 @@ from django.utils.cache import patch_cache_control, patch_vary_headers
 from django.utils.html import escape
 from django.views.decorators.csrf import csrf_exempt
 
-from tastypie.authentication import Authentication
-from tastypie.authorization import ReadOnlyAuthorization
+from tastypie.authentication import Authentication, AuthenticationResult, MultiAuthentication
+from tastypie.authorization import Authorization, ReadOnlyAuthorization
 from tastypie.bundle import Bundle
 from tastypie.cache import NoCache
 from tastypie.compat import NoReverseMatch, reverse, Resolver404, get_script_prefix, is_ajax
 from tastypie.constants import ALL, ALL_WITH_RELATIONS
+from tastypie.fieldsets import SparseFieldset, check_field_paths, parse_field_paths
+from tastypie.filterexpressions import parse_filter_expression
 from tastypie.exceptions import (
     NotFound, BadRequest, InvalidFilterError, HydrationError, InvalidSortError,
     ImmediateHttpResponse, Unauthorized, UnsupportedFormat,
@@ -47,23 +54,80 @@ from tastypie.exceptions import (
 from tastypie import fields
 from tastypie import http
 from tastypie.paginator import Paginator
+from tastypie.parallel import dehydrate_bundles, dehydrate_objects, get_executor, split
+from tastypie.querycost import BaseQueryCostGuard
 from tastypie.serializers import Serializer
 from tastypie.throttle import BaseThrottle
+from tastypie.timing import BaseMetricsSink, RequestTimer, get_dehydration_profiler, request_timed
 from tastypie.utils import (
     is_valid_jsonp_callback_value, string_to_python,
     trailing_slash,
 )
+from tastypie.utils.asynchronous import is_overridden
 from tastypie.utils.mime import determine_format, build_content_type
+from tastypie.utils.http import conditional_response, make_conditional, make_etag
 from tastypie.validation import Validation
 from tastypie.compat import get_module_name, atomic_decorator
 
 
+# The most filter expressions a ``ModelResource`` remembers the ORM lookup for.
+FILTER_TABLE_SIZE = 1000
+
+# The functions ``Meta.aggregations`` may allow.
+AGGREGATE_FUNCTIONS = {
+    'count': Count,
+    'sum': Sum,
+    'avg': Avg,
+    'min': Min,
+    'max': Max,
+}
+
+
 def sanitize(text):
     # We put the single quotes back, due to their frequent usage in exception
     # messages.
     return escape(text).replace('&#39;', "'").replace('&quot;', '"').replace('&#x27;', "'")
 
 
+def flatten_select_related(select_related, prefix=''):
+    """
+    Turns the nested dictionary Django keeps for ``select_related`` back into
+    lookups (i.e. ``{'author': {'profile': {}}}`` becomes
+    ``author__profile``).
+    """
+    for name, children in select_related.items():
+        lookup = prefix + name
+
+        if children:
+            for child_lookup in flatten_select_related(children, lookup + LOOKUP_SEP):
+                yield child_lookup
+        else:
+            yield lookup
+
+
+class LazyDefault(object):
+    """
+    A default on ``ResourceOptions`` that's only created (once, then shared)
+    when first used, rather than when Tastypie is imported.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.value = None
+        self.lock = threading.Lock()
+
+    def __get__(self, instance, owner):
+        if self.value is None:
+            with self.lock:
+                if self.value is None:
+                    self.value = self.factory()
+
+        # Some defaults (like ``Authorization``) are descriptors themselves.
+        if hasattr(type(self.value), '__get__'):
+            return self.value.__get__(instance, owner)
+
+        return self.value
+
+
 class ResourceOptions(object):
     """
     A configuration class for ``Resource``.
@@ -71,12 +135,15 @@ class ResourceOptions(object):
     Provides sane defaults and the logic needed to augment these settings with
     the internal ``class Meta`` used on ``Resource`` subclasses.
     """
-    serializer = Serializer()
-    authentication = Authentication()
-    authorization = ReadOnlyAuthorization()
-    cache = NoCache()
-    throttle = BaseThrottle()
-    validation = Validation()
+    serializer = LazyDefault(Serializer)
+    authentication = LazyDefault(Authentication)
+    authorization = LazyDefault(ReadOnlyAuthorization)
+    cache = LazyDefault(NoCache)
+    throttle = LazyDefault(BaseThrottle)
+    query_cost = LazyDefault(BaseQueryCostGuard)
+    timing = None
+    metrics = LazyDefault(BaseMetricsSink)
+    validation = LazyDefault(Validation)
     paginator_class = Paginator
     allowed_methods = ['get', 'post', 'put', 'delete', 'patch']
     list_allowed_methods = None
@@ -98,6 +165,16 @@ class ResourceOptions(object):
     always_return_data = False
     collection_name = 'objects'
     detail_uri_name = 'pk'
+    sparse_fields = None
+    column_dehydration = None
+    compound_filtering = False
+    max_filter_terms = 20
+    max_filter_depth = 4
+    aggregations = {}
+    aggregate_group_by = []
+    related_concurrency = 10
+    dehydrate_workers = None
+    dehydrate_pool = 'thread'
 
     def __new__(cls, meta=None):
         overrides = {}
@@ -176,6 +253,36 @@ class DeclarativeMetaclass(type):
         return new_class
 
 
+class FieldTable(dict):
+    """
+    The fields of a resource instance, shared with the other instances of
+    its class until they're looked up by name: ``fields[name]`` (& ``get``)
+    returns the instance's own copy of the field, made the first time, so it
+    can be changed in place.
+
+    Iterating (``items``, ``values``) gives the fields as they are, without
+    copying them, so look a field up by name to change it.
+    """
+    def __init__(self, base_fields):
+        super(FieldTable, self).__init__(base_fields)
+        self.base_fields = base_fields
+
+    def __getitem__(self, name):
+        field_object = super(FieldTable, self).__getitem__(name)
+
+        if field_object is self.base_fields.get(name):
+            field_object = copy(field_object)
+            self[name] = field_object
+
+        return field_object
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+
+        return default
+
+
 class Resource(metaclass=DeclarativeMetaclass):
     """
     Handles the data, request dispatch and responding to requests.
@@ -188,11 +295,11 @@ class Resource(metaclass=DeclarativeMetaclass):
     data sources, such as search results, files, other data, etc.
     """
     def __init__(self, api_name=None):
-        # this can cause:
-        # TypeError: object.__new__(method-wrapper) is not safe, use method-wrapper.__new__()
-        # when trying to copy a generator used as a default. Wrap call to
-        # generator in lambda to get around this error.
-        self.fields = {k: copy(v) for k, v in self.base_fields.items()}
+        # Related resources get instantiated a lot, so the fields are only
+        # copied once they're looked up by name (see ``FieldTable``).
+        self.fields = FieldTable(self.base_fields)
+        self._schema_cache = {}
+        self._filter_table = (None, {})
 
         if api_name is not None:
             self._meta.api_name = api_name
@@ -214,63 +321,141 @@ class Resource(metaclass=DeclarativeMetaclass):
         are seen, there is special handling to either present a message back
         to the user or return the response traveling with the exception.
         """
-        @csrf_exempt
-        def wrapper(request, *args, **kwargs):
+        def handle(request, *args, **kwargs):
             try:
                 callback = getattr(self, view)
                 response = callback(request, *args, **kwargs)
-
-                # Our response can vary based on a number of factors, use
-                # the cache class to determine what we should ``Vary`` on so
-                # caches won't return the wrong (cached) version.
-                varies = getattr(self._meta.cache, "varies", [])
-
-                if varies:
-                    patch_vary_headers(response, varies)
-
-                if self._meta.cache.cacheable(request, response):
-                    if self._meta.cache.cache_control():
-                        # If the request is cacheable and we have a
-                        # ``Cache-Control`` available then patch the header.
-                        patch_cache_control(response, **self._meta.cache.cache_control())
-
-                if is_ajax(request) and not response.has_header("Cache-Control"):
-                    # IE excessively caches XMLHttpRequests, so we're disabling
-                    # the browser cache here.
-                    # See http://www.enhanceie.com/ie/bugs.asp for details.
-                    patch_cache_control(response, no_cache=True)
-
-                return response
-            except (BadRequest, fields.ApiFieldError) as e:
-                data = {"error": sanitize(e.args[0]) if getattr(e, 'args') else ''}
-                return self.error_response(request, data, response_class=http.HttpBadRequest)
-            except ValidationError as e:
-                data = {"error": sanitize(e.messages)}
-                return self.error_response(request, data, response_class=http.HttpBadRequest)
+                return self.patch_response(request, response)
             except Exception as e:
-                # Prevent muting non-django's exceptions
-                # i.e. RequestException from 'requests' library
-                if hasattr(e, 'response') and isinstance(e.response, HttpResponse):
-                    return e.response
-
-                # A real, non-expected exception.
-                # Handle the case where the full traceback is more helpful
-                # than the serialized error.
-                if settings.DEBUG and getattr(settings, 'TASTYPIE_FULL_DEBUG', False):
-                    raise
-
-                # Re-raise the error to get a proper traceback when the error
-                # happend during a test case
-                if request.META.get('SERVER_NAME') == 'testserver':
-                    raise
-
-                # Rather than re-raising, we're going to things similar to
-                # what Django does. The difference is returning a serialized
-                # error message.
-                return self._handle_500(request, e)
+                return self.handle_view_exception(request, e)
+
+        @csrf_exempt
+        def wrapper(request, *args, **kwargs):
+            timer = self.start_timer(request)
+
+            if timer is None:
+                return handle(request, *args, **kwargs)
+
+            try:
+                with timer:
+                    response = handle(request, *args, **kwargs)
+            finally:
+                del request._tastypie_timer
+
+            self.finish_timer(request, timer, response)
+            return response
 
         return wrapper
 
+    def patch_response(self, request, response):
+        """
+        Adds the caching headers to the ``response`` of a view.
+        """
+        # Our response can vary based on a number of factors, use
+        # the cache class to determine what we should ``Vary`` on so
+        # caches won't return the wrong (cached) version.
+        varies = getattr(self._meta.cache, "varies", [])
+
+        if varies:
+            patch_vary_headers(response, varies)
+
+        if self._meta.cache.cacheable(request, response):
+            if self._meta.cache.cache_control():
+                # If the request is cacheable and we have a
+                # ``Cache-Control`` available then patch the header.
+                patch_cache_control(response, **self._meta.cache.cache_control())
+
+        if is_ajax(request) and not response.has_header("Cache-Control"):
+            # IE excessively caches XMLHttpRequests, so we're disabling
+            # the browser cache here.
+            # See http://www.enhanceie.com/ie/bugs.asp for details.
+            patch_cache_control(response, no_cache=True)
+
+        return response
+
+    def handle_view_exception(self, request, exception):
+        """
+        Turns an ``exception`` raised by a view into a response.
+
+        Must be called while handling the exception, as unexpected ones may be
+        re-raised.
+        """
+        if isinstance(exception, (BadRequest, fields.ApiFieldError)):
+            data = {"error": sanitize(exception.args[0]) if getattr(exception, 'args') else ''}
+            return self.error_response(request, data, response_class=http.HttpBadRequest)
+
+        if isinstance(exception, ValidationError):
+            data = {"error": sanitize(exception.messages)}
+            return self.error_response(request, data, response_class=http.HttpBadRequest)
+
+        # Prevent muting non-django's exceptions
+        # i.e. RequestException from 'requests' library
+        if hasattr(exception, 'response') and isinstance(exception.response, HttpResponse):
+            return exception.response
+
+        # A real, non-expected exception.
+        # Handle the case where the full traceback is more helpful
+        # than the serialized error.
+        if settings.DEBUG and getattr(settings, 'TASTYPIE_FULL_DEBUG', False):
+            raise
+
+        # Re-raise the error to get a proper traceback when the error
+        # happend during a test case
+        if request.META.get('SERVER_NAME') == 'testserver':
+            raise
+
+        # Rather than re-raising, we're going to things similar to
+        # what Django does. The difference is returning a serialized
+        # error message.
+        return self._handle_500(request, exception)
+
+    def start_timer(self, request):
+        """
+        Starts timing the phases of ``request`` (see ``tastypie.timing``),
+        returning the ``RequestTimer``.
+
+        Returns ``None`` if ``Meta.timing`` is off (or it's ``None`` & the
+        ``TASTYPIE_TIMING`` setting is off), or if the request is already
+        being timed.
+        """
+        timing = self._meta.timing
+
+        if timing is None:
+            timing = getattr(settings, 'TASTYPIE_TIMING', False)
+
+        if not timing or hasattr(request, '_tastypie_timer'):
+            return None
+
+        timer = RequestTimer()
+        request._tastypie_timer = timer
+        return timer
+
+    def finish_timer(self, request, timer, response):
+        """
+        Hands the timings of a finished request to ``Meta.metrics`` & the
+        ``request_timed`` signal.
+
+        In ``DEBUG``, they're also added to the response as a
+        ``Server-Timing`` header.
+        """
+        self._meta.metrics.record(self, request, timer)
+        request_timed.send(sender=self.__class__, resource=self, request=request, timer=timer)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = timer.server_timing()
+
+    def time_phase(self, request, name):
+        """
+        Returns a context manager timing the ``name`` phase of ``request``,
+        which does nothing if the request isn't being timed.
+        """
+        timer = getattr(request, '_tastypie_timer', None)
+
+        if timer is None:
+            return nullcontext()
+
+        return timer.phase(name)
+
     def get_response_class_for_exception(self, request, exception):
         """
         Can be overridden to customize response classes used for uncaught
@@ -563,7 +748,8 @@ class Resource(metaclass=DeclarativeMetaclass):
         ``Resource._meta``.
         """
         # Authenticate the request as needed.
-        auth_result = self._meta.authentication.is_authenticated(request)
+        with self.time_phase(request, 'authenticate'):
+            auth_result = self._meta.authentication.is_authenticated(request)
 
         if isinstance(auth_result, HttpResponse):
             raise ImmediateHttpResponse(response=auth_result)
@@ -571,6 +757,50 @@ class Resource(metaclass=DeclarativeMetaclass):
         if auth_result is not True:
             raise ImmediateHttpResponse(response=http.HttpUnauthorized())
 
+        self.set_authentication_result(request)
+
+    def set_authentication_result(self, request):
+        """
+        Records the outcome of authenticating ``request`` against this
+        resource's ``authentication`` class on the request itself.
+
+        Later calls in the request cycle (``get_identifier`` & the throttling
+        hooks) reuse it rather than asking the backend again.
+        """
+        authentication = self._meta.authentication
+        backend = authentication
+
+        if isinstance(authentication, MultiAuthentication):
+            backend = getattr(request, '_authentication_backend', authentication)
+
+        result = AuthenticationResult(backend, user=getattr(request, 'user', None))
+
+        if not hasattr(request, '_tastypie_auth_results'):
+            request._tastypie_auth_results = {}
+
+        request._tastypie_auth_results[authentication] = result
+        return result
+
+    def get_authentication_result(self, request):
+        """
+        Returns the ``AuthenticationResult`` stored on the request for this
+        resource's ``authentication`` class, recording one if the request
+        hasn't been through ``is_authenticated`` yet.
+        """
+        try:
+            return request._tastypie_auth_results[self._meta.authentication]
+        except (AttributeError, KeyError):
+            return self.set_authentication_result(request)
+
+    def get_identifier(self, request):
+        """
+        Provides a unique string identifier for the requestor.
+
+        Mostly a hook, this uses class assigned to ``authentication`` from
+        ``Resource._meta``, memoized on the request.
+        """
+        return self.get_authentication_result(request).get_identifier(request)
+
     def throttle_check(self, request):
         """
         Handles checking if the user should be throttled.
@@ -578,10 +808,11 @@ class Resource(metaclass=DeclarativeMetaclass):
         Mostly a hook, this uses class assigned to ``throttle`` from
         ``Resource._meta``.
         """
-        identifier = self._meta.authentication.get_identifier(request)
+        with self.time_phase(request, 'throttle'):
+            identifier = self.get_identifier(request)
 
-        # Check to see if they should be throttled.
-        throttle = self._meta.throttle.should_be_throttled(identifier)
+            # Check to see if they should be throttled.
+            throttle = self._meta.throttle.should_be_throttled(identifier)
 
         if throttle:
             # Throttle limit exceeded.
@@ -605,7 +836,9 @@ class Resource(metaclass=DeclarativeMetaclass):
         ``Resource._meta``.
         """
         request_method = request.method.lower()
-        self._meta.throttle.accessed(self._meta.authentication.get_identifier(request), url=request.get_full_path(), request_method=request_method)
+
+        with self.time_phase(request, 'throttle'):
+            self._meta.throttle.accessed(self.get_identifier(request), url=request.get_full_path(), request_method=request_method)
 
     def unauthorized_result(self, exception):
         raise ImmediateHttpResponse(response=http.HttpUnauthorized())
@@ -679,6 +912,9 @@ class Resource(metaclass=DeclarativeMetaclass):
         Handles checking of permissions to see if the user has authorization
         to PUT this resource.
         """
+        if ('update', bundle.obj.pk) in bundle.preauthorized:
+            return True
+
         try:
             auth_result = self._meta.authorization.update_detail(object_list, bundle)
             if auth_result is not True:
@@ -705,6 +941,9 @@ class Resource(metaclass=DeclarativeMetaclass):
         Handles checking of permissions to see if the user has authorization
         to DELETE this resource.
         """
+        if ('delete', bundle.obj.pk) in bundle.preauthorized:
+            return True
+
         try:
             auth_result = self._meta.authorization.delete_detail(object_list, bundle)
             if not auth_result:
@@ -714,6 +953,34 @@ class Resource(metaclass=DeclarativeMetaclass):
 
         return auth_result
 
+    def authorized_batch(self, action, object_list, bundles):
+        """
+        Handles checking of permissions to see if the user has authorization
+        to perform ``action`` (``read``, ``create``, ``update`` or ``delete``)
+        on every one of ``bundles`` at once.
+        """
+        try:
+            auth_result = self._meta.authorization.batch_detail(action, object_list, bundles)
+            if auth_result is not True:
+                raise Unauthorized()
+        except Unauthorized as e:
+            self.unauthorized_result(e)
+
+        return auth_result
+
+    def preauthorize_batch(self, action, bundles):
+        """
+        A hook to authorize ``action`` (``update`` or ``delete``) for all of
+        a bulk request's bundles up-front, marking them so the per-object
+        check can be skipped later.
+
+        Does nothing by default, leaving the per-object checks in place.
+
+        ``ModelResource`` includes a full working version specific to Django's
+        ``Models``.
+        """
+        return bundles
+
     def build_bundle(self, obj=None, data=None, request=None, objects_saved=None, via_uri=None):
         """
         Given either an object, a data dictionary or both, builds a ``Bundle``
@@ -756,6 +1023,42 @@ class Resource(metaclass=DeclarativeMetaclass):
         """
         return obj_list
 
+    def build_sparse_fieldset(self, request):
+        """
+        Builds a ``SparseFieldset`` from the ``fields`` & ``exclude`` request
+        parameters (comma-separated, with dotted names for fields on full
+        related resources), checked against ``Meta.sparse_fields``.
+
+        Returns ``None`` if the resource doesn't allow selecting fields or
+        nothing was selected.
+        """
+        if self._meta.sparse_fields is None or not hasattr(request, 'GET'):
+            return None
+
+        include = parse_field_paths(request.GET.get('fields', '')) or None
+        exclude = parse_field_paths(request.GET.get('exclude', '')) or None
+
+        if include is None and exclude is None:
+            return None
+
+        for tree in (include, exclude):
+            if tree:
+                check_field_paths(type(self), tree, fields=self.fields)
+
+        return SparseFieldset(include=include, exclude=exclude)
+
+    def apply_sparse_fieldset(self, obj_list, fieldset):
+        """
+        Allows for narrowing what's loaded for the objects being returned,
+        based on the fields selected.
+
+        This needs to be implemented at the user level.
+
+        ``ModelResource`` includes a full working version specific to Django's
+        ``Models``.
+        """
+        return obj_list
+
     def get_bundle_detail_data(self, bundle):
         """
         Convenience method to return the ``detail_uri_name`` attribute off
@@ -828,6 +1131,60 @@ class Resource(metaclass=DeclarativeMetaclass):
         except NoReverseMatch:
             return ''
 
+    def can_build_resource_uris(self, field):
+        """
+        Returns whether ``get_resource_uris`` gives the same URIs as
+        ``get_resource_uri`` would for objects with the given values of the
+        model ``field``.
+        """
+        for hook in ('get_resource_uri', 'resource_uri_kwargs', 'detail_uri_kwargs'):
+            if getattr(type(self), hook) is not getattr(Resource, hook):
+                return False
+
+        if self._meta.detail_uri_name == 'pk':
+            return field.primary_key
+
+        return self._meta.detail_uri_name in (field.name, field.attname)
+
+    def get_resource_uris(self, values):
+        """
+        Builds the detail URIs for a list of ``detail_uri_name`` values, as
+        ``get_resource_uri`` would for the matching objects.
+
+        Integer values are spliced into the first URI reversed (once a
+        second reversal has confirmed where they go), rather than reversing
+        a URI for each of them.
+        """
+        uris = []
+        template = None
+        sample = None
+
+        for value in values:
+            if template is not None and value.__class__ is int:
+                uris.append(template[0] + str(value) + template[1])
+                continue
+
+            kwargs = self.resource_uri_kwargs()
+            kwargs[self._meta.detail_uri_name] = value
+
+            try:
+                uri = self._build_reverse_url('api_dispatch_detail', kwargs=kwargs)
+            except NoReverseMatch:
+                uri = ''
+
+            if value.__class__ is int and uri:
+                if sample is None:
+                    prefix, found, suffix = uri.rpartition(str(value))
+
+                    if found:
+                        sample = (prefix, suffix)
+                elif sample[0] + str(value) + sample[1] == uri:
+                    template = sample
+
+            uris.append(uri)
+
+        return uris
+
     def get_via_uri(self, uri, request=None):
         """
         This pulls apart the salient bits of the URI and populates the
@@ -880,37 +1237,101 @@ class Resource(metaclass=DeclarativeMetaclass):
         to populate the resource.
         """
         data = bundle.data
-
-        api_name = self._meta.api_name
-        resource_name = self._meta.resource_name
+        predehydrated = bundle.predehydrated or {}
+        profiler = get_dehydration_profiler()
 
         # Dehydrate each field.
         for field_name, field_object in self.fields.items():
-            # If it's not for use in this mode, skip
-            field_use_in = field_object.use_in
-            if callable(field_use_in):
-                if not field_use_in(bundle):
-                    continue
-            else:
-                if field_use_in not in ['all', 'list' if for_list else 'detail']:
-                    continue
-
-            # A touch leaky but it makes URI resolution work.
-            if field_object.dehydrated_type == 'related':
-                field_object.api_name = api_name
-                field_object.resource_name = resource_name
+            if not self.should_dehydrate_field(bundle, field_name, field_object, for_list=for_list):
+                continue
 
-            data[field_name] = field_object.dehydrate(bundle, for_list=for_list)
+            if field_name in predehydrated:
+                data[field_name] = predehydrated[field_name]
+            elif profiler is not None:
+                data[field_name] = profiler.measure(self, field_name, '%s.dehydrate' % type(field_object).__name__, field_object.dehydrate, bundle, for_list=for_list)
+            else:
+                data[field_name] = field_object.dehydrate(bundle, for_list=for_list)
 
             # Check for an optional method to do further dehydration.
             method = getattr(self, "dehydrate_%s" % field_name, None)
 
-            if method:
+            if method and profiler is not None:
+                data[field_name] = profiler.measure(self, field_name, method.__name__, method, bundle)
+            elif method:
                 data[field_name] = method(bundle)
 
+        if profiler is not None:
+            return profiler.measure(self, None, 'dehydrate', self.dehydrate, bundle)
+
         bundle = self.dehydrate(bundle)
         return bundle
 
+    def should_dehydrate_field(self, bundle, field_name, field_object, for_list=False):
+        """
+        Returns whether the field should be included in the dehydrated data,
+        based on the client's selection & its ``use_in``.
+        """
+        # If it wasn't selected by the client, skip
+        if bundle.fieldset is not None and not bundle.fieldset.allows(field_name):
+            return False
+
+        # If it's not for use in this mode, skip
+        field_use_in = field_object.use_in
+
+        if callable(field_use_in):
+            return bool(field_use_in(bundle))
+
+        return field_use_in in ['all', 'list' if for_list else 'detail']
+
+    def dehydrate_many(self, bundles, for_list=False):
+        """
+        Dehydrates the related fields that support it (see
+        ``RelatedField.dehydrate_many``) for a whole page of bundles at once.
+        ``full_dehydrate`` then uses those values instead of dehydrating
+        the fields per bundle.
+        """
+        profiler = get_dehydration_profiler()
+
+        for field_name, field_object in self.fields.items():
+            if field_object.dehydrated_type != 'related':
+                continue
+
+            batch = [
+                bundle for bundle in bundles
+                if self.should_dehydrate_field(bundle, field_name, field_object, for_list=for_list)
+            ]
+
+            if not batch:
+                continue
+
+            # (The default ``dehydrate_many`` does nothing, so isn't measured.)
+            if profiler is not None and is_overridden(field_object, 'dehydrate_many', fields.RelatedField):
+                dehydrated = profiler.measure(self, field_name, '%s.dehydrate_many' % type(field_object).__name__, field_object.dehydrate_many, batch, for_list=for_list)
+            else:
+                dehydrated = field_object.dehydrate_many(batch, for_list=for_list)
+
+            if dehydrated is None:
+                continue
+
+            for bundle, value in zip(batch, dehydrated):
+                if bundle.predehydrated is None:
+                    bundle.predehydrated = {}
+
+                bundle.predehydrated[field_name] = value
+
+    def get_column_plan(self, obj_list, fieldset=None, for_list=True):
+        """
+        Works out how to dehydrate the objects a column at a time, without
+        instantiating them. Returns ``None`` if they need dehydrating one by
+        one.
+
+        This needs to be implemented at the user level.
+
+        ``ModelResource`` includes a full working version specific to Django's
+        ``Models``.
+        """
+        return None
+
     def dehydrate(self, bundle):
         """
         A hook to allow a final manipulation of data once all fields/methods
@@ -1036,6 +1457,10 @@ class Resource(metaclass=DeclarativeMetaclass):
         if self._meta.filtering:
             data['filtering'] = self._meta.filtering
 
+        if self._meta.aggregations:
+            data['aggregations'] = self._meta.aggregations
+            data['aggregate_group_by'] = self._meta.aggregate_group_by
+
         # Skip assigning pk_field_name for non-model resources
         try:
             pk_field_name = self._meta.queryset.model._meta.pk.name
@@ -1257,9 +1682,12 @@ class Resource(metaclass=DeclarativeMetaclass):
 
         Mostly a useful shortcut/hook.
         """
-        desired_format = self.determine_format(request)
-        serialized = self.serialize(request, data, desired_format)
-        return response_class(content=serialized, content_type=build_content_type(desired_format), **response_kwargs)
+        with self.time_phase(request, 'serialize'):
+            desired_format = self.determine_format(request)
+            serialized = self.serialize(request, data, desired_format)
+
+        with self.time_phase(request, 'render'):
+            return response_class(content=serialized, content_type=build_content_type(desired_format), **response_kwargs)
 
     def error_response(self, request, errors, response_class=None):
         """
@@ -1331,6 +1759,14 @@ class Resource(metaclass=DeclarativeMetaclass):
 
     # Views.
 
+    def reset_dehydration_memo(self, request):
+        """
+        Starts an empty memo of dehydrated related objects for the response
+        being built, so related objects that show up repeatedly are only
+        dehydrated once (see ``RelatedField.memoize``).
+        """
+        request._tastypie_dehydrated = {}
+
     def get_list(self, request, **kwargs):
         """
         Returns a serialized list of resources.
@@ -1342,23 +1778,103 @@ class Resource(metaclass=DeclarativeMetaclass):
         """
         # TODO: Uncached for now. Invalidation that works for everyone may be
         #       impossible.
+        fieldset = self.build_sparse_fieldset(request)
+        self.reset_dehydration_memo(request)
         base_bundle = self.build_bundle(request=request)
-        objects = self.obj_get_list(bundle=base_bundle, **self.remove_api_resource_names(kwargs))
-        sorted_objects = self.apply_sorting(objects, options=request.GET)
 
-        paginator = self._meta.paginator_class(request.GET, sorted_objects, resource_uri=self.get_resource_uri(), limit=self._meta.limit, max_limit=self._meta.max_limit, collection_name=self._meta.collection_name)
-        to_be_serialized = paginator.page()
+        with self.time_phase(request, 'query'):
+            objects = self.obj_get_list(bundle=base_bundle, **self.remove_api_resource_names(kwargs))
+            sorted_objects = self.apply_sorting(objects, options=request.GET)
+            sorted_objects = self.apply_sparse_fieldset(sorted_objects, fieldset)
+            self._meta.query_cost.check_query(self, sorted_objects)
+
+            paginator = self._meta.paginator_class(request.GET, sorted_objects, resource_uri=self.get_resource_uri(), limit=self._meta.limit, max_limit=self._meta.max_limit, collection_name=self._meta.collection_name)
+            to_be_serialized = paginator.page()
+
+            page = to_be_serialized[self._meta.collection_name]
+            column_plan = None
+
+            # Profiling measures ``full_dehydrate``, field by field.
+            if get_dehydration_profiler() is None:
+                column_plan = self.get_column_plan(page, fieldset, for_list=True)
+
+            if column_plan is None and isinstance(page, QuerySet):
+                # Fetch the page here rather than while dehydrating it.
+                # (Column dehydration reads the rows itself.)
+                len(page)
 
         # Dehydrate the bundles in preparation for serialization.
-        bundles = [
-            self.full_dehydrate(self.build_bundle(obj=obj, request=request), for_list=True)
-            for obj in to_be_serialized[self._meta.collection_name]
-        ]
+        with self.time_phase(request, 'dehydrate'):
+            bundles = self.dehydrate_page(request, page, fieldset, column_plan)
 
         to_be_serialized[self._meta.collection_name] = bundles
         to_be_serialized = self.alter_list_data_to_serialize(request, to_be_serialized)
         return self.create_response(request, to_be_serialized)
 
+    def dehydrate_page(self, request, page, fieldset=None, column_plan=None):
+        """
+        Dehydrates a page of objects into bundles for ``get_list``, a column
+        at a time if there's a ``column_plan``.
+        """
+        if column_plan is not None:
+            return self.dehydrate_columns(page, column_plan, request)
+
+        bundles = []
+
+        for obj in page:
+            bundle = self.build_bundle(obj=obj, request=request)
+            bundle.fieldset = fieldset
+            bundles.append(bundle)
+
+        workers = self._meta.dehydrate_workers
+
+        # Profiling measures ``full_dehydrate`` in the current thread.
+        if workers and len(bundles) > 1 and get_dehydration_profiler() is None and self.can_dehydrate_in_parallel():
+            return self.dehydrate_in_parallel(request, bundles, workers)
+
+        self.dehydrate_many(bundles, for_list=True)
+        return [self.full_dehydrate(bundle, for_list=True) for bundle in bundles]
+
+    def can_dehydrate_in_parallel(self):
+        """
+        Returns whether ``Meta.dehydrate_workers`` may be used for the
+        current request.
+
+        Always ``True`` here, as a ``Resource`` doesn't know where its data
+        comes from.
+        """
+        return True
+
+    def dehydrate_in_parallel(self, request, bundles, workers):
+        """
+        Dehydrates the ``bundles`` in ``workers`` chunks, in the pool set by
+        ``Meta.dehydrate_pool``, keeping them in order.
+
+        When the response is in a format built from simple types (like
+        JSON), each chunk is also turned into simple types in the pool,
+        unless ``alter_list_data_to_serialize`` is overridden (as it would
+        then get simple types rather than bundles).
+        """
+        simplify = self._meta.serializer.simplifies(self.determine_format(request))
+
+        if is_overridden(self, 'alter_list_data_to_serialize', Resource):
+            simplify = False
+        chunks = split(bundles, workers)
+        executor = get_executor(self._meta.dehydrate_pool, workers)
+
+        if self._meta.dehydrate_pool == 'process':
+            objs = [[bundle.obj for bundle in chunk] for chunk in chunks]
+            results = executor.map(dehydrate_objects, repeat(type(self)), repeat(self._meta.api_name), objs, repeat(bundles[0].fieldset), repeat(simplify))
+
+            for bundle, data in zip(bundles, chain.from_iterable(results)):
+                bundle.data = data
+
+            return bundles
+
+        self.dehydrate_many(bundles, for_list=True)
+        results = executor.map(dehydrate_bundles, repeat(self), chunks, repeat(simplify))
+        return list(chain.from_iterable(results))
+
     def get_detail(self, request, **kwargs):
         """
         Returns a single serialized resource.
@@ -1368,17 +1884,23 @@ class Resource(metaclass=DeclarativeMetaclass):
 
         Should return a HttpResponse (200 OK).
         """
+        fieldset = self.build_sparse_fieldset(request)
+        self.reset_dehydration_memo(request)
         basic_bundle = self.build_bundle(request=request)
 
         try:
-            obj = self.cached_obj_get(bundle=basic_bundle, **self.remove_api_resource_names(kwargs))
+            with self.time_phase(request, 'query'):
+                obj = self.cached_obj_get(bundle=basic_bundle, **self.remove_api_resource_names(kwargs))
         except ObjectDoesNotExist:
             return http.HttpNotFound()
         except MultipleObjectsReturned:
             return http.HttpMultipleChoices("More than one resource is found at this URI.")
 
         bundle = self.build_bundle(obj=obj, request=request)
-        bundle = self.full_dehydrate(bundle)
+        bundle.fieldset = fieldset
+
+        with self.time_phase(request, 'dehydrate'):
+            bundle = self.full_dehydrate(bundle)
         bundle = self.alter_detail_data_to_serialize(request, bundle)
         return self.create_response(request, bundle)
 
@@ -1605,7 +2127,10 @@ class Resource(metaclass=DeclarativeMetaclass):
         if len(deserialized[collection_name]) and 'put' not in self._meta.detail_allowed_methods:
             raise ImmediateHttpResponse(response=http.HttpMethodNotAllowed())
 
-        bundles_seen = []
+        # Resolve every existing object first, so the updates can be
+        # authorized as a single batch before anything is written.
+        operations = []
+        update_bundles = []
 
         for data in deserialized[collection_name]:
             # If there's a resource_uri then this is either an
@@ -1620,16 +2145,24 @@ class Resource(metaclass=DeclarativeMetaclass):
                     bundle = self.build_bundle(obj=obj, request=request)
                     bundle = self.full_dehydrate(bundle, for_list=True)
                     bundle = self.alter_detail_data_to_serialize(request, bundle)
-                    self.update_in_place(request, bundle, data)
+                    update_bundles.append(bundle)
+                    operations.append((bundle, data))
                 except (ObjectDoesNotExist, MultipleObjectsReturned):
                     # The object referenced by resource_uri doesn't exist,
                     # so this is a create-by-PUT equivalent.
-                    data = self.alter_deserialized_detail_data(request, data)
-                    bundle = self.build_bundle(data=data, request=request)
-                    self.obj_create(bundle=bundle)
+                    operations.append((None, data))
             else:
                 # There's no resource URI, so this is a create call just
                 # like a POST to the list resource.
+                operations.append((None, data))
+
+        self.preauthorize_batch('update', update_bundles)
+        bundles_seen = []
+
+        for bundle, data in operations:
+            if bundle is not None:
+                self.update_in_place(request, bundle, data)
+            else:
                 data = self.alter_deserialized_detail_data(request, data)
                 bundle = self.build_bundle(data=data, request=request)
                 self.obj_create(bundle=bundle)
@@ -1642,9 +2175,15 @@ class Resource(metaclass=DeclarativeMetaclass):
             if 'delete' not in self._meta.detail_allowed_methods:
                 raise ImmediateHttpResponse(response=http.HttpMethodNotAllowed())
 
+            delete_bundles = []
+
             for uri in deleted_collection:
                 obj = self.get_via_uri(uri, request=request)
-                bundle = self.build_bundle(obj=obj, request=request)
+                delete_bundles.append(self.build_bundle(obj=obj, request=request))
+
+            self.preauthorize_batch('delete', delete_bundles)
+
+            for bundle in delete_bundles:
                 self.obj_delete(bundle=bundle)
 
         if not self._meta.always_return_data:
@@ -1740,8 +2279,10 @@ class Resource(metaclass=DeclarativeMetaclass):
         """
         Returns a serialized form of the schema of the resource.
 
-        Calls ``build_schema`` to generate the data. This method only responds
-        to HTTP GET.
+        Calls ``build_schema`` to generate the data, which is serialized once
+        per format & cached. If ``create_response`` is overridden, the
+        (cached) data goes through it instead. Responses carry an ``ETag`` &
+        honor ``If-None-Match``. This method only responds to HTTP GET.
 
         Should return a HttpResponse (200 OK).
         """
@@ -1751,7 +2292,40 @@ class Resource(metaclass=DeclarativeMetaclass):
         self.log_throttled_access(request)
         bundle = self.build_bundle(request=request)
         self.authorized_read_detail(self.get_object_list(bundle.request), bundle)
-        return self.create_response(request, self.build_schema())
+        desired_format = self.determine_format(request)
+
+        if 'text/javascript' in desired_format:
+            # JSONP output varies by callback, so isn't worth caching.
+            return self.create_response(request, self.build_schema())
+
+        if is_overridden(self, 'create_response', Resource):
+            # It may add headers or wrap the response, so only the data is
+            # cached (& copied, in case it's changed).
+            cache_key = (None, self._meta.api_name, self._meta.urlconf_namespace, get_script_prefix())
+
+            if cache_key not in self._schema_cache:
+                self._schema_cache[cache_key] = self.build_schema()
+
+            return make_conditional(request, self.create_response(request, deepcopy(self._schema_cache[cache_key])))
+
+        cache_key = (desired_format, self._meta.api_name, self._meta.urlconf_namespace, get_script_prefix())
+
+        if cache_key not in self._schema_cache:
+            serialized = self.serialize(request, self.build_schema(), desired_format)
+            self._schema_cache[cache_key] = (serialized, make_etag(serialized))
+
+        serialized, etag = self._schema_cache[cache_key]
+        return conditional_response(request, serialized, build_content_type(desired_format), etag)
+
+    def clear_schema_cache(self):
+        """
+        Discards the serialized schemas cached by ``get_schema``.
+
+        Called by ``Api`` whenever resources are registered or unregistered.
+        Call it yourself if you change what ``build_schema`` returns at
+        runtime.
+        """
+        self._schema_cache = {}
 
     def get_multiple(self, request, **kwargs):
         """
@@ -1769,6 +2343,7 @@ class Resource(metaclass=DeclarativeMetaclass):
         self.method_check(request, allowed=['get'])
         self.is_authenticated(request)
         self.throttle_check(request)
+        self.reset_dehydration_memo(request)
 
         # Rip apart the list then iterate.
         kwarg_name = '%s_list' % self._meta.detail_uri_name
@@ -1789,17 +2364,20 @@ class Resource(metaclass=DeclarativeMetaclass):
         if queryset is not None:
             # Fetch the objects from the queryset to a dictionary.
             objects_dict = {}
-            for obj in queryset:
-                objects_dict[str(getattr(obj, self._meta.detail_uri_name))] = obj
+
+            with self.time_phase(request, 'query'):
+                for obj in queryset:
+                    objects_dict[str(getattr(obj, self._meta.detail_uri_name))] = obj
 
             # Walk the list of identifiers in order and get the objects or feed the not_found list.
-            for identifier in obj_identifiers:
-                if identifier in objects_dict:
-                    bundle = self.build_bundle(obj=objects_dict[identifier], request=request)
-                    bundle = self.full_dehydrate(bundle, for_list=True)
-                    objects.append(bundle)
-                else:
-                    not_found.append(identifier)
+            with self.time_phase(request, 'dehydrate'):
+                for identifier in obj_identifiers:
+                    if identifier in objects_dict:
+                        bundle = self.build_bundle(obj=objects_dict[identifier], request=request)
+                        bundle = self.full_dehydrate(bundle, for_list=True)
+                        objects.append(bundle)
+                    else:
+                        not_found.append(identifier)
         else:
             # Use the old way.
             for identifier in obj_identifiers:
@@ -1822,7 +2400,349 @@ class Resource(metaclass=DeclarativeMetaclass):
         return self.create_response(request, object_list)
 
 
-class ModelDeclarativeMetaclass(DeclarativeMetaclass):
+class AsyncResource(Resource):
+    """
+    A ``Resource`` whose views are coroutines, for serving under ASGI
+    without tying up a thread per request.
+
+    ``wrap_view`` looks for an async counterpart of each view & hook (the
+    same name prefixed with ``a``, like ``aget_list`` for ``get_list``).
+    Authentication, throttling, authorization & the ``GET`` views are
+    async; anything else (``post_list``, ``obj_get_list`` on a plain
+    ``AsyncResource``, etc.) runs in a thread with ``sync_to_async``.
+
+    Overriding the sync version of a hook takes precedence over the async
+    counterpart it inherits, so subclasses that only know about the sync
+    API keep working, at the cost of a thread.
+    """
+    def get_async_method(self, name):
+        """
+        Returns the async counterpart of the ``name`` method, or ``None`` if
+        there isn't one or ``name`` is overridden further down the class
+        hierarchy.
+        """
+        async_name = 'a%s' % name
+
+        for klass in type(self).__mro__:
+            if async_name in vars(klass):
+                return getattr(self, async_name)
+
+            if name in vars(klass):
+                return None
+
+        return None
+
+    async def call_async(self, name, *args, **kwargs):
+        """
+        Calls the async counterpart of the ``name`` method if there's one,
+        running ``name`` in a thread otherwise.
+        """
+        method = self.get_async_method(name)
+
+        if method is None:
+            return await sync_to_async(getattr(self, name))(*args, **kwargs)
+
+        return await method(*args, **kwargs)
+
+    async def call_hook(self, name, *args, **kwargs):
+        """
+        Calls the sync ``name`` hook, in a thread if it's been overridden (as
+        it may use the ORM), or directly otherwise.
+        """
+        method = getattr(self, name)
+
+        if is_overridden(self, name, Resource):
+            return await sync_to_async(method)(*args, **kwargs)
+
+        return method(*args, **kwargs)
+
+    def wrap_view(self, view):
+        """
+        Wraps methods so they can be called as async views, handling
+        exceptions the same way as ``Resource.wrap_view``.
+
+        Request timing (``Meta.timing``) isn't supported by async views.
+        """
+        async def wrapper(request, *args, **kwargs):
+            try:
+                response = await self.call_async(view, request, *args, **kwargs)
+                return self.patch_response(request, response)
+            except Exception as e:
+                return self.handle_view_exception(request, e)
+
+        # ``csrf_exempt`` only supports async views from Django 5.0.
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    async def adispatch_list(self, request, **kwargs):
+        return await self.adispatch('list', request, **kwargs)
+
+    async def adispatch_detail(self, request, **kwargs):
+        return await self.adispatch('detail', request, **kwargs)
+
+    async def adispatch(self, request_type, request, **kwargs):
+        """
+        The async counterpart of ``dispatch``.
+        """
+        allowed_methods = getattr(self._meta, "%s_allowed_methods" % request_type, None)
+
+        if 'HTTP_X_HTTP_METHOD_OVERRIDE' in request.META:
+            request.method = request.META['HTTP_X_HTTP_METHOD_OVERRIDE']
+
+        request_method = self.method_check(request, allowed=allowed_methods)
+        method_name = "%s_%s" % (request_method, request_type)
+
+        if getattr(self, method_name, None) is None:
+            raise ImmediateHttpResponse(response=http.HttpNotImplemented())
+
+        await self.call_async('is_authenticated', request)
+        await self.call_async('throttle_check', request)
+
+        # All clear. Process the request.
+        request = convert_post_to_put(request)
+        response = await self.call_async(method_name, request, **kwargs)
+
+        # Add the throttled request.
+        await self.call_async('log_throttled_access', request)
+
+        # If what comes back isn't a ``HttpResponse``, assume that the
+        # request was accepted and that some action occurred. This also
+        # prevents Django from freaking out.
+        if not isinstance(response, HttpResponse):
+            return http.HttpNoContent()
+
+        return response
+
+    async def ais_authenticated(self, request):
+        """
+        The async counterpart of ``is_authenticated``, using
+        ``ais_authenticated`` on the ``authentication`` class.
+        """
+        auth_result = await self._meta.authentication.ais_authenticated(request)
+
+        if isinstance(auth_result, HttpResponse):
+            raise ImmediateHttpResponse(response=auth_result)
+
+        if auth_result is not True:
+            raise ImmediateHttpResponse(response=http.HttpUnauthorized())
+
+        self.set_authentication_result(request)
+
+    async def aget_identifier(self, request):
+        # The built-in backends work the identifier out from the request (&
+        # its user, loaded by now), so this only needs a thread if
+        # ``get_identifier`` is overridden.
+        if is_overridden(self, 'get_identifier', Resource):
+            return await sync_to_async(self.get_identifier)(request)
+
+        return self.get_identifier(request)
+
+    async def athrottle_check(self, request):
+        """
+        The async counterpart of ``throttle_check``, using
+        ``ashould_be_throttled`` on the ``throttle`` class.
+        """
+        identifier = await self.aget_identifier(request)
+        throttle = await self._meta.throttle.ashould_be_throttled(identifier)
+
+        if throttle:
+            # Throttle limit exceeded.
+
+            response = http.HttpTooManyRequests()
+
+            if isinstance(throttle, int) and not isinstance(throttle, bool):
+                response['Retry-After'] = throttle
+            elif isinstance(throttle, datetime):
+                # change to UTC (GMT) and make naive, to avoid wsgiref also doing an implicit TZ conversion
+                throttle_utc = make_naive_utc(throttle)
+                response['Retry-After'] = format_date_time(mktime(throttle_utc.timetuple()))
+
+            raise ImmediateHttpResponse(response=response)
+
+    async def alog_throttled_access(self, request):
+        """
+        The async counterpart of ``log_throttled_access``, using
+        ``aaccessed`` on the ``throttle`` class.
+        """
+        identifier = await self.aget_identifier(request)
+        await self._meta.throttle.aaccessed(identifier, url=request.get_full_path(), request_method=request.method.lower())
+
+    async def aauthorized_read_list(self, object_list, bundle):
+        """
+        The async counterpart of ``authorized_read_list``.
+        """
+        try:
+            auth_result = await self._meta.authorization.aread_list(object_list, bundle)
+        except Unauthorized as e:
+            self.unauthorized_result(e)
+
+        return auth_result
+
+    async def aauthorized_read_detail(self, object_list, bundle):
+        """
+        The async counterpart of ``authorized_read_detail``.
+        """
+        try:
+            auth_result = await self._meta.authorization.aread_detail(object_list, bundle)
+            if auth_result is not True:
+                raise Unauthorized()
+        except Unauthorized as e:
+            self.unauthorized_result(e)
+
+        return auth_result
+
+    async def acached_obj_get(self, bundle, **kwargs):
+        """
+        The async counterpart of ``cached_obj_get``, using the async API of
+        the ``cache`` class.
+        """
+        cache_key = self.generate_cache_key('detail', **kwargs)
+        cached_bundle = await self._meta.cache.aget(cache_key)
+
+        if cached_bundle is None:
+            cached_bundle = await self.call_async('obj_get', bundle=bundle, **kwargs)
+            await self._meta.cache.aset(cache_key, cached_bundle)
+
+        return cached_bundle
+
+    async def aget_list(self, request, **kwargs):
+        """
+        The async counterpart of ``get_list``.
+
+        Fetches the page with the async ORM (where it's a ``QuerySet``), then
+        dehydrates it in a single thread, as fields may still load related
+        objects.
+        """
+        fieldset = self.build_sparse_fieldset(request)
+        self.reset_dehydration_memo(request)
+        base_bundle = self.build_bundle(request=request)
+
+        objects = await self.call_async('obj_get_list', bundle=base_bundle, **self.remove_api_resource_names(kwargs))
+        sorted_objects = self.apply_sorting(objects, options=request.GET)
+        sorted_objects = self.apply_sparse_fieldset(sorted_objects, fieldset)
+
+        if is_overridden(self._meta.query_cost, 'check_query', BaseQueryCostGuard):
+            await sync_to_async(self._meta.query_cost.check_query)(self, sorted_objects)
+
+        paginator = self._meta.paginator_class(request.GET, sorted_objects, resource_uri=self.get_resource_uri(), limit=self._meta.limit, max_limit=self._meta.max_limit, collection_name=self._meta.collection_name)
+        to_be_serialized = await paginator.apage()
+
+        page = to_be_serialized[self._meta.collection_name]
+        column_plan = None
+
+        if get_dehydration_profiler() is None:
+            column_plan = self.get_column_plan(page, fieldset, for_list=True)
+
+        if column_plan is None and isinstance(page, QuerySet):
+            page = [obj async for obj in page]
+
+        bundles = await self.adehydrate_page(request, page, fieldset, column_plan)
+
+        to_be_serialized[self._meta.collection_name] = bundles
+        to_be_serialized = await self.call_hook('alter_list_data_to_serialize', request, to_be_serialized)
+        return await self.call_hook('create_response', request, to_be_serialized)
+
+    async def aget_detail(self, request, **kwargs):
+        """
+        The async counterpart of ``get_detail``.
+        """
+        fieldset = self.build_sparse_fieldset(request)
+        self.reset_dehydration_memo(request)
+        basic_bundle = self.build_bundle(request=request)
+
+        try:
+            obj = await self.call_async('cached_obj_get', bundle=basic_bundle, **self.remove_api_resource_names(kwargs))
+        except ObjectDoesNotExist:
+            return http.HttpNotFound()
+        except MultipleObjectsReturned:
+            return http.HttpMultipleChoices("More than one resource is found at this URI.")
+
+        bundle = self.build_bundle(obj=obj, request=request)
+        bundle.fieldset = fieldset
+        bundle = await self.afull_dehydrate(bundle)
+        bundle = await self.call_hook('alter_detail_data_to_serialize', request, bundle)
+        return await self.call_hook('create_response', request, bundle)
+
+    async def adehydrate_page(self, request, page, fieldset=None, column_plan=None):
+        """
+        The async counterpart of ``dehydrate_page``.
+
+        Related fields with an async ``attribute`` are resolved concurrently
+        (see ``adehydrate_related_fields``), the rest in a thread.
+        """
+        # Profiling measures ``full_dehydrate``, so leaves them to it.
+        if column_plan is not None or not self.has_async_related_fields() or get_dehydration_profiler() is not None:
+            return await sync_to_async(self.dehydrate_page)(request, page, fieldset, column_plan)
+
+        bundles = []
+
+        for obj in page:
+            bundle = self.build_bundle(obj=obj, request=request)
+            bundle.fieldset = fieldset
+            bundles.append(bundle)
+
+        await sync_to_async(self.dehydrate_many)(bundles, for_list=True)
+        await self.adehydrate_related_fields(bundles, for_list=True)
+
+        def full_dehydrate_all():
+            return [self.full_dehydrate(bundle, for_list=True) for bundle in bundles]
+
+        return await sync_to_async(full_dehydrate_all)()
+
+    async def afull_dehydrate(self, bundle, for_list=False):
+        """
+        The async counterpart of ``full_dehydrate``, resolving the related
+        fields with an async ``attribute`` concurrently first.
+        """
+        if self.has_async_related_fields() and get_dehydration_profiler() is None:
+            await self.adehydrate_related_fields([bundle], for_list=for_list)
+
+        return await sync_to_async(self.full_dehydrate)(bundle, for_list=for_list)
+
+    def has_async_related_fields(self):
+        return any(
+            field_object.dehydrated_type == 'related' and iscoroutinefunction(field_object.attribute)
+            for field_object in self.fields.values()
+        )
+
+    async def adehydrate_related_fields(self, bundles, for_list=False):
+        """
+        Resolves the related fields with an async ``attribute`` (like a call
+        to another service) for all of the ``bundles`` at once, via the
+        fields' ``adehydrate``.
+
+        At most ``Meta.related_concurrency`` run at a time. The results go
+        in ``bundle.predehydrated``, so ``full_dehydrate`` still adds the
+        fields in order.
+        """
+        semaphore = asyncio.Semaphore(self._meta.related_concurrency)
+        pending = []
+
+        async def resolve(bundle, field_object):
+            async with semaphore:
+                return await field_object.adehydrate(bundle, for_list=for_list)
+
+        for field_name, field_object in self.fields.items():
+            if field_object.dehydrated_type != 'related' or not iscoroutinefunction(field_object.attribute):
+                continue
+
+            for bundle in bundles:
+                if bundle.predehydrated is not None and field_name in bundle.predehydrated:
+                    continue
+
+                if self.should_dehydrate_field(bundle, field_name, field_object, for_list=for_list):
+                    pending.append((bundle, field_name, field_object))
+
+        results = await asyncio.gather(*[resolve(bundle, field_object) for bundle, field_name, field_object in pending])
+
+        for (bundle, field_name, field_object), value in zip(pending, results):
+            if bundle.predehydrated is None:
+                bundle.predehydrated = {}
+
+            bundle.predehydrated[field_name] = value
+
+
+class ModelDeclarativeMetaclass(DeclarativeMetaclass):
     def __new__(cls, name, bases, attrs):
         meta = attrs.get('Meta')
         if getattr(meta, 'abstract', False):
@@ -1870,6 +2790,12 @@ class ModelDeclarativeMetaclass(DeclarativeMetaclass):
         elif 'absolute_url' in new_class.base_fields and 'absolute_url' not in attrs:
             del new_class.base_fields['absolute_url']
 
+        if new_class._meta.column_dehydration is None:
+            # Only read lists a column at a time when nothing on the resource
+            # could need the model instances.
+            object_class = new_class._meta.object_class
+            new_class._meta.column_dehydration = object_class is not None and new_class.build_column_plan(object_class, new_class.base_fields.items()) is not None
+
         return new_class
 
 
@@ -2083,44 +3009,149 @@ class BaseModelResource(Resource):
             filters = {}
 
         qs_filters = {}
+        filter_table = self.get_filter_table()
 
         for filter_expr, value in filters.items():
-            filter_bits = filter_expr.split(LOOKUP_SEP)
-            field_name = filter_bits.pop(0)
-            filter_type = 'exact'
+            compiled = filter_table.get(filter_expr)
 
-            if field_name not in self.fields:
-                # It's not a field we know about. Move along citizen.
-                continue
+            if compiled is None:
+                compiled = self.compile_filter(filter_expr, ignore_bad_filters=ignore_bad_filters)
 
-            # Validate filter types other than 'exact' that are supported by the field type
-            try:
-                django_field_name = self.fields[field_name].attribute
-                django_field = self._meta.object_class._meta.get_field(django_field_name)
-                if hasattr(django_field, 'field'):
-                    django_field = django_field.field  # related field
-            except FieldDoesNotExist:
-                raise InvalidFilterError("The '%s' field is not a valid field name" % field_name)
+                if compiled is None:
+                    continue
 
-            query_terms = django_field.get_lookups().keys()
-            if len(filter_bits) and filter_bits[-1] in query_terms:
-                filter_type = filter_bits.pop()
+                if len(filter_table) < FILTER_TABLE_SIZE:
+                    filter_table[filter_expr] = compiled
 
-            try:
-                lookup_bits = self.check_filtering(field_name, filter_type, filter_bits)
-            except InvalidFilterError:
-                if ignore_bad_filters:
-                    continue
-                else:
-                    raise
+            field_name, filter_type, qs_filter = compiled
             value = self.filter_value_to_python(value, field_name, filters, filter_expr, filter_type)
-
-            db_field_name = LOOKUP_SEP.join(lookup_bits)
-            qs_filter = "%s%s%s" % (db_field_name, LOOKUP_SEP, filter_type)
             qs_filters[qs_filter] = value
 
         return qs_filters
 
+    def get_filter_table(self):
+        """
+        Returns the table of filter expressions already compiled by
+        ``compile_filter``, so ``build_filters`` only needs to look each one
+        up.
+
+        The table starts over if ``Meta.filtering`` is replaced. Call
+        ``clear_filter_table`` if you change it (or the filtering of a
+        related resource) in place.
+        """
+        filtering, filter_table = self._filter_table
+
+        if filtering is not self._meta.filtering:
+            filter_table = {}
+            self._filter_table = (self._meta.filtering, filter_table)
+
+        return filter_table
+
+    def clear_filter_table(self):
+        """
+        Forgets the compiled filter expressions.
+        """
+        self._filter_table = (None, {})
+
+    def compile_filter(self, filter_expr, ignore_bad_filters=False):
+        """
+        Works out how to apply a filter expression (like
+        ``user__username__startswith``).
+
+        Returns a tuple of the resource field name, the filter type & the ORM
+        lookup to filter on, or ``None`` if the expression should be skipped.
+        Raises ``InvalidFilterError`` if the filter isn't allowed.
+        """
+        filter_bits = filter_expr.split(LOOKUP_SEP)
+        field_name = filter_bits.pop(0)
+        filter_type = 'exact'
+
+        if field_name not in self.fields:
+            # It's not a field we know about. Move along citizen.
+            return None
+
+        # Validate filter types other than 'exact' that are supported by the field type
+        try:
+            django_field_name = self.fields[field_name].attribute
+            django_field = self._meta.object_class._meta.get_field(django_field_name)
+            if hasattr(django_field, 'field'):
+                django_field = django_field.field  # related field
+        except FieldDoesNotExist:
+            raise InvalidFilterError("The '%s' field is not a valid field name" % field_name)
+
+        query_terms = django_field.get_lookups().keys()
+        if len(filter_bits) and filter_bits[-1] in query_terms:
+            filter_type = filter_bits.pop()
+
+        try:
+            lookup_bits = self.check_filtering(field_name, filter_type, filter_bits)
+        except InvalidFilterError:
+            if ignore_bad_filters:
+                return None
+            else:
+                raise
+
+        db_field_name = LOOKUP_SEP.join(lookup_bits)
+        qs_filter = "%s%s%s" % (db_field_name, LOOKUP_SEP, filter_type)
+        return field_name, filter_type, qs_filter
+
+    def build_compound_filter(self, expression):
+        """
+        Compiles a compound filter expression (the ``filter`` GET parameter,
+        see ``tastypie.filterexpressions``) into a ``Q`` object, within the
+        ``Meta.max_filter_terms`` & ``Meta.max_filter_depth`` limits.
+
+        Every term is checked like any other filter (via ``compile_filter``),
+        but must be about one of the resource's fields.
+
+        Returns the ``Q`` & a list of the ``(ORM lookup, value)`` terms in it.
+        """
+        tree = parse_filter_expression(expression, max_terms=self._meta.max_filter_terms, max_depth=self._meta.max_filter_depth)
+        lookups = []
+        return self.compile_filter_tree(tree, lookups), lookups
+
+    def compile_filter_tree(self, node, lookups):
+        """
+        Turns a node of a parsed compound filter expression into a ``Q``
+        object, adding its terms to ``lookups``.
+        """
+        if node[0] == 'term':
+            filter_expr, value = node[1], node[2]
+            filter_table = self.get_filter_table()
+            compiled = filter_table.get(filter_expr)
+
+            if compiled is None:
+                compiled = self.compile_filter(filter_expr)
+
+                if compiled is None:
+                    raise InvalidFilterError("The '%s' field does not allow filtering." % filter_expr.split(LOOKUP_SEP)[0])
+
+                if len(filter_table) < FILTER_TABLE_SIZE:
+                    filter_table[filter_expr] = compiled
+
+            field_name, filter_type, qs_filter = compiled
+            value = self.filter_value_to_python(value, field_name, {filter_expr: value}, filter_expr, filter_type)
+            lookups.append((qs_filter, value))
+            return Q(**{qs_filter: value})
+
+        operator, children = node
+        combined = None
+
+        for child in children:
+            q = self.compile_filter_tree(child, lookups)
+
+            if combined is None:
+                combined = q
+            elif operator == 'or':
+                combined = combined | q
+            else:
+                combined = combined & q
+
+        if operator == 'not':
+            return ~combined
+
+        return combined
+
     def apply_sorting(self, obj_list, options=None):
         """
         Given a dictionary of options, apply some ORM-level sorting to the
@@ -2176,8 +3207,481 @@ class BaseModelResource(Resource):
 
             order_by_args.append("%s%s" % (order, LOOKUP_SEP.join([self.fields[field_name].attribute] + order_by_bits[1:])))
 
+        self._meta.query_cost.check_ordering(self, order_by_args)
         return obj_list.order_by(*order_by_args)
 
+    def apply_sparse_fieldset(self, obj_list, fieldset):
+        """
+        An ORM-specific implementation of ``apply_sparse_fieldset``.
+
+        Drops any ``select_related``/``prefetch_related`` lookups for related
+        fields that weren't selected, then loads only the columns the
+        selected fields need (via ``only``), or skips the columns of the
+        excluded fields (via ``defer``).
+
+        Columns are left alone if a selected field's ``attribute`` isn't a
+        plain model field (since we can't tell what it needs), or if the
+        ``QuerySet`` already uses ``only``/``defer``. Nothing is narrowed if
+        the resource overrides ``dehydrate`` or has ``dehydrate_FOO`` methods
+        for the selected fields, as those could read any column or relation
+        (costing a query per object).
+        """
+        if fieldset is None or not isinstance(obj_list, QuerySet):
+            return obj_list
+
+        if self.has_dehydrate_hooks(fieldset):
+            return obj_list
+
+        model = obj_list.model
+        selected = {}
+        unselected_relations = set()
+
+        for field_name, field_object in self.fields.items():
+            attribute = field_object.attribute
+            first_bit = attribute.split(LOOKUP_SEP)[0] if isinstance(attribute, str) else None
+
+            if fieldset.allows(field_name):
+                selected[field_name] = first_bit
+            elif getattr(field_object, 'is_related', False) and first_bit:
+                unselected_relations.add(first_bit)
+
+        # Don't join or prefetch what won't be used.
+        unselected_relations -= set(bit for bit in selected.values() if bit)
+        relations = set()
+
+        if isinstance(obj_list.query.select_related, dict):
+            lookups = list(flatten_select_related(obj_list.query.select_related))
+            kept = [lookup for lookup in lookups if lookup.split(LOOKUP_SEP)[0] not in unselected_relations]
+
+            if len(kept) != len(lookups):
+                obj_list = obj_list.select_related(None).select_related(*kept)
+
+            relations.update(lookup.split(LOOKUP_SEP)[0] for lookup in kept)
+
+        prefetches = obj_list._prefetch_related_lookups
+        kept = [lookup for lookup in prefetches if getattr(lookup, 'prefetch_through', lookup).split(LOOKUP_SEP)[0] not in unselected_relations]
+
+        if len(kept) != len(prefetches):
+            obj_list = obj_list.prefetch_related(None).prefetch_related(*kept)
+
+        if obj_list.query.deferred_loading[0]:
+            return obj_list
+
+        if fieldset.include is not None:
+            columns = set([model._meta.pk.name]) | relations
+            needed = [self._meta.detail_uri_name] if 'resource_uri' in selected else []
+
+            for field_name, first_bit in selected.items():
+                if field_name == 'resource_uri':
+                    continue
+
+                if first_bit is None:
+                    # A callable or no ``attribute``. Could need anything.
+                    return obj_list
+
+                needed.append(first_bit)
+
+            for name in needed:
+                try:
+                    model_field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    if name == 'pk':
+                        continue
+
+                    # Likely a property, which could need anything.
+                    return obj_list
+
+                if model_field.concrete:
+                    columns.add(model_field.name)
+
+            return obj_list.only(*columns)
+
+        # Only excluded fields left. Skip their columns, unless something
+        # else still needs them.
+        needed = set(bit for bit in selected.values() if bit) | relations | set([self._meta.detail_uri_name])
+        deferred = []
+
+        for field_name, field_object in self.fields.items():
+            if field_name in selected or not isinstance(field_object.attribute, str) or field_object.attribute in needed:
+                continue
+
+            try:
+                model_field = model._meta.get_field(field_object.attribute)
+            except FieldDoesNotExist:
+                continue
+
+            if model_field.concrete and not model_field.primary_key:
+                deferred.append(model_field.name)
+
+        if deferred:
+            obj_list = obj_list.defer(*deferred)
+
+        return obj_list
+
+    def has_dehydrate_hooks(self, fieldset):
+        """
+        Returns whether dehydrating with the ``fieldset`` runs any code
+        beyond the fields themselves (``dehydrate`` or a ``dehydrate_FOO``
+        method), which could need any of the object's data.
+        """
+        if is_overridden(self, 'dehydrate', Resource):
+            return True
+
+        for field_name in self.fields:
+            name = 'dehydrate_%s' % field_name
+
+            if not fieldset.allows(field_name) or getattr(self, name, None) is None:
+                continue
+
+            # Tastypie's own (like ``dehydrate_resource_uri``) are accounted for.
+            if not hasattr(Resource, name) or is_overridden(self, name, Resource):
+                return True
+
+        return False
+
+    @classmethod
+    def build_column_plan(cls, model, field_items):
+        """
+        Works out which column of the ``model`` each of the ``(field_name,
+        field_object)`` pairs can be dehydrated from, without needing any
+        objects.
+
+        Returns a list of ``(field_name, field_object, column)`` tuples, in
+        order, where ``column`` is the model column holding the data (or
+        ``None`` for fields without an ``attribute``). ``resource_uri`` reads
+        the ``detail_uri_name`` column & a ``ToOneField`` reads its foreign
+        key column (like ``author_id``).
+
+        Returns ``None`` whenever model instances would be needed, i.e. for
+        ``full`` or to-many related fields, callable ``attribute``/``use_in``
+        values, columns with custom descriptors (like files), fields
+        overriding ``dehydrate`` or with a ``dehydrate_FOO`` method, or a
+        resource overriding any of the bundle building, dehydration or URI
+        methods.
+        """
+        for hook in ('build_bundle', 'full_dehydrate', 'dehydrate', 'dehydrate_many', 'dehydrate_resource_uri', 'get_resource_uri', 'resource_uri_kwargs', 'detail_uri_kwargs', 'alter_list_data_to_serialize'):
+            if is_overridden(cls, hook, Resource):
+                return None
+
+        plan = []
+
+        for field_name, field_object in field_items:
+            if callable(field_object.use_in):
+                return None
+
+            attribute = field_object.attribute
+
+            if field_name == 'resource_uri':
+                if attribute is not None:
+                    return None
+
+                if cls._meta.detail_uri_name == 'pk':
+                    plan.append((field_name, field_object, model._meta.pk.attname))
+                    continue
+
+                attribute = cls._meta.detail_uri_name
+            elif getattr(cls, "dehydrate_%s" % field_name, None):
+                return None
+            elif attribute is None and not field_object.is_related:
+                if type(field_object).dehydrate is not fields.ApiField.dehydrate:
+                    return None
+
+                plan.append((field_name, field_object, None))
+                continue
+
+            if not isinstance(attribute, str) or LOOKUP_SEP in attribute:
+                return None
+
+            try:
+                model_field = model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                return None
+
+            if not model_field.concrete:
+                return None
+
+            if field_object.is_related and field_name != 'resource_uri':
+                if type(field_object).dehydrate is not fields.ToOneField.dehydrate or field_object.full:
+                    return None
+
+                if not model_field.is_relation or model_field.many_to_many:
+                    return None
+            elif type(field_object).dehydrate is not fields.ApiField.dehydrate:
+                return None
+            elif model_field.is_relation or getattr(model_field, 'descriptor_class', None) is not DeferredAttribute:
+                return None
+
+            plan.append((field_name, field_object, model_field.attname))
+
+        return plan
+
+    def base_urls(self):
+        """
+        The standard URLs this ``Resource`` should respond to, plus the
+        ``aggregate/`` endpoint if ``Meta.aggregations`` allows any.
+        """
+        urls = super(BaseModelResource, self).base_urls()
+
+        if self._meta.aggregations:
+            # Before the detail URL, which would match it too.
+            urls.insert(-1, re_path(r"^(?P<resource_name>%s)/aggregate%s$" % (self._meta.resource_name, trailing_slash), self.wrap_view('get_aggregate'), name="api_get_aggregate"))
+
+        return urls
+
+    def get_aggregate(self, request, **kwargs):
+        """
+        Returns a serialized list of aggregates, computed by the database
+        over the objects ``obj_get_list`` would return (so filtered &
+        authorized the same way).
+
+        Reads the ``aggregate`` GET parameter (like
+        ``aggregate=id__count,price__avg``) & the optional ``group_by`` one
+        (like ``group_by=author,is_active``), checked against
+        ``Meta.aggregations`` & ``Meta.aggregate_group_by``. This method only
+        responds to HTTP GET.
+
+        Should return a HttpResponse (200 OK).
+        """
+        self.method_check(request, allowed=['get'])
+        self.is_authenticated(request)
+        self.throttle_check(request)
+
+        group_by = self.build_group_by(self.get_list_param(request, 'group_by'))
+        annotations = self.build_aggregates(self.get_list_param(request, 'aggregate'))
+
+        base_bundle = self.build_bundle(request=request)
+        objects = self.obj_get_list(bundle=base_bundle, **self.remove_api_resource_names(kwargs))
+        self._meta.query_cost.check_query(self, objects)
+
+        if group_by:
+            group_paths = [path for field_name, field_object, path in group_by]
+            rows = list(objects.order_by(*group_paths).values(*group_paths).annotate(**annotations))
+        else:
+            rows = [objects.order_by().aggregate(**annotations)]
+
+        aggregates = [{} for row in rows]
+
+        for field_name, field_object, path in group_by:
+            values = [row[path] for row in rows]
+
+            if field_object.is_related:
+                related_resource = field_object.get_related_resource(None)
+                uris = related_resource.get_resource_uris([value for value in values if value is not None])
+                uris.reverse()
+                values = [None if value is None else uris.pop() for value in values]
+            else:
+                values = [None if value is None else field_object.convert(value) for value in values]
+
+            for aggregate, value in zip(aggregates, values):
+                aggregate[field_name] = value
+
+        for aggregate, row in zip(aggregates, rows):
+            for alias in annotations:
+                aggregate[alias] = row[alias]
+
+        self.log_throttled_access(request)
+        return self.create_response(request, {self._meta.collection_name: aggregates})
+
+    def get_list_param(self, request, name):
+        """
+        Returns the comma-separated values of the GET parameter, which may
+        also be repeated.
+        """
+        values = []
+
+        for value in request.GET.getlist(name):
+            values.extend(bit.strip() for bit in value.split(',') if bit.strip())
+
+        return values
+
+    def build_group_by(self, field_names):
+        """
+        Given a list of resource field names, returns a list of ``(field_name,
+        field_object, ORM path)`` tuples to group the aggregates by.
+
+        Raises ``BadRequest`` for any not in ``Meta.aggregate_group_by``.
+        """
+        group_by = []
+
+        for field_name in field_names:
+            field_object = self.fields.get(field_name)
+
+            if field_object is None or field_name not in self._meta.aggregate_group_by:
+                raise BadRequest("The '%s' field can not be used to group by." % field_name)
+
+            if not isinstance(field_object.attribute, str) or field_object.is_m2m:
+                raise BadRequest("The '%s' field has no 'attribute' for grouping by." % field_name)
+
+            if field_object.is_related:
+                try:
+                    model_field = self._meta.object_class._meta.get_field(field_object.attribute)
+                except FieldDoesNotExist:
+                    model_field = None
+
+                if model_field is None or not model_field.concrete or not field_object.get_related_resource(None).can_build_resource_uris(model_field.target_field):
+                    raise BadRequest("The '%s' field can not be used to group by." % field_name)
+
+            group_by.append((field_name, field_object, field_object.attribute))
+
+        return group_by
+
+    def build_aggregates(self, aggregates):
+        """
+        Given a list of aggregates (like ``id__count``), returns the ORM
+        annotations to compute them, keyed by the aggregate.
+
+        Raises ``BadRequest`` for any not allowed by ``Meta.aggregations``.
+        """
+        if not aggregates:
+            raise BadRequest("Please provide at least one 'aggregate', like 'id__count'.")
+
+        annotations = {}
+
+        for aggregate in aggregates:
+            field_name, sep, function = aggregate.rpartition(LOOKUP_SEP)
+
+            if not sep or function not in AGGREGATE_FUNCTIONS:
+                raise BadRequest("Invalid aggregate '%s'. Please use the field name, '__' and one of %s." % (aggregate, ', '.join(sorted(AGGREGATE_FUNCTIONS))))
+
+            if function not in self._meta.aggregations.get(field_name, []):
+                raise BadRequest("'%s' is not an allowed aggregate on the '%s' field." % (function, field_name))
+
+            field_object = self.fields.get(field_name)
+
+            if field_object is None or not isinstance(field_object.attribute, str):
+                raise BadRequest("The '%s' field has no 'attribute' for aggregating." % field_name)
+
+            annotations[aggregate] = AGGREGATE_FUNCTIONS[function](field_object.attribute)
+
+        return annotations
+
+    def get_column_plan(self, obj_list, fieldset=None, for_list=True):
+        """
+        An ORM-specific implementation of ``get_column_plan``, used when
+        ``Meta.column_dehydration`` is enabled (or was detected as safe).
+
+        Returns a list of ``(field_name, field_object, column, uri_resource)``
+        tuples, as built by ``build_column_plan``, where ``uri_resource`` is
+        the resource building URIs from the column (for ``resource_uri`` &
+        related fields) or ``None``.
+        """
+        if not self._meta.column_dehydration or not isinstance(obj_list, QuerySet):
+            return None
+
+        if obj_list._iterable_class is not ModelIterable:
+            return None
+
+        field_items = []
+
+        for field_name, field_object in self.fields.items():
+            if fieldset is not None and not fieldset.allows(field_name):
+                continue
+
+            if callable(field_object.use_in):
+                return None
+
+            if field_object.use_in in ['all', 'list' if for_list else 'detail']:
+                field_items.append((field_name, field_object))
+
+        model = obj_list.model
+        plan = self.build_column_plan(model, field_items)
+
+        if not plan:
+            return None
+
+        full_plan = []
+
+        for field_name, field_object, column in plan:
+            uri_resource = None
+
+            if field_name == 'resource_uri':
+                uri_resource = self
+            elif field_object.is_related:
+                uri_resource = field_object.get_related_resource(None)
+                target_field = model._meta.get_field(field_object.attribute).target_field
+
+                if not uri_resource.can_build_resource_uris(target_field):
+                    return None
+
+            full_plan.append((field_name, field_object, column, uri_resource))
+
+        return full_plan
+
+    def can_dehydrate_in_parallel(self):
+        """
+        An ORM-specific implementation of ``can_dehydrate_in_parallel``.
+
+        Worker threads query with connections of their own, so this is
+        ``False`` when they wouldn't see the same data: inside a transaction
+        or with an in-memory SQLite database. It's always ``False`` for the
+        process pool, as connections don't survive being forked.
+        """
+        if self._meta.dehydrate_pool == 'process':
+            return False
+
+        for connection in connections.all():
+            if connection.in_atomic_block:
+                return False
+
+            if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+                return False
+
+        return True
+
+    def dehydrate_columns(self, obj_list, plan, request):
+        """
+        Dehydrates the objects straight from ``values_list`` rows, following
+        a plan from ``get_column_plan``.
+
+        Each field converts its whole column at once (via
+        ``convert_column``), URIs are built via ``get_resource_uris``, then
+        the rows are assembled into bundles, which have no ``obj``.
+        """
+        model = obj_list.model
+        columns = [column for field_name, field_object, column, uri_resource in plan if column is not None]
+        rows = list(obj_list.prefetch_related(None).values_list(*(columns + [model._meta.pk.attname])))
+        transposed = list(zip(*rows))
+        pks = transposed[-1] if rows else ()
+        converted = []
+        index = 0
+
+        for field_name, field_object, column, uri_resource in plan:
+            if column is None:
+                # Nothing to read, same as ``ApiField.dehydrate``.
+                if field_object.has_default():
+                    values = [field_object.convert(field_object.default) for pk in pks]
+                else:
+                    values = [None] * len(pks)
+
+                converted.append(values)
+                continue
+
+            values = list(transposed[index]) if rows else []
+            index += 1
+
+            if uri_resource is not None:
+                if not field_object.null and None in values:
+                    obj = model._base_manager.get(pk=pks[values.index(None)])
+                    raise fields.ApiFieldError("The model '%r' has an empty attribute '%s' and doesn't allow a null value." % (obj, field_object.attribute))
+
+                uris = uri_resource.get_resource_uris([value for value in values if value is not None])
+                uris.reverse()
+                converted.append([None if value is None else uris.pop() for value in values])
+                continue
+
+            if not field_object.null and None in values:
+                if not field_object.has_default():
+                    obj = model._base_manager.get(pk=pks[values.index(None)])
+                    raise fields.ApiFieldError("The object '%r' has an empty attribute '%s' and doesn't allow a default or null value." % (obj, column))
+
+                default = field_object._default
+                values = [(default() if callable(default) else default) if value is None else value for value in values]
+
+            converted.append(field_object.convert_column(values))
+
+        names = [field_name for field_name, field_object, column, uri_resource in plan]
+        return [Bundle(data=dict(zip(names, row)), request=request) for row in zip(*converted)]
+
     def apply_filters(self, request, applicable_filters):
         """
         An ORM-specific implementation of ``apply_filters``.
@@ -2201,6 +3705,18 @@ class BaseModelResource(Resource):
 
         ``GET`` dictionary of bundle.request can be used to narrow the query.
         """
+        objects = self.filter_object_list(bundle, **kwargs)
+
+        try:
+            return self.authorized_read_list(objects, bundle)
+        except ValueError:
+            raise BadRequest("Invalid resource lookup data provided (mismatched type).")
+
+    def filter_object_list(self, bundle, **kwargs):
+        """
+        Returns the objects matching the filters in the ``GET`` dictionary of
+        bundle.request & ``kwargs``, before authorization.
+        """
         filters = {}
 
         if hasattr(bundle.request, 'GET'):
@@ -2209,11 +3725,28 @@ class BaseModelResource(Resource):
 
         # Update with the provided kwargs.
         filters.update(kwargs)
+        compound_filter = None
+
+        if self._meta.compound_filtering and 'filter' in filters:
+            expression = filters.get('filter')
+            del filters['filter']
+            compound_filter, compound_lookups = self.build_compound_filter(expression)
+
         applicable_filters = self.build_filters(filters=filters)
+        self._meta.query_cost.check_filters(self, applicable_filters)
+
+        if compound_filter is not None:
+            # Terms may be OR-ed, so only the plain filters can narrow them.
+            for lookup, value in compound_lookups:
+                self._meta.query_cost.check_filters(self, dict(applicable_filters, **{lookup: value}))
 
         try:
             objects = self.apply_filters(bundle.request, applicable_filters)
-            return self.authorized_read_list(objects, bundle)
+
+            if compound_filter is not None:
+                objects = objects.filter(compound_filter)
+
+            return objects
         except ValueError:
             raise BadRequest("Invalid resource lookup data provided (mismatched type).")
 
@@ -2224,6 +3757,20 @@ class BaseModelResource(Resource):
         Takes optional ``kwargs``, which are used to narrow the query to find
         the instance.
         """
+        applicable_filters = self.build_detail_filters(kwargs)
+
+        try:
+            object_list = self.apply_filters(bundle.request, applicable_filters)
+            bundle.obj = self.get_single_object(object_list, applicable_filters)
+            self.authorized_read_detail(object_list, bundle)
+            return bundle.obj
+        except ValueError:
+            raise NotFound("Invalid resource lookup data provided (mismatched type).")
+
+    def build_detail_filters(self, kwargs):
+        """
+        Turns the ``kwargs`` of ``obj_get`` into the filters to apply.
+        """
         # Use ignore_bad_filters=True. `obj_get_list` filters based on
         # request.GET, but `obj_get` usually filters based on `detail_uri_name`
         # or data from a related field, so we don't want to raise errors if
@@ -2232,20 +3779,21 @@ class BaseModelResource(Resource):
         if self._meta.detail_uri_name in kwargs:
             applicable_filters[self._meta.detail_uri_name] = kwargs[self._meta.detail_uri_name]
 
-        try:
-            object_list = self.apply_filters(bundle.request, applicable_filters)
-            stringified_kwargs = ', '.join(["%s=%s" % (k, v) for k, v in applicable_filters.items()])
+        return applicable_filters
 
-            if len(object_list) <= 0:
-                raise self._meta.object_class.DoesNotExist("Couldn't find an instance of '%s' which matched '%s'." % (self._meta.object_class.__name__, stringified_kwargs))
-            elif len(object_list) > 1:
-                raise MultipleObjectsReturned("More than one '%s' matched '%s'." % (self._meta.object_class.__name__, stringified_kwargs))
+    def get_single_object(self, objects, applicable_filters):
+        """
+        Returns the only object in ``objects``, raising ``DoesNotExist`` or
+        ``MultipleObjectsReturned`` if there isn't exactly one.
+        """
+        stringified_kwargs = ', '.join(["%s=%s" % (k, v) for k, v in applicable_filters.items()])
 
-            bundle.obj = object_list[0]
-            self.authorized_read_detail(object_list, bundle)
-            return bundle.obj
-        except ValueError:
-            raise NotFound("Invalid resource lookup data provided (mismatched type).")
+        if len(objects) <= 0:
+            raise self._meta.object_class.DoesNotExist("Couldn't find an instance of '%s' which matched '%s'." % (self._meta.object_class.__name__, stringified_kwargs))
+        elif len(objects) > 1:
+            raise MultipleObjectsReturned("More than one '%s' matched '%s'." % (self._meta.object_class.__name__, stringified_kwargs))
+
+        return objects[0]
 
     def obj_create(self, bundle, **kwargs):
         """
@@ -2365,6 +3913,35 @@ class BaseModelResource(Resource):
         self.authorized_delete_detail(self.get_object_list(bundle.request), bundle)
         bundle.obj.delete()
 
+    def preauthorize_batch(self, action, bundles):
+        """
+        A ORM-specific implementation of ``preauthorize_batch``.
+
+        Only used when the ``authorization`` class provides its own
+        ``batch_detail``, as the default one is no cheaper than the
+        per-object checks. Nor is it used if a subclass of that class
+        overrides the per-object check (i.e. ``update_detail``), which
+        ``batch_detail`` wouldn't know about.
+        """
+        authorization = self._meta.authorization
+        batch_detail = getattr(type(authorization), 'batch_detail', None)
+
+        if not bundles or batch_detail in (None, Authorization.batch_detail):
+            return bundles
+
+        # The class ``batch_detail`` comes from.
+        batch_class = next(klass for klass in type(authorization).__mro__ if 'batch_detail' in vars(klass))
+
+        if is_overridden(authorization, '%s_detail' % action, batch_class):
+            return bundles
+
+        self.authorized_batch(action, self.get_object_list(bundles[0].request), bundles)
+
+        for bundle in bundles:
+            bundle.preauthorized = bundle.preauthorized | frozenset([(action, bundle.obj.pk)])
+
+        return bundles
+
     @atomic_decorator()
     def patch_list(self, request, **kwargs):
         """
@@ -2559,22 +4136,30 @@ class BaseModelResource(Resource):
                 # Clear it out, just to be safe.
                 related_mngr.clear()
 
-            related_objs = []
-
-            for related_bundle in bundle.data[field_name]:
-                related_resource = field_object.get_related_resource(bundle.obj)
-
-                # Only build & save if there's data, not just a URI.
-                updated_related_bundle = related_resource.build_bundle(
+            related_resource = field_object.get_related_resource(bundle.obj)
+            related_bundles = [
+                related_resource.build_bundle(
                     obj=related_bundle.obj,
                     data=related_bundle.data,
                     request=bundle.request,
                     objects_saved=bundle.objects_saved,
                     via_uri=related_bundle.via_uri,
                 )
+                for related_bundle in bundle.data[field_name]
+            ]
+
+            # Authorize updating the existing related objects as a batch,
+            # rather than one by one as each gets saved. (Only those with
+            # data get saved, not just a URI.)
+            related_resource.preauthorize_batch('update', [
+                related_bundle for related_bundle in related_bundles
+                if not related_bundle.via_uri and related_bundle.obj.pk
+            ])
+            related_objs = []
 
-                related_resource.save(updated_related_bundle)
-                related_objs.append(updated_related_bundle.obj)
+            for related_bundle in related_bundles:
+                related_resource.save(related_bundle)
+                related_objs.append(related_bundle.obj)
 
             related_mngr.add(*related_objs)
 
@@ -2592,6 +4177,56 @@ class NamespacedModelResource(ModelResource):
         return reverse(namespaced, args=args, kwargs=kwargs)
 
 
+class AsyncModelResource(AsyncResource, ModelResource):
+    """
+    A ``ModelResource`` served by async views (see ``AsyncResource``), which
+    reads objects with Django's async ORM.
+    """
+    def overrides_filter_hooks(self):
+        """
+        Returns whether any of the sync hooks ``aobj_get_list`` & ``aobj_get``
+        call inline is overridden, in which case it may query & they run in
+        a thread instead.
+        """
+        return any(
+            is_overridden(self, name, BaseModelResource)
+            for name in ('build_filters', 'apply_filters', 'get_object_list')
+        )
+
+    async def aobj_get_list(self, bundle, **kwargs):
+        """
+        The async counterpart of ``obj_get_list``.
+        """
+        if self.overrides_filter_hooks():
+            return await sync_to_async(self.obj_get_list)(bundle, **kwargs)
+
+        objects = self.filter_object_list(bundle, **kwargs)
+
+        try:
+            return await self.aauthorized_read_list(objects, bundle)
+        except ValueError:
+            raise BadRequest("Invalid resource lookup data provided (mismatched type).")
+
+    async def aobj_get(self, bundle, **kwargs):
+        """
+        The async counterpart of ``obj_get``.
+        """
+        if self.overrides_filter_hooks():
+            return await sync_to_async(self.obj_get)(bundle, **kwargs)
+
+        applicable_filters = self.build_detail_filters(kwargs)
+
+        try:
+            object_list = self.apply_filters(bundle.request, applicable_filters)
+            # Two are enough to tell if there's more than one.
+            objects = [obj async for obj in object_list[:2]]
+            bundle.obj = self.get_single_object(objects, applicable_filters)
+            await self.aauthorized_read_detail(object_list, bundle)
+            return bundle.obj
+        except ValueError:
+            raise NotFound("Invalid resource lookup data provided (mismatched type).")
+
+
 # Based off of ``piston.utils.coerce_put_post``. Similarly BSD-licensed.
 # And no, the irony is not lost on me.
 def convert_post_to_VERB(request, verb):
@@ -2,6 +2,7 @@ import datetime
 import json
 import re
 import io
+import warnings
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -14,41 +15,43 @@ from tastypie.exceptions import BadRequest, UnsupportedSerializationFormat, \
     UnsupportedDeserializationFormat
 from tastypie.utils import format_datetime, format_date, format_time, \
     make_naive
+from tastypie.utils.imports import LazyImports, optional_import
+
+
+def _import_xml():
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            import defusedxml.lxml as lxml
+            from defusedxml.common import DefusedXmlException
+            from defusedxml.lxml import parse as parse_xml
+            from lxml.etree import Element, tostring, LxmlError
+    except ImportError:
+        return dict.fromkeys(['lxml', 'DefusedXmlException', 'parse_xml', 'Element', 'tostring', 'LxmlError'])
+
+    return {
+        'lxml': lxml,
+        'DefusedXmlException': DefusedXmlException,
+        'parse_xml': parse_xml,
+        'Element': Element,
+        'tostring': tostring,
+        'LxmlError': LxmlError,
+    }
 
 
-import warnings
-try:
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", DeprecationWarning)
-        import defusedxml.lxml as lxml
-        from defusedxml.common import DefusedXmlException
-        from defusedxml.lxml import parse as parse_xml
-        from lxml.etree import Element, tostring, LxmlError
-except ImportError:
-    lxml = None
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
-
-try:
-    import biplist
-except ImportError:
-    biplist = None
-
-
-XML_ENCODING = re.compile(r'<\?xml.*?\?>', re.IGNORECASE)
+def _import_yaml():
+    yaml = optional_import('yaml')
 
+    if yaml is None:
+        return {'yaml': None, 'TastypieLoader': None}
 
-# Ugh & blah.
-# So doing a regular dump is generally fine, since Tastypie doesn't usually
-# serialize advanced types. *HOWEVER*, it will dump out Python Unicode strings
-# as a custom YAML tag, which of course ``yaml.safe_load`` can't handle.
-if yaml is not None:
     from yaml.constructor import SafeConstructor
     from yaml.loader import Reader, Scanner, Parser, Composer, Resolver
 
+    # Ugh & blah.
+    # So doing a regular dump is generally fine, since Tastypie doesn't usually
+    # serialize advanced types. *HOWEVER*, it will dump out Python Unicode strings
+    # as a custom YAML tag, which of course ``yaml.safe_load`` can't handle.
     class TastypieConstructor(SafeConstructor):
         def construct_yaml_unicode_dammit(self, node):
             value = self.construct_scalar(node)
@@ -72,14 +75,38 @@ if yaml is not None:
             TastypieConstructor.__init__(self)
             Resolver.__init__(self)
 
+    return {'yaml': yaml, 'TastypieLoader': TastypieLoader}
+
+
+def _import_biplist():
+    return {'biplist': optional_import('biplist')}
+
+
+# The optional dependencies are only imported when a format first needs them.
+_imports = LazyImports(globals(), {
+    'lxml': _import_xml,
+    'DefusedXmlException': _import_xml,
+    'parse_xml': _import_xml,
+    'Element': _import_xml,
+    'tostring': _import_xml,
+    'LxmlError': _import_xml,
+    'yaml': _import_yaml,
+    'TastypieLoader': _import_yaml,
+    'biplist': _import_biplist,
+})
+__getattr__ = _imports.get
+
+
+XML_ENCODING = re.compile(r'<\?xml.*?\?>', re.IGNORECASE)
+
 
 def _get_default_formats():
     formats = ['json']
-    if lxml:
+    if _imports.is_available('lxml', 'lxml', 'defusedxml'):
         formats.append('xml')
-    if yaml:
+    if _imports.is_available('yaml', 'yaml'):
         formats.append('yaml')
-    if biplist:
+    if _imports.is_available('biplist', 'biplist'):
         formats.append('plist')
     return formats
 
@@ -135,6 +162,9 @@ class Serializer(object):
         'plist': 'application/x-plist'
     }
 
+    # The formats whose serialization starts with ``to_simple``.
+    simple_formats = ('json', 'jsonp', 'yaml', 'plist')
+
     def __init__(self, formats=None, content_types=None, datetime_formatting=None):
         if datetime_formatting is not None:
             self.datetime_formatting = datetime_formatting
@@ -247,6 +277,14 @@ class Serializer(object):
 
         return data.isoformat()
 
+    def simplifies(self, format):
+        """
+        Returns whether serializing to ``format`` (a content type) starts by
+        turning the data into simple types with ``to_simple``, which can
+        then be done ahead of time, a piece at a time.
+        """
+        return any(self.content_types.get(short_format) == format for short_format in self.simple_formats)
+
     def serialize(self, bundle, format='application/json', options=None):
         """
         Given some data and a format, calls the correct method to serialize
@@ -329,6 +367,8 @@ class Serializer(object):
         Given some data, converts that data to an ``etree.Element`` suitable
         for use in the XML output.
         """
+        Element = _imports.get('Element')
+
         if isinstance(data, (list, tuple)):
             element = Element(name or 'objects')
             if name:
@@ -451,11 +491,11 @@ class Serializer(object):
         """
         options = options or {}
 
-        if lxml is None:
+        if _imports.get('lxml') is None:
             raise ImproperlyConfigured(
                 "Usage of the XML aspects requires lxml and defusedxml.")
 
-        return tostring(self.to_etree(data, options), xml_declaration=True,
+        return _imports.get('tostring')(self.to_etree(data, options), xml_declaration=True,
             encoding='utf-8')
 
     def from_xml(self, content, forbid_dtd=True, forbid_entities=True):
@@ -466,7 +506,7 @@ class Serializer(object):
         exception content but subclasses may choose to override this if
         necessary.
         """
-        if lxml is None:
+        if _imports.get('lxml') is None:
             raise ImproperlyConfigured(
                 "Usage of the XML aspects requires lxml and defusedxml.")
 
@@ -474,12 +514,12 @@ class Serializer(object):
             # Stripping the encoding declaration. Because lxml.
             # See http://lxml.de/parsing.html, "Python unicode strings".
             content = XML_ENCODING.sub('', content)
-            parsed = parse_xml(
+            parsed = _imports.get('parse_xml')(
                 io.StringIO(content),
                 forbid_dtd=forbid_dtd,
                 forbid_entities=forbid_entities
             )
-        except (LxmlError, DefusedXmlException):
+        except (_imports.get('LxmlError'), _imports.get('DefusedXmlException')):
             raise BadRequest()
 
         return self.from_etree(parsed.getroot())
@@ -489,6 +529,7 @@ class Serializer(object):
         Given some Python data, produces YAML output.
         """
         options = options or {}
+        yaml = _imports.get('yaml')
 
         if yaml is None:
             raise ImproperlyConfigured(
@@ -500,17 +541,20 @@ class Serializer(object):
         """
         Given some YAML data, returns a Python dictionary of the decoded data.
         """
+        yaml = _imports.get('yaml')
+
         if yaml is None:
             raise ImproperlyConfigured(
                 "Usage of the YAML aspects requires yaml.")
 
-        return yaml.load(content, Loader=TastypieLoader)
+        return yaml.load(content, Loader=_imports.get('TastypieLoader'))
 
     def to_plist(self, data, options=None):
         """
         Given some Python data, produces binary plist output.
         """
         options = options or {}
+        biplist = _imports.get('biplist')
 
         if biplist is None:
             raise ImproperlyConfigured(
@@ -523,6 +567,8 @@ class Serializer(object):
         Given some binary plist data, returns a Python dictionary of the
         decoded data.
         """
+        biplist = _imports.get('biplist')
+
         if biplist is None:
             raise ImproperlyConfigured(
                 "Usage of the plist aspects requires biplist.")
@@ -1,12 +1,81 @@
+from collections import Counter
+import sys
 import time
 
 from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 
 from tastypie.compat import force_str
+from tastypie.fields import ApiField
+from tastypie.resources import Resource
 from tastypie.serializers import Serializer
 
 
+def get_query_source(frame):
+    """
+    Walks up the stack from ``frame``, looking for the innermost resource
+    field or ``dehydrate``/``dehydrate_*`` hook that's running.
+
+    Returns a label like ``NoteResource.author (ToOneField)`` or
+    ``NoteResource.dehydrate_title``, or ``None`` if there isn't one.
+    """
+    while frame is not None:
+        obj = frame.f_locals.get('self')
+
+        if isinstance(obj, ApiField):
+            resource = getattr(obj, '_resource', None)
+            resource_name = resource.__name__ if resource is not None else '?'
+            return '%s.%s (%s)' % (resource_name, obj.instance_name, type(obj).__name__)
+
+        name = frame.f_code.co_name
+
+        if isinstance(obj, Resource) and (name == 'dehydrate' or name.startswith('dehydrate_')):
+            return '%s.%s' % (type(obj).__name__, name)
+
+        frame = frame.f_back
+
+    return None
+
+
+class QueryRecorder(object):
+    """
+    Captures the queries run on a database connection, along with the
+    resource field or hook that ran each of them (see ``get_query_source``).
+
+    Use it as a context manager. Afterwards, ``queries`` holds a list of
+    ``(sql, source)`` tuples.
+    """
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        self.queries = []
+        self._sources = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self._sources.append(get_query_source(sys._getframe(1)))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._capture = CaptureQueriesContext(self.connection)
+        self._capture.__enter__()
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        self._capture.__exit__(exc_type, exc_value, traceback)
+
+        if exc_type is None:
+            # Grab them now, as the next request resets the query log.
+            sql = [query['sql'] for query in self._capture.captured_queries]
+            self.queries = list(zip(sql, self._sources))
+
+    def __len__(self):
+        return len(self.queries)
+
+
 class TestApiClient(object):
     def __init__(self, serializer=None):
         """
@@ -543,6 +612,73 @@ class ResourceTestCaseMixin(object):
         """
         return self.serializer.serialize(data, format=format)
 
+    def record_queries(self, request, populate, sizes=(2, 4), using=DEFAULT_DB_ALIAS):
+        """
+        Records the queries a request runs against different amounts of data.
+
+        For each of ``sizes``, calls ``populate(size)`` (which should set up
+        that many rows for the request to return) & then ``request()`` (which
+        should make the request, usually with ``self.api_client``).
+
+        Returns a list of ``QueryRecorder``, one per size.
+        """
+        recorders = []
+
+        for index, size in enumerate(sizes):
+            populate(size)
+
+            if index == 0:
+                # Warm up any caches, so they don't show up as extra queries.
+                request()
+
+            with QueryRecorder(using=using) as recorder:
+                request()
+
+            recorders.append(recorder)
+
+        return recorders
+
+    def assertNoNPlusOneQueries(self, request, populate, sizes=(2, 4), using=DEFAULT_DB_ALIAS):
+        """
+        Ensures the number of queries a request runs doesn't grow with the
+        number of rows it returns, which usually means a ``full=True``
+        relation (or a ``dehydrate_*`` method) runs a query per object.
+
+        Takes the same arguments as ``record_queries``. Usage::
+
+            def populate(size):
+                Note.objects.all().delete()
+
+                for i in range(size):
+                    user = User.objects.create_user('user%s' % i)
+                    Note.objects.create(author=user, title='Note %s' % i)
+
+            self.assertNoNPlusOneQueries(lambda: self.api_client.get('/api/v1/notes/'), populate)
+
+        The failure message names the fields & hooks that ran the extra
+        queries.
+        """
+        recorders = self.record_queries(request, populate, sizes=sizes, using=using)
+        first, last = recorders[0], recorders[-1]
+
+        if len(last) <= len(first):
+            return
+
+        first_counts = Counter(source for sql, source in first.queries)
+        last_counts = Counter(source for sql, source in last.queries)
+        lines = [
+            "The number of queries grew with the number of rows: %s queries for %s rows, %s for %s rows." % (len(first), sizes[0], len(last), sizes[-1]),
+        ]
+
+        for source, count in last_counts.items():
+            if count <= first_counts[source]:
+                continue
+
+            example = [sql for sql, query_source in last.queries if query_source == source][0]
+            lines.append("  %s: %s queries, then %s, like: %s" % (source or "Outside of any field or dehydrate hook", first_counts[source], count, example))
+
+        self.fail('\n'.join(lines))
+
     def assertKeys(self, data, expected):
         """
         This method ensures that the keys of the ``data`` match up to the keys
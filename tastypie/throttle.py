@@ -1,7 +1,10 @@
 import time
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 
+from tastypie.utils.asynchronous import is_overridden
+
 
 _other_allowed_chars = frozenset(['_', '.', '-'])
 
@@ -68,6 +71,31 @@ class BaseThrottle(object):
         """
         pass
 
+    async def ashould_be_throttled(self, identifier, **kwargs):
+        """
+        The async counterpart of ``should_be_throttled``, used by
+        ``AsyncResource``.
+
+        Runs ``should_be_throttled`` in a thread if a subclass overrides it
+        (as it may block) & calls it directly otherwise.
+        """
+        if is_overridden(self, 'should_be_throttled', BaseThrottle):
+            return await sync_to_async(self.should_be_throttled)(identifier, **kwargs)
+
+        return self.should_be_throttled(identifier, **kwargs)
+
+    async def aaccessed(self, identifier, **kwargs):
+        """
+        The async counterpart of ``accessed``, used by ``AsyncResource``.
+
+        Runs ``accessed`` in a thread if a subclass overrides it & calls it
+        directly otherwise.
+        """
+        if is_overridden(self, 'accessed', BaseThrottle):
+            return await sync_to_async(self.accessed)(identifier, **kwargs)
+
+        return self.accessed(identifier, **kwargs)
+
 
 class CacheThrottle(BaseThrottle):
     """
@@ -87,19 +115,42 @@ class CacheThrottle(BaseThrottle):
         the user should be throttled.
         """
         key = self.convert_identifier_to_key(identifier)
+        now = int(time.time())
+        times_accessed = self.prune_accesses(cache.get(key, []), now)
+        cache.set(key, times_accessed, self.expiration)
+        return self.check_accesses(times_accessed, now)
+
+    async def ashould_be_throttled(self, identifier, **kwargs):
+        """
+        The async counterpart of ``should_be_throttled``, using the async
+        cache API.
+        """
+        if is_overridden(self, 'should_be_throttled', CacheThrottle):
+            return await sync_to_async(self.should_be_throttled)(identifier, **kwargs)
 
-        # Weed out anything older than the timeframe.
+        key = self.convert_identifier_to_key(identifier)
         now = int(time.time())
-        timeframe = int(self.timeframe)
-        throttle_at = int(self.throttle_at)
+        times_accessed = self.prune_accesses(await cache.aget(key, []), now)
+        await cache.aset(key, times_accessed, self.expiration)
+        return self.check_accesses(times_accessed, now)
 
-        minimum_time = now - timeframe
-        times_accessed = [access for access in cache.get(key, []) if access >= minimum_time]
-        cache.set(key, times_accessed, self.expiration)
+    def prune_accesses(self, times_accessed, now):
+        """
+        Weeds out the accesses older than the timeframe.
+        """
+        minimum_time = now - int(self.timeframe)
+        return [access for access in times_accessed if access >= minimum_time]
+
+    def check_accesses(self, times_accessed, now):
+        """
+        Returns the number of seconds to wait if there have been too many
+        accesses, ``False`` otherwise.
+        """
+        throttle_at = int(self.throttle_at)
 
         if len(times_accessed) >= throttle_at:
             # Throttle them.
-            return timeframe - (now - times_accessed[-throttle_at])
+            return int(self.timeframe) - (now - times_accessed[-throttle_at])
 
         # Let them through.
         return False
@@ -115,6 +166,18 @@ class CacheThrottle(BaseThrottle):
         times_accessed.append(int(time.time()))
         cache.set(key, times_accessed, self.expiration)
 
+    async def aaccessed(self, identifier, **kwargs):
+        """
+        The async counterpart of ``accessed``, using the async cache API.
+        """
+        if is_overridden(self, 'accessed', CacheThrottle):
+            return await sync_to_async(self.accessed)(identifier, **kwargs)
+
+        key = self.convert_identifier_to_key(identifier)
+        times_accessed = await cache.aget(key, [])
+        times_accessed.append(int(time.time()))
+        await cache.aset(key, times_accessed, self.expiration)
+
 
 class CacheDBThrottle(CacheThrottle):
     """
@@ -141,3 +204,19 @@ class CacheDBThrottle(CacheThrottle):
             url=kwargs.get('url', ''),
             request_method=kwargs.get('request_method', '')
         )
+
+    async def aaccessed(self, identifier, **kwargs):
+        """
+        The async counterpart of ``accessed``, using the async cache API &
+        ORM.
+        """
+        if is_overridden(self, 'accessed', CacheDBThrottle):
+            return await sync_to_async(self.accessed)(identifier, **kwargs)
+
+        from tastypie.models import ApiAccess
+        await super(CacheDBThrottle, self).aaccessed(identifier, **kwargs)
+        await ApiAccess.objects.acreate(
+            identifier=identifier,
+            url=kwargs.get('url', ''),
+            request_method=kwargs.get('request_method', '')
+        )
@@ -0,0 +1,283 @@
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+import threading
+from time import perf_counter
+
+from django.db import connections
+from django.dispatch import Signal
+
+
+# The phases of a request ``Resource`` times, in the order they happen.
+PHASES = ('authenticate', 'throttle', 'query', 'dehydrate', 'serialize', 'render')
+
+# Sent once a timed request has been handled, with the ``resource``, the
+# ``request`` & its ``timer`` (a ``RequestTimer``).
+request_timed = Signal()
+
+# The dehydration profilers active in the current context, innermost last.
+# (A context var, so they carry over into async views & back.)
+_profilers = ContextVar('tastypie_dehydration_profilers', default=())
+
+# The queries run in the current thread while profiling (& whether they're
+# being counted).
+_local = threading.local()
+
+
+def get_dehydration_profiler():
+    """
+    Returns the ``DehydrationProfiler`` active in the current context, or
+    ``None``.
+    """
+    profilers = _profilers.get()
+
+    if profilers:
+        return profilers[-1][0]
+
+    return None
+
+
+class RequestTimer(object):
+    """
+    Records how long each phase of a request takes & how many queries it
+    runs.
+
+    Used as a context manager around the whole request, it counts the
+    queries run on every database connection meanwhile. Phases are timed with
+    ``phase``; timing the same phase more than once adds up.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.queries = 0
+        self.duration = None
+        self._start = None
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self.count_query))
+
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = perf_counter() - self._start
+        self._stack.close()
+        self._stack = None
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + perf_counter() - start
+
+    def server_timing(self):
+        """
+        Returns the timings as a ``Server-Timing`` header value (in
+        milliseconds), like::
+
+            authenticate;dur=0.12, query;dur=3.40, total;dur=5.02, queries;desc="2"
+        """
+        metrics = []
+
+        for name in PHASES:
+            if name in self.phases:
+                metrics.append('%s;dur=%.2f' % (name, self.phases[name] * 1000))
+
+        if self.duration is not None:
+            metrics.append('total;dur=%.2f' % (self.duration * 1000))
+
+        metrics.append('queries;desc="%s"' % self.queries)
+        return ', '.join(metrics)
+
+
+class BaseMetricsSink(object):
+    """
+    A simplified, swappable base class for collecting request timings.
+
+    Discards them.
+    """
+    def record(self, resource, request, timer):
+        """
+        Receives the ``RequestTimer`` of a request ``resource`` handled.
+        """
+        pass
+
+
+class InMemoryMetricsSink(BaseMetricsSink):
+    """
+    Adds up request timings in memory, per resource & HTTP method.
+
+    Handy in tests & benchmarks. ``get_stats`` returns them, keyed like
+    ``notes GET``.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def get_key(self, resource, request):
+        return '%s %s' % (resource._meta.resource_name, request.method)
+
+    def record(self, resource, request, timer):
+        key = self.get_key(resource, request)
+
+        with self._lock:
+            stats = self.stats.setdefault(key, {
+                'requests': 0,
+                'queries': 0,
+                'time': 0.0,
+                'phases': {},
+            })
+            stats['requests'] += 1
+            stats['queries'] += timer.queries
+            stats['time'] += timer.duration
+
+            for name, duration in timer.phases.items():
+                stats['phases'][name] = stats['phases'].get(name, 0.0) + duration
+
+    def get_stats(self):
+        """
+        Returns a dictionary of the number of requests, queries, total time
+        & total time per phase (in seconds) for each key.
+        """
+        with self._lock:
+            return {
+                key: dict(stats, phases=dict(stats['phases']))
+                for key, stats in self.stats.items()
+            }
+
+    def reset(self):
+        self.stats = {}
+
+
+class DehydrationProfiler(object):
+    """
+    Adds up the time & queries ``full_dehydrate`` spends on each field &
+    hook of each resource.
+
+    Used as a context manager, it profiles the dehydration in the current
+    context (including the async views it runs & the threads they hand off
+    to), so it can be entered around any number of requests (in a test, a
+    middleware, etc.) to add them up. Times & queries are cumulative, so a
+    ``full=True`` field includes the related resource's own fields.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __enter__(self):
+        profilers = _profilers.get()
+        stack = ExitStack()
+
+        # Only the outermost profiler counts queries, so they're counted once.
+        if not profilers:
+            stack.enter_context(self.count_queries())
+
+        stack.callback(_profilers.reset, _profilers.set(profilers + ((self, stack),)))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        profiler, stack = _profilers.get()[-1]
+        stack.close()
+
+    @contextmanager
+    def count_queries(self):
+        """
+        Counts the queries run on the current thread's connections, unless
+        they're counted already.
+
+        Django's connections are per thread, so this is also entered by
+        ``measure`` when dehydrating in another thread (like the one an async
+        view hands ``full_dehydrate`` off to).
+        """
+        if getattr(_local, 'counting', False):
+            yield
+            return
+
+        _local.counting = True
+        _local.queries = getattr(_local, 'queries', 0)
+
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(self.count_query))
+
+                yield
+        finally:
+            _local.counting = False
+
+    def count_query(self, execute, sql, params, many, context):
+        _local.queries += 1
+        return execute(sql, params, many, context)
+
+    def measure(self, resource, field_name, hook, func, *args, **kwargs):
+        """
+        Calls ``func``, recording its time & queries against the ``resource``,
+        ``field_name`` & ``hook``.
+        """
+        with self.count_queries():
+            queries = _local.queries
+            start = perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = perf_counter() - start
+                key = (type(resource).__name__, field_name, hook)
+
+                with self._lock:
+                    stats = self.stats.setdefault(key, [0, 0.0, 0])
+                    stats[0] += 1
+                    stats[1] += duration
+                    stats[2] += _local.queries - queries
+
+    def get_stats(self):
+        """
+        Returns a list of dictionaries (with the ``resource``, ``field``,
+        ``hook``, number of ``calls``, total ``time`` & ``queries``), the
+        slowest first.
+        """
+        with self._lock:
+            stats = [
+                {
+                    'resource': resource,
+                    'field': field_name,
+                    'hook': hook,
+                    'calls': calls,
+                    'time': duration,
+                    'queries': queries,
+                }
+                for (resource, field_name, hook), (calls, duration, queries) in self.stats.items()
+            ]
+
+        return sorted(stats, key=lambda stat: stat['time'], reverse=True)
+
+    def format_table(self, limit=None):
+        """
+        Formats the stats as a table, the slowest first.
+        """
+        lines = ['%-24s %-20s %-24s %8s %10s %10s %8s' % ('resource', 'field', 'hook', 'calls', 'total ms', 'ms/call', 'queries')]
+
+        for stat in self.get_stats()[:limit]:
+            lines.append('%-24s %-20s %-24s %8d %10.2f %10.3f %8d' % (
+                stat['resource'],
+                stat['field'] or '-',
+                stat['hook'],
+                stat['calls'],
+                stat['time'] * 1000,
+                stat['time'] * 1000 / stat['calls'],
+                stat['queries'],
+            ))
+
+        return '\n'.join(lines)
+
+    def reset(self):
+        self.stats = {}
@@ -0,0 +1,13 @@
+def is_overridden(obj, name, *base_classes):
+    """
+    Returns whether the ``name`` method of ``obj`` (an instance or a
+    class) is a different implementation from the one on each of
+    ``base_classes``.
+
+    The async counterparts of hooks use this to run a (possibly blocking)
+    overridden sync hook in a thread, rather than assuming the default
+    implementation.
+    """
+    klass = obj if isinstance(obj, type) else type(obj)
+    implementation = getattr(klass, name)
+    return all(implementation is not getattr(base_class, name) for base_class in base_classes)
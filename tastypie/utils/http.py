@@ -0,0 +1,37 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(content):
+    """
+    Builds a strong ``ETag`` value for the given serialized content.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    return '"%s"' % hashlib.sha1(content).hexdigest()
+
+
+def conditional_response(request, content, content_type, etag):
+    """
+    Returns a response for the content, carrying the ``ETag``. If the
+    request's ``If-None-Match`` matches, a ``304 Not Modified`` is returned
+    instead.
+    """
+    response = HttpResponse(content=content, content_type=content_type)
+    response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def make_conditional(request, response):
+    """
+    Adds an ``ETag`` (of its content) to the response, unless it has one.
+    If the request's ``If-None-Match`` matches, a ``304 Not Modified`` is
+    returned instead.
+    """
+    if not response.has_header('ETag'):
+        response['ETag'] = make_etag(response.content)
+
+    return get_conditional_response(request, etag=response['ETag'], response=response)
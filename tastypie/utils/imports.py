@@ -0,0 +1,52 @@
+from importlib import import_module
+from importlib.util import find_spec
+
+
+def optional_import(name):
+    """
+    Imports & returns the module ``name``, or ``None`` if it isn't installed.
+    """
+    try:
+        return import_module(name)
+    except ImportError:
+        return None
+
+
+class LazyImports(object):
+    """
+    Imports a module's optional dependencies the first time they're used,
+    rather than when the module itself is imported, as some are slow to
+    import.
+
+    ``loaders`` maps each name to a function returning a dictionary of the
+    names it imports (``None`` for each if the dependency isn't installed),
+    which get added to the module's ``namespace``. Use ``get`` as the
+    module's ``__getattr__``, so the names still work as module attributes
+    (and can be patched in tests).
+    """
+    def __init__(self, namespace, loaders):
+        self.namespace = namespace
+        self.loaders = loaders
+
+    def get(self, name):
+        try:
+            return self.namespace[name]
+        except KeyError:
+            pass
+
+        if name not in self.loaders:
+            raise AttributeError("module %r has no attribute %r" % (self.namespace['__name__'], name))
+
+        self.namespace.update(self.loaders[name]())
+        return self.namespace[name]
+
+    def is_available(self, name, *modules):
+        """
+        Returns whether the dependency ``name`` (made of the top-level
+        ``modules``) is installed, without importing it if it hasn't been
+        already.
+        """
+        if name in self.namespace:
+            return bool(self.namespace[name])
+
+        return all(find_spec(module) is not None for module in modules)
@@ -0,0 +1,214 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+from django.db import connection
+
+
+def measure(func, repeat=5):
+    """
+    Runs ``func`` & measures a single call.
+
+    Returns a dictionary of the number of queries it runs, its best wall time
+    (in seconds) over ``repeat`` runs, the best time ``calibrate`` takes
+    between those runs & the peak memory (in bytes) it allocates.
+    """
+    # The test client's ``request_started`` signal resets the query log on
+    # the next request, so count the queries as they're run instead.
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        func()
+
+    # Calibrate before every run rather than once up front, so a burst of
+    # load on the machine slows both down alike.
+    calibrations = []
+    timings = []
+
+    for i in range(repeat):
+        calibrations.append(calibrate(1))
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    calibration = min(calibrations)
+
+    tracemalloc.start()
+
+    try:
+        func()
+        memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'queries': len(queries),
+        'time': round(min(timings), 6),
+        'calibration': calibration,
+        'memory': memory,
+    }
+
+
+# Imports a module in a fresh interpreter once Django is set up, then prints
+# the peak memory allocated meanwhile (unless timing the import, which tracing
+# would slow down) & every module that got imported.
+IMPORT_SCRIPT = """
+import sys, tracemalloc, django
+django.setup()
+before = set(sys.modules)
+if 'importtime' not in sys._xoptions:
+    tracemalloc.start()
+import %s
+print(tracemalloc.get_traced_memory()[1])
+print(' '.join(sorted(set(sys.modules) - before)))
+"""
+
+
+def run_import(module, *options):
+    """
+    Imports ``module`` in a new ``python`` process (run with the
+    ``options``), returning its output & error lines.
+    """
+    result = subprocess.run(
+        [sys.executable] + list(options) + ['-c', IMPORT_SCRIPT % module],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    return result.stdout.splitlines(), result.stderr.splitlines()
+
+
+def measure_import(module, repeat=5):
+    """
+    Imports ``module`` in fresh interpreters, timing it with
+    ``python -X importtime``.
+
+    Returns a dictionary like ``measure`` does (with the best cumulative
+    import time over ``repeat`` runs, the peak memory it allocates & no
+    queries) & the names of the modules it imported.
+    """
+    calibration = calibrate(repeat)
+    timings = []
+
+    for i in range(repeat):
+        output, importtime = run_import(module, '-X', 'importtime')
+
+        for line in importtime:
+            bits = [bit.strip() for bit in line.split('|')]
+
+            if len(bits) == 3 and bits[2] == module:
+                timings.append(int(bits[1]) / 1000000.0)
+
+    output, errors = run_import(module)
+    result = {
+        'queries': 0,
+        'time': round(min(timings), 6),
+        'calibration': calibration,
+        'memory': int(output[0]),
+    }
+    return result, output[1].split()
+
+
+# A fixed amount of pure-Python work (building, serializing & parsing a list
+# of dictionaries), roughly like what a request spends its time on.
+CALIBRATION_DATA = [{'id': i, 'title': 'Note #%s' % i, 'tags': list(range(5))} for i in range(2000)]
+
+
+def calibrate(repeat=5):
+    """
+    Returns the best time (in seconds) this machine currently takes for a
+    fixed workload, which benchmark times are stored relative to, so
+    baselines recorded on one machine still apply on another.
+    """
+    def work():
+        return json.loads(json.dumps([dict(item) for item in CALIBRATION_DATA]))
+
+    return min(timeit.repeat(work, number=5, repeat=repeat)) / 5
+
+
+class Baselines(object):
+    """
+    Results of earlier benchmark runs, stored as JSON like::
+
+        {"get_list_flat": {"10": {"queries": 2, "time": 0.35, "memory": 81234}}}
+
+    where ``time`` is relative to the result's ``calibration`` (i.e. ``0.35``
+    took 35% as long as the calibration workload on the same machine).
+    """
+    def __init__(self, path, time_tolerance=2.0, memory_tolerance=1.5):
+        self.path = path
+        self.time_tolerance = time_tolerance
+        self.memory_tolerance = memory_tolerance
+        self.data = {}
+
+        if os.path.exists(path):
+            with open(path) as baselines_file:
+                self.data = json.load(baselines_file)
+
+    def get(self, name, size):
+        return self.data.get(name, {}).get(str(size))
+
+    def relative_time(self, result):
+        return round(result['time'] / result['calibration'], 4)
+
+    def record(self, name, size, result):
+        self.data.setdefault(name, {})[str(size)] = {
+            'queries': result['queries'],
+            'time': self.relative_time(result),
+            'memory': result['memory'],
+        }
+
+    def compare(self, name, size, result):
+        """
+        Returns a list of the ways ``result`` differs from the baseline.
+
+        The number of queries has to match exactly (fewer queries means the
+        baseline needs updating). Memory & (relative) time may grow by as
+        much as the tolerances allow.
+        """
+        baseline = self.get(name, size)
+
+        if baseline is None:
+            return []
+
+        regressions = []
+
+        if result['queries'] != baseline['queries']:
+            regressions.append("%s (%s): %s queries, not %s." % (name, size, result['queries'], baseline['queries']))
+
+        if result['memory'] > baseline['memory'] * self.memory_tolerance:
+            regressions.append("%s (%s): %s bytes peak memory, up from %s." % (name, size, result['memory'], baseline['memory']))
+
+        relative_time = self.relative_time(result)
+
+        if relative_time > baseline['time'] * self.time_tolerance:
+            regressions.append("%s (%s): %.2fx the calibration time, up from %.2fx." % (name, size, relative_time, baseline['time']))
+
+        return regressions
+
+    def save(self):
+        with open(self.path, 'w') as baselines_file:
+            json.dump(self.data, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write('\n')
+
+
+def format_report(results):
+    """
+    Formats ``(name, size, result)`` triples as a table.
+    """
+    lines = ["%-22s %6s %8s %10s %10s %12s" % ('benchmark', 'size', 'queries', 'time (ms)', 'relative', 'memory (KB)')]
+
+    for name, size, result in results:
+        lines.append("%-22s %6s %8s %10.2f %10.4f %12.1f" % (name, size, result['queries'], result['time'] * 1000, result['time'] / result['calibration'], result['memory'] / 1024.0))
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,11 @@
+from django.db import models
+
+from profilingtests.models import Note
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    notes = models.ManyToManyField(Note, related_name='tags')
+
+    def __unicode__(self):
+        return self.name
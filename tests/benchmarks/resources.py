@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+
+from tastypie import fields
+from tastypie.authentication import ApiKeyAuthentication, \
+    BasicAuthentication, DigestAuthentication, SessionAuthentication, \
+    python_digest
+from tastypie.authorization import Authorization
+from tastypie.resources import ModelResource, ALL
+
+from profilingtests.models import Note
+
+from .models import Tag
+
+
+class UserResource(ModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'users'
+        authorization = Authorization()
+
+
+class TagResource(ModelResource):
+    class Meta:
+        queryset = Tag.objects.all()
+        resource_name = 'tags'
+        authorization = Authorization()
+
+
+class FlatNoteResource(ModelResource):
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'flatnotes'
+        authorization = Authorization()
+        excludes = ['author']
+        filtering = {
+            'title': ALL,
+            'slug': ['exact'],
+            'is_active': ['exact'],
+        }
+        ordering = ['title', 'slug', 'created']
+
+
+class NoteResource(FlatNoteResource):
+    author = fields.ToOneField(UserResource, 'author', full=True, null=True)
+
+    class Meta(FlatNoteResource.Meta):
+        resource_name = 'notes'
+        excludes = []
+
+
+class TaggedNoteResource(FlatNoteResource):
+    tags = fields.ToManyField(TagResource, 'tags', full=True, null=True)
+
+    class Meta(FlatNoteResource.Meta):
+        queryset = Note.objects.prefetch_related('tags')
+        resource_name = 'taggednotes'
+
+
+class BasicNoteResource(FlatNoteResource):
+    class Meta(FlatNoteResource.Meta):
+        resource_name = 'basicnotes'
+        authentication = BasicAuthentication()
+
+
+class ApiKeyNoteResource(FlatNoteResource):
+    class Meta(FlatNoteResource.Meta):
+        resource_name = 'apikeynotes'
+        authentication = ApiKeyAuthentication()
+
+
+class SessionNoteResource(FlatNoteResource):
+    class Meta(FlatNoteResource.Meta):
+        resource_name = 'sessionnotes'
+        authentication = SessionAuthentication()
+
+
+# ``DigestAuthentication`` needs the optional ``python_digest``.
+if python_digest is not None:
+    class DigestNoteResource(FlatNoteResource):
+        class Meta(FlatNoteResource.Meta):
+            resource_name = 'digestnotes'
+            authentication = DigestAuthentication()
@@ -0,0 +1,291 @@
+from unittest import skipIf
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from django.test import TestCase
+from django.urls import URLResolver
+from django.urls.conf import include, re_path
+from django.urls.resolvers import RegexPattern
+
+from tastypie import serializers
+from tastypie.api import Api
+from tastypie.authentication import python_digest
+from tastypie.models import ApiKey
+from tastypie.test import ResourceTestCaseMixin
+
+from profilingtests.models import Note
+
+from .harness import Baselines, format_report, measure, measure_import
+from .models import Tag
+from .resources import FlatNoteResource, TaggedNoteResource
+
+
+# The serializer formats & the optional dependency each needs.
+FORMATS = (
+    ('json', None),
+    ('xml', 'lxml'),
+    ('yaml', 'yaml'),
+    ('plist', 'biplist'),
+)
+
+# The optional dependencies importing Tastypie shouldn't import yet.
+LAZY_IMPORTS = ('lxml', 'defusedxml', 'yaml', 'biplist', 'python_digest', 'oauth2', 'oauth_provider')
+
+
+class BenchmarkTestCase(ResourceTestCaseMixin, TestCase):
+    """
+    Times the common API requests against a varying number of notes.
+
+    Each benchmark's queries, wall time (relative to ``calibrate``) & peak
+    memory are compared against (or, with ``BENCHMARK_UPDATE=1``, stored
+    as) the baselines in ``settings.BENCHMARK_BASELINES``. The results are
+    written to ``settings.BENCHMARK_REPORT``.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(BenchmarkTestCase, cls).setUpClass()
+        cls.baselines = Baselines(
+            settings.BENCHMARK_BASELINES,
+            time_tolerance=settings.BENCHMARK_TIME_TOLERANCE,
+            memory_tolerance=settings.BENCHMARK_MEMORY_TOLERANCE
+        )
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        with open(settings.BENCHMARK_REPORT, 'w') as report_file:
+            report_file.write(format_report(sorted(cls.results, key=lambda result: result[:2])))
+
+        if settings.BENCHMARK_UPDATE:
+            cls.baselines.save()
+
+        super(BenchmarkTestCase, cls).tearDownClass()
+
+    def setUp(self):
+        super(BenchmarkTestCase, self).setUp()
+        self.user = User.objects.create_user('johndoe', 'john@example.com', 'pass')
+        self.tags = Tag.objects.bulk_create([Tag(name='tag-%s' % i) for i in range(5)])
+
+    def populate(self, size):
+        """
+        Replaces the notes with ``size`` new ones, each with two tags.
+        """
+        Note.objects.all().delete()
+        Note.objects.bulk_create([
+            Note(author=self.user, title='Note #%s' % i, slug='note-%s' % i, content='Content #%s' % i)
+            for i in range(size)
+        ])
+        notes = list(Note.objects.order_by('pk'))
+        through = Tag.notes.through
+        through.objects.bulk_create([
+            through(note=note, tag=self.tags[(index + offset) % len(self.tags)])
+            for index, note in enumerate(notes)
+            for offset in (0, 1)
+        ])
+        return notes
+
+    def note_data(self, count, prefix='new'):
+        return [
+            {'title': '%s #%s' % (prefix, i), 'slug': '%s-%s' % (prefix, i), 'content': 'Content'}
+            for i in range(count)
+        ]
+
+    def benchmark(self, name, request, status_code=200):
+        """
+        Runs the ``request`` callable for each of ``settings.BENCHMARK_SIZES``
+        (passing it the notes), checking the response (unless
+        ``status_code`` is ``None``) & measuring it.
+        """
+        regressions = []
+
+        for size in settings.BENCHMARK_SIZES:
+            notes = self.populate(size)
+
+            def func():
+                return request(notes)
+
+            # Warms up the caches, so only the steady state is measured.
+            resp = func()
+
+            if status_code is not None:
+                self.assertEqual(resp.status_code, status_code, resp.content)
+
+            result = measure(func, repeat=settings.BENCHMARK_REPEAT)
+            self.results.append((name, size, result))
+
+            if settings.BENCHMARK_UPDATE:
+                self.baselines.record(name, size, result)
+            else:
+                regressions.extend(self.baselines.compare(name, size, result))
+
+        if regressions:
+            self.fail("Benchmark regressed:\n%s" % '\n'.join(regressions))
+
+    def get_list(self, uri, **kwargs):
+        return lambda notes: self.api_client.get(uri, data={'limit': 0}, **kwargs)
+
+    def test_get_list_flat(self):
+        self.benchmark('get_list_flat', self.get_list('/api/v1/flatnotes/'))
+
+    def test_get_list_to_one(self):
+        self.benchmark('get_list_to_one', self.get_list('/api/v1/notes/'))
+
+    def test_get_list_to_many(self):
+        self.benchmark('get_list_to_many', self.get_list('/api/v1/taggednotes/'))
+
+    def test_get_detail(self):
+        self.benchmark('get_detail', lambda notes: self.api_client.get('/api/v1/notes/%s/' % notes[-1].pk))
+
+    def test_get_multiple(self):
+        self.benchmark('get_multiple', lambda notes: self.api_client.get('/api/v1/notes/set/%s/' % ';'.join(str(note.pk) for note in notes)))
+
+    def test_post_list(self):
+        data = self.note_data(1)[0]
+        self.benchmark('post_list', lambda notes: self.api_client.post('/api/v1/flatnotes/', data=data), status_code=201)
+
+    def test_put_list(self):
+        self.benchmark('put_list', lambda notes: self.api_client.put('/api/v1/flatnotes/', data={'objects': self.note_data(len(notes))}), status_code=204)
+
+    def test_put_list_related(self):
+        def put(notes):
+            data = self.note_data(len(notes))
+
+            for note in data:
+                note['author'] = '/api/v1/users/%s/' % self.user.pk
+
+            return self.api_client.put('/api/v1/notes/', data={'objects': data})
+
+        self.benchmark('put_list_related', put, status_code=204)
+
+    def test_patch_list(self):
+        def patch(notes):
+            # Updates every existing note.
+            data = [
+                {'resource_uri': '/api/v1/flatnotes/%s/' % note.pk, 'title': 'Updated #%s' % note.pk}
+                for note in notes
+            ]
+            return self.api_client.patch('/api/v1/flatnotes/', data={'objects': data})
+
+        self.benchmark('patch_list', patch, status_code=202)
+
+    def test_dehydrate_bundles(self):
+        # Keeps every bundle alive, so the peak memory includes all of them.
+        resource = TaggedNoteResource()
+        request = HttpRequest()
+
+        def dehydrate(notes):
+            return [
+                resource.full_dehydrate(resource.build_bundle(obj=note, request=request), for_list=True)
+                for note in Note.objects.prefetch_related('tags')
+            ]
+
+        self.benchmark('dehydrate_bundles', dehydrate, status_code=None)
+
+    def test_serialize(self):
+        for format, dependency in FORMATS:
+            if dependency is not None and getattr(serializers, dependency) is None:
+                continue
+
+            self.benchmark('serialize_%s' % format, self.get_list('/api/v1/flatnotes/', format=format))
+
+    def test_filter_and_sort(self):
+        self.benchmark('filter_and_sort', lambda notes: self.api_client.get('/api/v1/flatnotes/', data={
+            'limit': 0,
+            'title__startswith': 'Note',
+            'is_active': 'true',
+            'order_by': '-title',
+        }))
+
+    def build_resolver(self, count, dispatch_by_name):
+        api = Api(dispatch_by_name=dispatch_by_name)
+
+        for i in range(count):
+            meta = type('Meta', (FlatNoteResource.Meta,), {'resource_name': 'notes%03d' % i})
+            resource_class = type('NoteResource%03d' % i, (FlatNoteResource,), {'Meta': meta})
+            api.register(resource_class(), canonical=False)
+
+        return URLResolver(RegexPattern(r'^/'), [re_path(r'^api/', include(api.urls))])
+
+    def test_resolve(self):
+        # Against as many resources as there are notes in the other benchmarks.
+        times = {}
+
+        for dispatch_by_name, name in ((False, 'resolve_linear'), (True, 'resolve_by_name')):
+            regressions = []
+
+            for count in settings.BENCHMARK_SIZES:
+                resolver = self.build_resolver(count, dispatch_by_name)
+                # The last resource is the worst case for a linear scan.
+                path = '/api/v1/notes%03d/1/' % (count - 1)
+                self.assertEqual(resolver.resolve(path).kwargs['resource_name'], 'notes%03d' % (count - 1))
+
+                def resolve():
+                    for i in range(100):
+                        resolver.resolve(path)
+
+                result = measure(resolve, repeat=settings.BENCHMARK_REPEAT)
+                times[dispatch_by_name, count] = result['time'] / result['calibration']
+                self.results.append((name, count, result))
+
+                if settings.BENCHMARK_UPDATE:
+                    self.baselines.record(name, count, result)
+                else:
+                    regressions.extend(self.baselines.compare(name, count, result))
+
+            if regressions:
+                self.fail("Benchmark regressed:\n%s" % '\n'.join(regressions))
+
+        smallest, largest = min(settings.BENCHMARK_SIZES), max(settings.BENCHMARK_SIZES)
+        # Looking the resource up by name stays roughly flat...
+        self.assertLess(times[True, largest], times[True, smallest] * 3)
+        # ...while the linear scan grows with the number of resources.
+        self.assertLess(times[True, largest] * 5, times[False, largest])
+
+    def test_import(self):
+        result, modules = measure_import('tastypie.resources', repeat=settings.BENCHMARK_REPEAT)
+        self.assertEqual([module for module in modules if module.split('.')[0] in LAZY_IMPORTS], [])
+        self.results.append(('import_resources', 1, result))
+
+        if settings.BENCHMARK_UPDATE:
+            self.baselines.record('import_resources', 1, result)
+        else:
+            regressions = self.baselines.compare('import_resources', 1, result)
+
+            if regressions:
+                self.fail("Benchmark regressed:\n%s" % '\n'.join(regressions))
+
+    def test_auth_basic(self):
+        credentials = self.create_basic('johndoe', 'pass')
+        self.benchmark('auth_basic', self.get_list('/api/v1/basicnotes/', authentication=credentials))
+
+    def test_auth_apikey(self):
+        ApiKey.objects.create(user=self.user, key='secret')
+        credentials = self.create_apikey('johndoe', 'secret')
+        self.benchmark('auth_apikey', self.get_list('/api/v1/apikeynotes/', authentication=credentials))
+
+    def test_auth_session(self):
+        self.api_client.client.login(username='johndoe', password='pass')
+        self.benchmark('auth_session', self.get_list('/api/v1/sessionnotes/'))
+
+    @skipIf(python_digest is None, "python_digest not installed")
+    def test_auth_digest(self):
+        ApiKey.objects.create(user=self.user, key='secret')
+        challenge = self.api_client.get('/api/v1/digestnotes/')
+        self.assertEqual(challenge.status_code, 401)
+        challenge = python_digest.parse_digest_challenge(challenge['WWW-Authenticate'])
+        nonce_counts = iter(range(1, 1000))
+
+        # Reuses the nonce, as clients do, with a new count each time.
+        def get(notes):
+            credentials = python_digest.build_authorization_request(
+                username='johndoe',
+                method='GET',
+                uri='/api/v1/digestnotes/',
+                nonce_count=next(nonce_counts),
+                digest_challenge=challenge,
+                password='secret'
+            )
+            return self.api_client.get('/api/v1/digestnotes/', data={'limit': 0}, authentication=credentials)
+
+        self.benchmark('auth_digest', get)
@@ -0,0 +1,26 @@
+from django.urls.conf import include, re_path
+
+from tastypie.api import Api
+
+from . import resources
+from .resources import ApiKeyNoteResource, BasicNoteResource, \
+    FlatNoteResource, NoteResource, SessionNoteResource, TaggedNoteResource, \
+    TagResource, UserResource
+
+
+api = Api(api_name='v1')
+api.register(UserResource())
+api.register(TagResource())
+api.register(FlatNoteResource())
+api.register(NoteResource())
+api.register(TaggedNoteResource())
+api.register(BasicNoteResource())
+api.register(ApiKeyNoteResource())
+api.register(SessionNoteResource())
+
+if hasattr(resources, 'DigestNoteResource'):
+    api.register(resources.DigestNoteResource())
+
+urlpatterns = [
+    re_path(r'^api/', include(api.urls)),
+]
@@ -4,15 +4,21 @@ warnings.simplefilter('ignore', Warning)  # noqa
 
 from core.tests.api import *  # noqa
 from core.tests.authentication import *  # noqa
+from core.tests.asyncresources import *  # noqa
 from core.tests.authorization import *  # noqa
+from core.tests.bundle import *  # noqa
 from core.tests.cache import *  # noqa
 from core.tests.commands import *  # noqa
 from core.tests.fields import *  # noqa
 from core.tests.http import *  # noqa
+from core.tests.nplusone import *  # noqa
 from core.tests.paginator import *  # noqa
+from core.tests.parallel import *  # noqa
+from core.tests.querycost import *  # noqa
 from core.tests.resources import *  # noqa
 from core.tests.serializers import *  # noqa
 from core.tests.throttle import *  # noqa
+from core.tests.timing import *  # noqa
 from core.tests.utils import *  # noqa
 from core.tests.validation import *  # noqa
 from core.tests.race_condition import *  # noqa
@@ -1,15 +1,20 @@
 import json
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest
 from django.test import TestCase
 from django.test.utils import override_settings
+from django.urls import Resolver404, URLResolver
+from django.urls.conf import include, re_path
+from django.urls.resolvers import RegexPattern
 
 from tastypie.api import Api
 from tastypie.authorization import Authorization
 from tastypie.exceptions import NotRegistered, BadRequest
 from tastypie.resources import ModelResource
 from tastypie.serializers import Serializer
+from tastypie.utils import trailing_slash
 
 from core.models import Note, SlowNote
 from core.utils import adjust_schema
@@ -137,6 +142,64 @@ class ApiTestCase(TestCase):
         self.assertEqual(sorted([pattern.name for pattern in patterns if hasattr(pattern, 'name')]), ['api_v2_top_level'])
         self.assertEqual([[pattern.name for pattern in include.url_patterns if hasattr(pattern, 'name')] for include in patterns if hasattr(include, 'reverse_dict')], [['api_dispatch_list', 'api_get_schema', 'api_get_multiple', 'api_dispatch_detail'], ['api_dispatch_list', 'api_get_schema', 'api_get_multiple', 'api_dispatch_detail']])
 
+    def test_urls_cached(self):
+        api = Api()
+        api.register(NoteResource())
+
+        patterns = api.urls
+        self.assertEqual(len(patterns), 2)
+        self.assertTrue(api.urls[1] is patterns[1])
+
+        # Changing the registry rebuilds them.
+        api.register(UserResource())
+        self.assertEqual(len(api.urls), 3)
+        self.assertFalse(api.urls[1] is patterns[1])
+
+        api.unregister('users')
+        self.assertEqual(len(api.urls), 2)
+
+        # Mutating the returned list doesn't touch the cache.
+        patterns = api.urls
+        patterns.pop()
+        self.assertEqual(len(api.urls), 2)
+
+    def test_urls_dispatch_by_name(self):
+        class CustomNoteResource(NoteResource):
+            class Meta(NoteResource.Meta):
+                resource_name = 'customnotes'
+
+            def prepend_urls(self):
+                return [
+                    re_path(r"^alsonotes%s$" % trailing_slash, self.wrap_view('dispatch_list'), name="api_also_notes"),
+                ]
+
+        api = Api(dispatch_by_name=True)
+        api.register(NoteResource())
+        api.register(UserResource())
+        api.register(CustomNoteResource())
+
+        patterns = api.urls
+        self.assertEqual(len(patterns), 2)
+        self.assertEqual(sorted(patterns[1].resource_patterns.keys()), ['customnotes', 'notes', 'users'])
+
+        resolver = URLResolver(RegexPattern(r'^/'), [re_path(r'^api/', include(patterns))])
+
+        match = resolver.resolve('/api/v1/notes/1/')
+        self.assertEqual(match.url_name, 'api_dispatch_detail')
+        self.assertEqual(match.kwargs, {'api_name': 'v1', 'resource_name': 'notes', 'pk': '1'})
+
+        match = resolver.resolve('/api/v1/users/')
+        self.assertEqual(match.url_name, 'api_dispatch_list')
+        self.assertEqual(match.kwargs, {'api_name': 'v1', 'resource_name': 'users'})
+
+        self.assertEqual(resolver.resolve('/api/v1/').url_name, 'api_v1_top_level')
+
+        # Patterns not under the resource's name still resolve.
+        self.assertEqual(resolver.resolve('/api/v1/alsonotes/').url_name, 'api_also_notes')
+        self.assertRaises(Resolver404, resolver.resolve, '/api/v1/nonexistent/')
+
+        self.assertEqual(resolver.reverse('api_dispatch_detail', api_name='v1', resource_name='notes', pk=1), 'api/v1/notes/1/')
+
     def test_top_level(self):
         api = Api()
         api.register(NoteResource())
@@ -147,6 +210,38 @@ class ApiTestCase(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.content.decode('utf-8'), '{"notes": {"list_endpoint": "/api/v1/notes/", "schema": "/api/v1/notes/schema/"}, "users": {"list_endpoint": "/api/v1/users/", "schema": "/api/v1/users/schema/"}}')
 
+    def test_top_level_cached(self):
+        api = Api()
+        api.register(NoteResource())
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with self.assertNumQueries(0):
+            resp = api.top_level(request)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp['ETag']
+
+        with patch.object(api, 'build_top_level') as build_top_level:
+            resp = api.top_level(request)
+            self.assertEqual(resp['ETag'], etag)
+            self.assertEqual(build_top_level.call_count, 0)
+
+        request.META['HTTP_IF_NONE_MATCH'] = etag
+        resp = api.top_level(request)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        # Registering a resource changes the document.
+        api.register(UserResource())
+        resp = api.top_level(request)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp['ETag'], etag)
+        self.assertEqual(sorted(json.loads(resp.content.decode('utf-8')).keys()), ['notes', 'users'])
+
+        api.unregister('users')
+        resp = api.top_level(request)
+        self.assertEqual(resp.status_code, 304)
+
     def test_top_level_include_schema_content(self):
         api = Api()
 
@@ -0,0 +1,405 @@
+import asyncio
+import json
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import HttpRequest
+from django.test import TestCase
+
+from tastypie import fields
+from tastypie.authentication import ApiKeyAuthentication, SessionAuthentication
+from tastypie.authorization import Authorization, RowLevelAuthorization
+from tastypie.fieldsets import SparseFieldset, parse_field_paths
+from tastypie.models import ApiKey
+from tastypie.paginator import Paginator
+from tastypie.resources import AsyncModelResource, AsyncResource, ModelResource, Resource
+from tastypie.throttle import CacheThrottle
+from tastypie.timing import DehydrationProfiler
+
+from core.models import Note
+
+
+User = get_user_model()
+
+
+class AsyncUserResource(AsyncModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'users'
+        fields = ['username']
+
+
+class AsyncNoteResource(AsyncModelResource):
+    author = fields.ToOneField(AsyncUserResource, 'author', full=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'asyncnotes'
+        authorization = Authorization()
+        filtering = {'slug': ['exact']}
+        ordering = ['title']
+
+
+class SyncNoteResource(ModelResource):
+    author = fields.ToOneField(AsyncUserResource, 'author', full=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'asyncnotes'
+        authorization = Authorization()
+        filtering = {'slug': ['exact']}
+        ordering = ['title']
+
+
+class ActiveNoteResource(AsyncNoteResource):
+    def obj_get_list(self, bundle, **kwargs):
+        return super(ActiveNoteResource, self).obj_get_list(bundle, **kwargs).filter(is_active=True)
+
+
+class CountingNoteResource(AsyncNoteResource):
+    def alter_list_data_to_serialize(self, request, data):
+        data['meta']['authors'] = User.objects.filter(notes__isnull=False).distinct().count()
+        return data
+
+    def alter_detail_data_to_serialize(self, request, bundle):
+        bundle.data['author_notes'] = Note.objects.filter(author=bundle.obj.author_id).count()
+        return bundle
+
+
+class OwnNoteAuthorization(RowLevelAuthorization):
+    def rule(self, bundle):
+        return Q(author=bundle.request.user)
+
+
+class ProtectedNoteResource(AsyncModelResource):
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'protectednotes'
+        authentication = ApiKeyAuthentication()
+        authorization = OwnNoteAuthorization()
+        throttle = CacheThrottle(throttle_at=2)
+
+
+def call(resource, view, request, **kwargs):
+    return async_to_sync(resource.wrap_view(view))(request, **kwargs)
+
+
+class AsyncResourceTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def setUp(self):
+        super(AsyncResourceTestCase, self).setUp()
+        cache.clear()
+
+    def get_request(self, method='GET', **params):
+        request = HttpRequest()
+        request.method = method
+        request.GET = params
+        return request
+
+    def test_wrap_view(self):
+        view = AsyncNoteResource().wrap_view('dispatch_list')
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertTrue(view.csrf_exempt)
+
+    def test_get_async_method(self):
+        resource = AsyncNoteResource()
+        self.assertEqual(resource.get_async_method('get_list'), resource.aget_list)
+        self.assertEqual(resource.get_async_method('obj_get_list'), resource.aobj_get_list)
+        self.assertEqual(resource.get_async_method('post_list'), None)
+
+        # Overriding the sync hook wins over the inherited async one.
+        self.assertEqual(ActiveNoteResource().get_async_method('obj_get_list'), None)
+
+    def test_get_list(self):
+        request = self.get_request(order_by='title')
+        resp = call(AsyncNoteResource(), 'dispatch_list', request)
+        self.assertEqual(resp.status_code, 200)
+
+        expected = SyncNoteResource().wrap_view('dispatch_list')(self.get_request(order_by='title'))
+        self.assertEqual(json.loads(resp.content.decode('utf-8')), json.loads(expected.content.decode('utf-8')))
+
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['meta']['total_count'], 6)
+        self.assertEqual(data['objects'][0]['author']['username'], 'johndoe')
+
+        resp = call(AsyncNoteResource(), 'dispatch_list', self.get_request(slug='another-post', limit='1'))
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['meta']['total_count'], 1)
+        self.assertEqual(data['objects'][0]['slug'], 'another-post')
+
+        resp = call(AsyncNoteResource(), 'dispatch_list', self.get_request(title='nope'))
+        self.assertEqual(resp.status_code, 400)
+
+    def test_overridden_alter_hooks(self):
+        # They're run in a thread, so can use the ORM.
+        resp = call(CountingNoteResource(), 'dispatch_list', self.get_request())
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['meta']['authors'], 2)
+
+        resp = call(CountingNoteResource(), 'dispatch_detail', self.get_request(), pk=1)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['author_notes'], Note.objects.filter(author=1).count())
+
+    def test_get_list_overridden_hook(self):
+        resp = call(ActiveNoteResource(), 'dispatch_list', self.get_request())
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['meta']['total_count'], Note.objects.filter(is_active=True).count())
+
+    def test_get_detail(self):
+        resp = call(AsyncNoteResource(), 'dispatch_detail', self.get_request(), pk=1)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['title'], 'First Post!')
+        self.assertEqual(data['author']['username'], 'johndoe')
+
+        resp = call(AsyncNoteResource(), 'dispatch_detail', self.get_request(), pk=999)
+        self.assertEqual(resp.status_code, 404)
+
+        resp = call(AsyncNoteResource(), 'dispatch_detail', self.get_request(), pk='abc')
+        self.assertEqual(resp.status_code, 404)
+
+    def test_sync_methods(self):
+        request = self.get_request('POST')
+        request.META['CONTENT_TYPE'] = 'application/json'
+        request._body = json.dumps({
+            'title': 'Async',
+            'slug': 'async',
+            'content': 'Posted asynchronously.',
+            'author': '/api/v1/users/1/',
+        }).encode('utf-8')
+        resp = call(AsyncNoteResource(), 'dispatch_list', request)
+        self.assertEqual(resp.status_code, 201)
+        self.assertTrue(Note.objects.filter(slug='async').exists())
+
+        resp = call(AsyncNoteResource(), 'get_schema', self.get_request())
+        self.assertEqual(resp.status_code, 200)
+
+    def test_method_check(self):
+        resp = call(AsyncUserResource(), 'dispatch_list', self.get_request('COPY'))
+        self.assertEqual(resp.status_code, 405)
+
+        resp = call(AsyncUserResource(), 'dispatch_list', self.get_request('OPTIONS'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Allow'], 'GET,POST,PUT,DELETE,PATCH')
+
+    def test_authentication_authorization_throttling(self):
+        john_doe = User.objects.get(username='johndoe')
+        api_key = ApiKey.objects.get_or_create(user=john_doe)[0]
+
+        resp = call(ProtectedNoteResource(), 'dispatch_list', self.get_request())
+        self.assertEqual(resp.status_code, 401)
+
+        request = self.get_request(username='johndoe', api_key='wrong')
+        self.assertEqual(call(ProtectedNoteResource(), 'dispatch_list', request).status_code, 401)
+
+        request = self.get_request(username='johndoe', api_key=api_key.key)
+        resp = call(ProtectedNoteResource(), 'dispatch_list', request)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data['meta']['total_count'], Note.objects.filter(author=john_doe).count())
+
+        # Not one of theirs.
+        other = Note.objects.exclude(author=john_doe).first()
+        request = self.get_request(username='johndoe', api_key=api_key.key)
+        resp = call(ProtectedNoteResource(), 'dispatch_detail', request, pk=other.pk)
+        self.assertEqual(resp.status_code, 401)
+
+        request = self.get_request(username='johndoe', api_key=api_key.key)
+        resp = call(ProtectedNoteResource(), 'dispatch_list', request)
+        self.assertEqual(resp.status_code, 200)
+
+        # ``throttle_at=2`` & two requests logged.
+        request = self.get_request(username='johndoe', api_key=api_key.key)
+        resp = call(ProtectedNoteResource(), 'dispatch_list', request)
+        self.assertEqual(resp.status_code, 429)
+
+    def test_session_authentication(self):
+        john_doe = User.objects.get(username='johndoe')
+        auth = SessionAuthentication()
+
+        request = self.get_request()
+        request.user = AnonymousUser()
+
+        async def auser():
+            return john_doe
+
+        request.auser = auser
+        self.assertTrue(async_to_sync(auth.ais_authenticated)(request))
+        self.assertEqual(request.user, john_doe)
+
+        # CSRF is still checked.
+        request.method = 'POST'
+        self.assertFalse(async_to_sync(auth.ais_authenticated)(request))
+
+    def test_paginator(self):
+        paginator = Paginator({'limit': 2, 'offset': 2}, Note.objects.order_by('pk'), resource_uri='/api/v1/notes/')
+
+        async def page():
+            meta = await paginator.apage()
+            meta['objects'] = [note.pk async for note in meta['objects']]
+            return meta
+
+        meta = async_to_sync(page)()
+        self.assertEqual(meta['objects'], [3, 4])
+        self.assertEqual(meta['meta']['total_count'], 6)
+        self.assertEqual(meta['meta']['next'], '/api/v1/notes/?limit=2&offset=4')
+
+        # Lists fall back to ``len``.
+        paginator = Paginator({}, [1, 2, 3])
+        self.assertEqual(async_to_sync(paginator.aget_count)(), 3)
+
+
+class StubService(object):
+    """
+    Stands in for another service, answering after a delay & recording how
+    many calls were in flight at once.
+    """
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def get(self, value):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        try:
+            await asyncio.sleep(self.delay)
+            return value
+        finally:
+            self.active -= 1
+
+
+class Remote(object):
+    def __init__(self, pk, name):
+        self.pk = pk
+        self.name = name
+
+
+service = StubService()
+
+
+async def get_profile(bundle):
+    return await service.get(Remote(bundle.obj.author_id, 'profile-%s' % bundle.obj.author_id))
+
+
+async def get_badges(bundle):
+    return await service.get([Remote(bundle.obj.pk * 10 + i, 'badge-%s-%s' % (bundle.obj.pk, i)) for i in range(2)])
+
+
+class ProfileResource(Resource):
+    name = fields.CharField(attribute='name')
+
+    class Meta:
+        resource_name = 'profiles'
+        object_class = Remote
+        include_resource_uri = False
+
+
+class BadgeResource(AsyncResource):
+    name = fields.CharField(attribute='name')
+
+    class Meta:
+        resource_name = 'badges'
+        object_class = Remote
+        include_resource_uri = False
+
+
+class ServiceNoteResource(AsyncModelResource):
+    profile = fields.ToOneField(ProfileResource, get_profile, full=True)
+    badges = fields.ToManyField(BadgeResource, get_badges, full=True)
+
+    class Meta:
+        queryset = Note.objects.order_by('pk')
+        resource_name = 'servicenotes'
+        fields = ['title']
+        include_resource_uri = False
+        related_concurrency = 4
+
+    def dehydrate_profile(self, bundle):
+        return bundle.data['profile'].data['name']
+
+
+class SyncServiceNoteResource(ModelResource):
+    profile = fields.ToOneField(ProfileResource, get_profile, full=True)
+    badges = fields.ToManyField(BadgeResource, get_badges, full=True)
+
+    class Meta:
+        queryset = Note.objects.order_by('pk')
+        resource_name = 'servicenotes'
+        fields = ['title']
+        include_resource_uri = False
+
+    def dehydrate_profile(self, bundle):
+        return bundle.data['profile'].data['name']
+
+
+class ConcurrentRelatedTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def setUp(self):
+        super(ConcurrentRelatedTestCase, self).setUp()
+        service.calls = service.max_active = 0
+
+    def get_request(self):
+        request = HttpRequest()
+        request.method = 'GET'
+        return request
+
+    def test_get_list(self):
+        resp = call(ServiceNoteResource(), 'dispatch_list', self.get_request())
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content.decode('utf-8'))
+
+        # Two calls per note, at most four at a time.
+        self.assertEqual(service.calls, 12)
+        self.assertEqual(service.max_active, 4)
+
+        first = data['objects'][0]
+        self.assertEqual(list(first.keys()), ['badges', 'profile', 'title'])
+        self.assertEqual(first['profile'], 'profile-1')
+        self.assertEqual(first['badges'], [{'name': 'badge-1-0'}, {'name': 'badge-1-1'}])
+
+        # The same as resolving them one after the other.
+        service.max_active = 0
+        expected = SyncServiceNoteResource().wrap_view('dispatch_list')(self.get_request())
+        self.assertEqual(service.max_active, 1)
+        self.assertEqual(resp.content, expected.content)
+
+    def test_get_detail(self):
+        resp = call(ServiceNoteResource(), 'dispatch_detail', self.get_request(), pk=2)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(data, {
+            'badges': [{'name': 'badge-2-0'}, {'name': 'badge-2-1'}],
+            'profile': 'profile-1',
+            'title': 'Another Post',
+        })
+        self.assertEqual(service.max_active, 2)
+
+    def test_sparse_fieldset(self):
+        resource = ServiceNoteResource()
+        bundle = resource.build_bundle(obj=Note.objects.get(pk=1), request=self.get_request())
+        bundle.fieldset = SparseFieldset(include=parse_field_paths('title,profile'))
+        bundle = async_to_sync(resource.afull_dehydrate)(bundle)
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(bundle.data, {'profile': 'profile-1', 'title': 'First Post!'})
+
+    def test_profile(self):
+        with DehydrationProfiler() as profiler:
+            resp = call(ServiceNoteResource(), 'dispatch_list', self.get_request())
+
+        # The same data, but with the fields resolved one by one, & measured.
+        expected = SyncServiceNoteResource().wrap_view('dispatch_list')(self.get_request())
+        self.assertEqual(resp.content, expected.content)
+        stats = dict(((stat['resource'], stat['field'], stat['hook']), stat) for stat in profiler.get_stats())
+        self.assertEqual(stats[('ServiceNoteResource', 'profile', 'ToOneField.dehydrate')]['calls'], 6)
+        self.assertEqual(stats[('ServiceNoteResource', 'badges', 'ToManyField.dehydrate')]['calls'], 6)
+        self.assertEqual(stats[('BadgeResource', 'name', 'CharField.dehydrate')]['calls'], 12)
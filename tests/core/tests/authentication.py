@@ -4,6 +4,7 @@ import warnings
 from unittest import skipIf
 
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth.models import AnonymousUser, User
 from django.http import HttpRequest
 from django.test import TestCase
@@ -354,6 +355,103 @@ class DigestAuthenticationTestCase(TestCase):
         auth_request = auth.is_authenticated(request)
         self.assertFalse(auth_request)
 
+    def build_digest_request(self, auth, user, challenge, nonce_count):
+        request = HttpRequest()
+        request.META['HTTP_AUTHORIZATION'] = python_digest.build_authorization_request(
+            username=user.username,
+            method=request.method,
+            uri='/',
+            nonce_count=nonce_count,
+            digest_challenge=python_digest.parse_digest_challenge(challenge['WWW-Authenticate']),
+            password=user.api_key.key
+        )
+        return request
+
+    def test_nonce_reuse(self):
+        auth = DigestAuthentication()
+        john_doe = User.objects.get(username='johndoe')
+        create_api_key(User, instance=john_doe, created=True)
+        john_doe = User.objects.get(username='johndoe')
+        challenge = auth.is_authenticated(HttpRequest())
+
+        # The user & key are fetched together.
+        request = self.build_digest_request(auth, john_doe, challenge, 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(auth.is_authenticated(request), True)
+        self.assertEqual(request.user, john_doe)
+
+        # Replaying the same nonce count is refused with a stale challenge.
+        request = self.build_digest_request(auth, john_doe, challenge, 1)
+        auth_request = auth.is_authenticated(request)
+        self.assertTrue(isinstance(auth_request, HttpUnauthorized))
+        self.assertTrue('stale="true"' in auth_request['WWW-Authenticate'])
+
+        # Reusing the nonce with a higher count doesn't need a new challenge.
+        request = self.build_digest_request(auth, john_doe, challenge, 2)
+        self.assertEqual(auth.is_authenticated(request), True)
+        request = self.build_digest_request(auth, john_doe, challenge, 5)
+        self.assertEqual(auth.is_authenticated(request), True)
+        request = self.build_digest_request(auth, john_doe, challenge, 4)
+        self.assertTrue(isinstance(auth.is_authenticated(request), HttpUnauthorized))
+
+    def test_unknown_nonce(self):
+        auth = DigestAuthentication()
+        john_doe = User.objects.get(username='johndoe')
+        create_api_key(User, instance=john_doe, created=True)
+        challenge = auth.is_authenticated(HttpRequest())
+        request = self.build_digest_request(auth, john_doe, challenge, 1)
+        self.assertEqual(auth.is_authenticated(request), True)
+
+        # Correctly signed, but issued by a process with its own cache.
+        cache.clear()
+        request = self.build_digest_request(auth, john_doe, challenge, 2)
+        self.assertEqual(auth.is_authenticated(request), True)
+
+        # From then on, it's tracked.
+        request = self.build_digest_request(auth, john_doe, challenge, 2)
+        auth_request = auth.is_authenticated(request)
+        self.assertTrue(isinstance(auth_request, HttpUnauthorized))
+        self.assertTrue('stale="true"' in auth_request['WWW-Authenticate'])
+
+    def test_expired_nonce(self):
+        auth = DigestAuthentication(nonce_timeout=60)
+        john_doe = User.objects.get(username='johndoe')
+        create_api_key(User, instance=john_doe, created=True)
+        challenge = {'WWW-Authenticate': python_digest.build_digest_challenge(time.time() - 61, settings.SECRET_KEY, auth.realm, auth.opaque, False)}
+
+        request = self.build_digest_request(auth, john_doe, challenge, 1)
+        auth_request = auth.is_authenticated(request)
+        self.assertTrue(isinstance(auth_request, HttpUnauthorized))
+        self.assertTrue('stale="true"' in auth_request['WWW-Authenticate'])
+
+    def test_use_nonce(self):
+        auth = DigestAuthentication()
+        john_doe = User.objects.get(username='johndoe')
+        create_api_key(User, instance=john_doe, created=True)
+        challenge = auth.is_authenticated(HttpRequest())
+        request = self.build_digest_request(auth, john_doe, challenge, 3)
+        digest_response = python_digest.parse_digest_credentials(request.META['HTTP_AUTHORIZATION'])
+
+        # Both requests passed ``check_nonce``, but only one can use the count.
+        self.assertTrue(auth.check_nonce(digest_response))
+        self.assertTrue(auth.check_nonce(digest_response))
+        self.assertTrue(auth.use_nonce(digest_response))
+        self.assertFalse(auth.use_nonce(digest_response))
+        self.assertFalse(auth.check_nonce(digest_response))
+
+    def test_bad_digest_does_not_burn_nonce_count(self):
+        auth = DigestAuthentication()
+        john_doe = User.objects.get(username='johndoe')
+        create_api_key(User, instance=john_doe, created=True)
+        challenge = auth.is_authenticated(HttpRequest())
+
+        request = self.build_digest_request(auth, john_doe, challenge, 9)
+        request.META['HTTP_AUTHORIZATION'] = request.META['HTTP_AUTHORIZATION'].replace('response="', 'response="0')
+        self.assertTrue(isinstance(auth.is_authenticated(request), HttpUnauthorized))
+
+        request = self.build_digest_request(auth, john_doe, challenge, 1)
+        self.assertEqual(auth.is_authenticated(request), True)
+
 
 @skipIf(not oauth2 or not oauth_provider, "oauth provider not installed")
 @skipIf(settings.DJANGO_VERSION >= settings.DJANGO_11, 'oauth-plus not compatible with django 1.11')
@@ -1,9 +1,13 @@
+from unittest import mock
+
+from django.db.models import Q
 from django.test import TestCase
 from django.http import HttpRequest
 from django.contrib.auth.models import User, Permission
-from core.models import Note
-from tastypie.authorization import Authorization, ReadOnlyAuthorization, DjangoAuthorization
-from tastypie.exceptions import Unauthorized
+from core.models import Note, Subject
+from tastypie.bundle import Bundle
+from tastypie.authorization import Authorization, ReadOnlyAuthorization, DjangoAuthorization, RowLevelAuthorization
+from tastypie.exceptions import ImmediateHttpResponse, Unauthorized
 from tastypie import fields
 from tastypie.resources import Resource, ModelResource
 
@@ -29,6 +33,58 @@ class DjangoNoteResource(ModelResource):
         authorization = DjangoAuthorization()
 
 
+class DjangoSubjectResource(ModelResource):
+    class Meta:
+        resource_name = 'subjects'
+        queryset = Subject.objects.all()
+        authorization = DjangoAuthorization()
+
+
+class DjangoSubjectNoteResource(ModelResource):
+    subjects = fields.ManyToManyField(DjangoSubjectResource, 'subjects', full=True)
+
+    class Meta:
+        resource_name = 'notes'
+        queryset = Note.objects.all()
+        authorization = Authorization()
+
+
+class ObjectDjangoAuthorization(DjangoAuthorization):
+    def check_user_perm(self, user, permission, obj_or_list):
+        # Like an object-level permissions backend would.
+        return obj_or_list.pk == 1
+
+
+class OwnerDjangoAuthorization(DjangoAuthorization):
+    def update_detail(self, object_list, bundle):
+        if bundle.obj.author_id != bundle.request.user.pk:
+            raise Unauthorized("Not yours.")
+
+        return super(OwnerDjangoAuthorization, self).update_detail(object_list, bundle)
+
+
+class OwnerDjangoNoteResource(ModelResource):
+    class Meta:
+        resource_name = 'notes'
+        queryset = Note.objects.filter(is_active=True)
+        authorization = OwnerDjangoAuthorization()
+
+
+class OwnerAuthorization(RowLevelAuthorization):
+    def rule(self, bundle):
+        return Q(author=bundle.request.user)
+
+    def delete_rule(self, bundle):
+        return Q(author=bundle.request.user, title__startswith='Another')
+
+
+class OwnerNoteResource(ModelResource):
+    class Meta:
+        resource_name = 'notes'
+        queryset = Note.objects.filter(is_active=True)
+        authorization = OwnerAuthorization()
+
+
 class NotAModel(object):
     name = 'Foo'
 
@@ -238,3 +294,230 @@ class DjangoAuthorizationTestCase(TestCase):
         bundle.request.method = 'DELETE'
         self.assertEqual(len(auth.delete_list(resource.get_object_list(bundle.request), bundle)), 4)
         self.assertTrue(auth.delete_detail(resource.get_object_list(bundle.request)[0], bundle))
+
+    def test_permission_names_precomputed(self):
+        resource = DjangoNoteResource()
+        auth = resource._meta.authorization
+
+        self.assertIn(Note, auth._permission_names)
+        self.assertEqual(auth.permission_name(Note, 'change'), 'core.change_note')
+        self.assertEqual(auth.permission_name(Note, 'frobnicate'), 'core.frobnicate_note')
+
+    def test_perms_checked_once_per_request(self):
+        self.user.user_permissions.add(self.change)
+
+        request = HttpRequest()
+        request.user = self.user
+        resource = DjangoNoteResource()
+        auth = resource._meta.authorization
+        bundles = [
+            resource.build_bundle(obj=note, request=request)
+            for note in resource.get_object_list(request)
+        ]
+
+        with mock.patch.object(User, 'has_perm', autospec=True, return_value=True) as has_perm:
+            for bundle in bundles:
+                self.assertTrue(auth.update_detail(None, bundle))
+
+            self.assertEqual(has_perm.call_count, 1)
+
+            # A new user on the request gets checked afresh.
+            request.user = User.objects.all()[1]
+            self.assertTrue(auth.update_detail(None, bundles[0]))
+            self.assertEqual(has_perm.call_count, 2)
+
+    def test_batch_detail(self):
+        request = HttpRequest()
+        request.user = self.user
+        resource = DjangoNoteResource()
+        auth = resource._meta.authorization
+        object_list = resource.get_object_list(request)
+        bundles = [resource.build_bundle(obj=note, request=request) for note in object_list]
+
+        self.assertRaises(Unauthorized, auth.batch_detail, 'update', object_list, bundles)
+
+        self.user.user_permissions.add(self.change)
+        request = HttpRequest()
+        request.user = User.objects.get(pk=self.user.pk)
+
+        for bundle in bundles:
+            bundle.request = request
+
+        with mock.patch.object(auth, 'check_user_perm', wraps=auth.check_user_perm) as check:
+            self.assertTrue(auth.batch_detail('update', object_list, bundles))
+            self.assertEqual(check.call_count, 1)
+
+        self.assertRaises(Unauthorized, auth.batch_detail, 'delete', object_list, bundles)
+
+    def test_cache_per_object_perms(self):
+        request = HttpRequest()
+        request.user = self.user
+        auth = ObjectDjangoAuthorization()
+        resource = DjangoNoteResource()
+        first, second = [resource.build_bundle(obj=Note.objects.get(pk=pk), request=request) for pk in (1, 2)]
+
+        self.assertTrue(auth.update_detail(None, first))
+        self.assertRaises(Unauthorized, auth.update_detail, None, second)
+        self.assertRaises(Unauthorized, auth.batch_detail, 'update', None, [first, second])
+
+    def test_save_m2m_batch(self):
+        self.user.user_permissions.add(Permission.objects.get_by_natural_key('change_subject', 'core', 'subject'))
+        request = HttpRequest()
+        request.user = User.objects.get(pk=self.user.pk)
+        subjects = [Subject.objects.create(name='Subject %s' % i, url='http://example.com/%s' % i) for i in range(3)]
+        resource = DjangoSubjectNoteResource()
+        bundle = resource.build_bundle(obj=Note.objects.get(pk=1), request=request)
+        bundle.data['subjects'] = [Bundle(obj=subject, data={'name': subject.name}) for subject in subjects]
+        auth = DjangoSubjectResource._meta.authorization
+
+        with mock.patch.object(auth, 'batch_detail', wraps=auth.batch_detail) as batch_detail, \
+                mock.patch.object(auth, 'update_detail', wraps=auth.update_detail) as update_detail:
+            resource.save_m2m(bundle)
+
+        self.assertEqual(batch_detail.call_count, 1)
+        self.assertEqual(len(batch_detail.call_args[0][2]), 3)
+        self.assertFalse(update_detail.called)
+        self.assertEqual(sorted(Note.objects.get(pk=1).subjects.values_list('pk', flat=True)), [subject.pk for subject in subjects])
+
+        # Without the permission, nothing gets saved.
+        self.user.user_permissions.clear()
+        request.user = User.objects.get(pk=self.user.pk)
+        Note.objects.get(pk=1).subjects.clear()
+
+        for subject in subjects:
+            subject.name = 'Changed'
+
+        bundle.data['subjects'] = [Bundle(obj=subject, data={'name': subject.name}) for subject in subjects]
+
+        with self.assertRaises(ImmediateHttpResponse):
+            resource.save_m2m(bundle)
+
+        self.assertFalse(Subject.objects.filter(name='Changed').exists())
+
+    def test_batch_detail_overridden_per_object(self):
+        self.user.user_permissions.add(self.change)
+        request = HttpRequest()
+        request.user = User.objects.get(pk=self.user.pk)
+        resource = OwnerDjangoNoteResource()
+        auth = resource._meta.authorization
+        object_list = resource.get_object_list(request)
+        mine = [resource.build_bundle(obj=note, request=request) for note in object_list.filter(author=self.user)]
+        theirs = resource.build_bundle(obj=object_list.exclude(author=self.user)[0], request=request)
+
+        self.assertTrue(auth.batch_detail('update', object_list, mine))
+        self.assertRaises(Unauthorized, auth.batch_detail, 'update', object_list, mine + [theirs])
+
+        # Nor are the bundles of a bulk ``PATCH`` preauthorized.
+        request.GET = {'format': 'json'}
+        request.method = 'PATCH'
+        request._read_started = False
+        request._raw_post_data = request._body = '{"objects": [{"resource_uri": "/api/v1/notes/%s/", "title": "Mine now"}]}' % theirs.obj.pk
+        resp = resource.wrap_view('patch_list')(request)
+        self.assertEqual(resp.status_code, 401)
+        self.assertNotEqual(Note.objects.get(pk=theirs.obj.pk).title, 'Mine now')
+
+    def test_base_batch_detail(self):
+        request = HttpRequest()
+        resource = ReadOnlyNoteResource()
+        auth = resource._meta.authorization
+        object_list = resource.get_object_list(request)
+        bundles = [resource.build_bundle(obj=note, request=request) for note in object_list]
+
+        self.assertTrue(auth.batch_detail('read', object_list, bundles))
+        self.assertRaises(Unauthorized, auth.batch_detail, 'update', object_list, bundles)
+        self.assertTrue(NoRulesNoteResource()._meta.authorization.batch_detail('delete', object_list, bundles))
+
+
+class RowLevelAuthorizationTestCase(TestCase):
+    fixtures = ['note_testdata']
+
+    def setUp(self):
+        super(RowLevelAuthorizationTestCase, self).setUp()
+        self.request = HttpRequest()
+        self.request.user = User.objects.get(username='johndoe')
+        self.resource = OwnerNoteResource()
+        self.auth = self.resource._meta.authorization
+
+    def build_bundles(self, *pks):
+        return [
+            self.resource.build_bundle(obj=Note.objects.get(pk=pk), request=self.request)
+            for pk in pks
+        ]
+
+    def test_list(self):
+        bundle = self.resource.build_bundle(request=self.request)
+        object_list = self.resource.get_object_list(self.request)
+
+        self.assertEqual(sorted(n.pk for n in self.auth.read_list(object_list, bundle)), [1, 2])
+        self.assertEqual(sorted(n.pk for n in self.auth.update_list(object_list, bundle)), [1, 2])
+        self.assertEqual([n.pk for n in self.auth.delete_list(object_list, bundle)], [2])
+        self.assertEqual(self.auth.create_list(object_list, bundle), [])
+
+    def test_detail(self):
+        object_list = self.resource.get_object_list(self.request)
+        mine, theirs = self.build_bundles(1, 4)
+
+        self.assertTrue(self.auth.read_detail(object_list, mine))
+        self.assertTrue(self.auth.update_detail(object_list, mine))
+        self.assertRaises(Unauthorized, self.auth.delete_detail, object_list, mine)
+        self.assertRaises(Unauthorized, self.auth.read_detail, object_list, theirs)
+        self.assertRaises(Unauthorized, self.auth.update_detail, object_list, theirs)
+        self.assertRaises(Unauthorized, self.auth.create_detail, object_list, mine)
+
+        # Unsaved objects can't be updated, but don't stop reading the schema.
+        unsaved = self.resource.build_bundle(request=self.request)
+        self.assertTrue(self.auth.read_detail(object_list, unsaved))
+        self.assertRaises(Unauthorized, self.auth.update_detail, object_list, unsaved)
+
+        # Rows outside of ``object_list`` are refused.
+        inactive = self.build_bundles(5)[0]
+        self.assertRaises(Unauthorized, self.auth.update_detail, object_list, inactive)
+
+    def test_batch_detail_single_query(self):
+        object_list = self.resource.get_object_list(self.request)
+        bundles = self.build_bundles(1, 2)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(self.auth.batch_detail('update', object_list, bundles))
+
+        bundles += self.build_bundles(4)
+
+        with self.assertNumQueries(1):
+            self.assertRaises(Unauthorized, self.auth.batch_detail, 'update', object_list, bundles)
+
+    def patch_list(self, body):
+        request = HttpRequest()
+        request.user = self.request.user
+        request.GET = {'format': 'json'}
+        request.method = 'PATCH'
+        request._read_started = False
+        request._raw_post_data = request._body = body
+        return self.resource.wrap_view('patch_list')(request)
+
+    def test_patch_list(self):
+        with mock.patch.object(self.auth, 'update_detail') as update_detail:
+            resp = self.patch_list('{"objects": [{"resource_uri": "/api/v1/notes/1/", "content": "One"}, {"resource_uri": "/api/v1/notes/2/", "content": "Two"}]}')
+            self.assertEqual(resp.status_code, 202)
+            # Authorized as a batch rather than object-by-object.
+            self.assertFalse(update_detail.called)
+
+        self.assertEqual(Note.objects.get(pk=1).content, 'One')
+        self.assertEqual(Note.objects.get(pk=2).content, 'Two')
+
+        resp = self.patch_list('{"objects": [{"resource_uri": "/api/v1/notes/1/", "content": "Uno"}, {"resource_uri": "/api/v1/notes/4/", "content": "Four"}]}')
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(Note.objects.get(pk=1).content, 'One')
+        self.assertNotEqual(Note.objects.get(pk=4).content, 'Four')
+
+        resp = self.patch_list('{"objects": [], "deleted_objects": ["/api/v1/notes/2/", "/api/v1/notes/1/"]}')
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(Note.objects.filter(pk__in=[1, 2]).count(), 2)
+
+        resp = self.patch_list('{"objects": [], "deleted_objects": ["/api/v1/notes/2/"]}')
+        self.assertEqual(resp.status_code, 202)
+        self.assertFalse(Note.objects.filter(pk=2).exists())
+
+    def test_patch_list_cannot_swap_pk(self):
+        resp = self.patch_list('{"objects": [{"resource_uri": "/api/v1/notes/1/", "id": 4, "content": "Mine now"}]}')
+        self.assertEqual(resp.status_code, 401)
+        self.assertNotEqual(Note.objects.get(pk=4).content, 'Mine now')
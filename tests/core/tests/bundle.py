@@ -0,0 +1,55 @@
+from django.http import HttpRequest
+from django.test import SimpleTestCase
+
+from tastypie.bundle import Bundle
+
+
+class BundleTestCase(SimpleTestCase):
+    def test_defaults(self):
+        bundle = Bundle()
+        self.assertEqual(bundle.data, {})
+        self.assertEqual(bundle.preauthorized, frozenset())
+        self.assertEqual(bundle.fieldset, None)
+        self.assertEqual(bundle.predehydrated, None)
+        self.assertFalse(hasattr(bundle, 'update_fields'))
+        self.assertFalse(hasattr(bundle, 'm2m_update_fields'))
+
+    def test_lazy_containers(self):
+        bundle = Bundle()
+        self.assertEqual(bundle._request, None)
+        self.assertEqual(bundle._errors, None)
+        self.assertEqual(bundle._objects_saved, None)
+        self.assertEqual(bundle._related_objects_to_save, None)
+
+        # Created once, when first used.
+        self.assertTrue(isinstance(bundle.request, HttpRequest))
+        self.assertIs(bundle.request, bundle.request)
+        bundle.errors['notes'] = ['Oops.']
+        self.assertEqual(bundle.errors, {'notes': ['Oops.']})
+        bundle.objects_saved.add('note:1')
+        self.assertEqual(bundle.objects_saved, set(['note:1']))
+        self.assertEqual(bundle.related_objects_to_save, {})
+
+        # Not shared between bundles.
+        self.assertEqual(Bundle().errors, {})
+        self.assertEqual(Bundle().objects_saved, set())
+
+    def test_passed_containers(self):
+        request = HttpRequest()
+        objects_saved = set(['note:1'])
+        bundle = Bundle(request=request, objects_saved=objects_saved)
+        self.assertIs(bundle.request, request)
+        self.assertIs(bundle.objects_saved, objects_saved)
+
+        bundle.errors = {'notes': 'Oops.'}
+        self.assertEqual(bundle.errors, {'notes': 'Oops.'})
+
+    def test_slots(self):
+        bundle = Bundle()
+        bundle.update_fields = ['title']
+        self.assertEqual(bundle.update_fields, ['title'])
+        self.assertFalse('update_fields' in bundle.__dict__)
+
+        # Custom attributes still work.
+        bundle.times_hydrated = 1
+        self.assertEqual(bundle.__dict__, {'times_hydrated': 1})
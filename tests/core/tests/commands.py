@@ -1,4 +1,7 @@
+from io import StringIO
+
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db import models
 from django.test import TestCase
 
@@ -32,3 +35,26 @@ class BackfillApiKeysTestCase(TestCase):
         self.assertEqual(ApiKey.objects.count(), 1)
 
         self.assertEqual(ApiKey.objects.filter(user=new_user).count(), 1)
+
+
+class ProfileDehydrationTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def test_command(self):
+        out = StringIO()
+        call_command('profile_dehydration', 'core.tests.timing.ProfiledNoteResource', requests=2, limit=2, stdout=out)
+        lines = out.getvalue().split('\n')
+        self.assertEqual(lines[0], 'Profiled 2 requests to ProfiledNoteResource.get_list.')
+        self.assertTrue(lines[2].startswith('resource'))
+        self.assertEqual(len(lines), 15)
+        author = [line.split() for line in lines if line.startswith('ProfiledNoteResource   ') and ' author ' in line][0]
+        self.assertEqual(author[:4], ['ProfiledNoteResource', 'author', 'ToOneField.dehydrate', '4'])
+        self.assertEqual(author[-1], '4')
+
+        out = StringIO()
+        call_command('profile_dehydration', 'core.tests.timing.ProfiledNoteResource', requests=1, query='slug=another-post', top=1, stdout=out)
+        self.assertEqual(len(out.getvalue().split('\n')), 5)
+
+    def test_errors(self):
+        self.assertRaises(CommandError, call_command, 'profile_dehydration', 'core.tests.timing.NopeResource')
+        self.assertRaises(CommandError, call_command, 'profile_dehydration', 'core.tests.timing.ProfiledNoteResource', query='order_by=nope', stdout=StringIO())
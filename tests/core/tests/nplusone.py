@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from django.test import TestCase
+
+from tastypie import fields
+from tastypie.authorization import Authorization
+from tastypie.resources import ModelResource
+from tastypie.test import QueryRecorder, ResourceTestCaseMixin
+
+from core.models import Note
+
+
+User = get_user_model()
+
+
+class NPlusOneUserResource(ModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'users'
+        fields = ['username']
+
+
+class NPlusOneNoteResource(ModelResource):
+    author = fields.ToOneField(NPlusOneUserResource, 'author', full=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'notes'
+        authorization = Authorization()
+        fields = ['title']
+
+
+class SelectRelatedNoteResource(NPlusOneNoteResource):
+    class Meta(NPlusOneNoteResource.Meta):
+        queryset = Note.objects.select_related('author')
+
+
+class HookNoteResource(ModelResource):
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'notes'
+        authorization = Authorization()
+        fields = ['title']
+
+    def dehydrate_title(self, bundle):
+        return '%s, by %s' % (bundle.obj.title, bundle.obj.author.username)
+
+
+class NPlusOneTestCase(ResourceTestCaseMixin, TestCase):
+    def populate(self, size):
+        Note.objects.all().delete()
+        User.objects.all().delete()
+
+        for i in range(size):
+            user = User.objects.create_user('user%s' % i)
+            Note.objects.create(author=user, title='Note %s' % i, slug='note-%s' % i)
+
+    def get_list(self, resource):
+        def request():
+            request = HttpRequest()
+            request.method = 'GET'
+            resp = resource.wrap_view('dispatch_list')(request)
+            self.assertHttpOK(resp)
+            return resp
+
+        return request
+
+    def test_query_recorder(self):
+        self.populate(2)
+
+        with QueryRecorder() as recorder:
+            self.get_list(NPlusOneNoteResource())()
+
+        self.assertEqual(len(recorder), 4)
+        self.assertEqual([source for sql, source in recorder.queries], [
+            None,
+            None,
+            'NPlusOneNoteResource.author (ToOneField)',
+            'NPlusOneNoteResource.author (ToOneField)',
+        ])
+        self.assertTrue(recorder.queries[2][0].startswith('SELECT'))
+
+    def test_record_queries(self):
+        recorders = self.record_queries(self.get_list(NPlusOneNoteResource()), self.populate, sizes=(1, 2, 3))
+        self.assertEqual([len(recorder) for recorder in recorders], [3, 4, 5])
+
+    def test_to_one(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertNoNPlusOneQueries(self.get_list(NPlusOneNoteResource()), self.populate)
+
+        lines = str(cm.exception).split('\n')
+        self.assertEqual(lines[0], 'The number of queries grew with the number of rows: 4 queries for 2 rows, 6 for 4 rows.')
+        self.assertTrue(lines[1].startswith('  NPlusOneNoteResource.author (ToOneField): 2 queries, then 4, like: SELECT'))
+        self.assertIn('FROM "auth_user"', lines[1])
+
+        self.assertNoNPlusOneQueries(self.get_list(SelectRelatedNoteResource()), self.populate)
+
+    def test_dehydrate_hook(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertNoNPlusOneQueries(self.get_list(HookNoteResource()), self.populate)
+
+        self.assertIn('  HookNoteResource.dehydrate_title: 2 queries, then 4, like: SELECT', str(cm.exception))
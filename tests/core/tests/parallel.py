@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.http import HttpRequest
+from django.test import SimpleTestCase, TestCase
+
+from tastypie import fields
+from tastypie.parallel import get_executor, split
+from tastypie.resources import ModelResource, Resource
+
+from core.models import Note
+
+
+class Point(object):
+    def __init__(self, pk=None, x=0, y=0):
+        self.pk = pk
+        self.x = x
+        self.y = y
+
+
+POINTS = [Point(pk, pk * 1.5, pk * -2) for pk in range(1, 21)]
+
+
+class PointResource(Resource):
+    id = fields.IntegerField(attribute='pk')
+    x = fields.FloatField(attribute='x')
+    y = fields.FloatField(attribute='y')
+    distance = fields.FloatField()
+    worker = fields.CharField()
+
+    class Meta:
+        resource_name = 'points'
+        object_class = Point
+        include_resource_uri = False
+        limit = 0
+
+    def get_object_list(self, request):
+        return POINTS
+
+    def obj_get_list(self, bundle, **kwargs):
+        return self.get_object_list(bundle.request)
+
+    def dehydrate_distance(self, bundle):
+        return round((bundle.obj.x ** 2 + bundle.obj.y ** 2) ** 0.5, 3)
+
+    def dehydrate_worker(self, bundle):
+        return '%s:%s' % (os.getpid(), threading.get_ident())
+
+
+class ThreadedPointResource(PointResource):
+    class Meta(PointResource.Meta):
+        dehydrate_workers = 4
+
+
+class AlteredPointResource(ThreadedPointResource):
+    def alter_list_data_to_serialize(self, request, data):
+        for bundle in data['objects']:
+            bundle.data['far'] = bundle.data['distance'] > 10
+            bundle.data['worker'] = bundle.__class__.__name__
+
+        return data
+
+
+class ProcessPointResource(PointResource):
+    class Meta(PointResource.Meta):
+        dehydrate_workers = 2
+        dehydrate_pool = 'process'
+
+
+class ThreadedNoteResource(ModelResource):
+    worker = fields.CharField()
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'notes'
+        dehydrate_workers = 4
+
+    def dehydrate_worker(self, bundle):
+        return str(threading.get_ident())
+
+
+def get_objects(resource):
+    request = HttpRequest()
+    request.method = 'GET'
+    resp = resource.wrap_view('dispatch_list')(request)
+    return resp, json.loads(resp.content.decode('utf-8'))['objects']
+
+
+class ParallelDehydrationTestCase(SimpleTestCase):
+    def strip_worker(self, objects):
+        return [dict(obj, worker=None) for obj in objects]
+
+    def test_split(self):
+        self.assertEqual(split(list(range(7)), 3), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(split([1], 4), [[1]])
+
+    def test_get_executor(self):
+        self.assertIs(get_executor('thread', 3), get_executor('thread', 3))
+        self.assertRaises(ImproperlyConfigured, get_executor, 'fibers', 3)
+
+    def test_threads(self):
+        serial = get_objects(PointResource())[1]
+        resp, threaded = get_objects(ThreadedPointResource())
+        self.assertEqual(resp.status_code, 200)
+
+        # Same data, same order.
+        self.assertEqual(self.strip_worker(threaded), self.strip_worker(serial))
+        self.assertEqual([obj['id'] for obj in threaded], list(range(1, 21)))
+
+        main = '%s:%s' % (os.getpid(), threading.get_ident())
+        self.assertEqual(set(obj['worker'] for obj in serial), {main})
+        self.assertNotIn(main, set(obj['worker'] for obj in threaded))
+
+    def test_processes(self):
+        serial = get_objects(PointResource())[1]
+        forked = get_objects(ProcessPointResource())[1]
+        self.assertEqual(self.strip_worker(forked), self.strip_worker(serial))
+        self.assertNotIn(str(os.getpid()), set(obj['worker'].split(':')[0] for obj in forked))
+
+    def test_alter_list_data_to_serialize(self):
+        # The override still gets bundles, so isn't given simple types.
+        resp, objects = get_objects(AlteredPointResource())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(set(obj['worker'] for obj in objects), {'Bundle'})
+        self.assertEqual([obj['far'] for obj in objects[:5]], [False, False, False, False, True])
+
+    def test_unsimplified_formats(self):
+        resource = ThreadedPointResource()
+        serial = PointResource().wrap_view('dispatch_list')
+        request = HttpRequest()
+        request.method = 'GET'
+        request.META['HTTP_ACCEPT'] = 'application/xml'
+
+        with mock.patch.object(PointResource, 'dehydrate_worker', lambda self, bundle: None):
+            self.assertEqual(resource.wrap_view('dispatch_list')(request).content, serial(request).content)
+
+
+class ModelParallelDehydrationTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def test_turned_off(self):
+        resource = ThreadedNoteResource()
+
+        # Both in a transaction & an in-memory database.
+        self.assertFalse(resource.can_dehydrate_in_parallel())
+
+        objects = get_objects(resource)[1]
+        self.assertEqual(set(obj['worker'] for obj in objects), {str(threading.get_ident())})
+
+        with mock.patch.object(connection, 'in_atomic_block', False), mock.patch.object(connection, 'is_in_memory_db', lambda: False):
+            self.assertTrue(resource.can_dehydrate_in_parallel())
+
+            with mock.patch.object(resource._meta, 'dehydrate_pool', 'process'):
+                self.assertFalse(resource.can_dehydrate_in_parallel())
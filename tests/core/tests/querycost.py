@@ -0,0 +1,137 @@
+import json
+
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from tastypie.authorization import Authorization
+from tastypie.exceptions import QueryTooExpensive
+from tastypie.querycost import FORBIDDEN, QueryCostGuard
+from tastypie.resources import ModelResource
+
+from core.models import Note
+
+
+class GuardedNoteResource(ModelResource):
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'guardednotes'
+        authorization = Authorization()
+        filtering = {
+            'title': ['exact', 'icontains'],
+            'slug': ['exact', 'icontains'],
+            'content': ['icontains'],
+        }
+        ordering = ['title', 'slug']
+        query_cost = QueryCostGuard()
+
+
+class QueryCostGuardTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def test_resolve_path(self):
+        guard = QueryCostGuard()
+        title = Note._meta.get_field('title')
+        username = User._meta.get_field('username')
+        self.assertEqual(guard.resolve_path(Note, 'title'), (title, 0, 'exact'))
+        self.assertEqual(guard.resolve_path(Note, 'title__icontains'), (title, 0, 'icontains'))
+        self.assertEqual(guard.resolve_path(Note, 'created__year__gt'), (Note._meta.get_field('created'), 0, 'gt'))
+        self.assertEqual(guard.resolve_path(Note, 'author__username__startswith'), (username, 1, 'startswith'))
+        self.assertEqual(guard.resolve_path(Note, 'author__in'), (Note._meta.get_field('author'), 0, 'in'))
+        self.assertEqual(guard.resolve_path(Note, 'pk'), (Note._meta.pk, 0, 'exact'))
+        self.assertEqual(guard.resolve_path(Note, 'nope__exact'), (None, 0, 'exact'))
+
+    def test_is_indexed(self):
+        guard = QueryCostGuard()
+        self.assertTrue(guard.is_indexed(Note._meta.get_field('id')))
+        self.assertTrue(guard.is_indexed(Note._meta.get_field('slug')))
+        self.assertTrue(guard.is_indexed(Note._meta.get_field('author')))
+        self.assertTrue(guard.is_indexed(User._meta.get_field('username')))
+        self.assertFalse(guard.is_indexed(Note._meta.get_field('title')))
+        self.assertFalse(guard.is_indexed(None))
+
+    def test_check_filters(self):
+        guard = QueryCostGuard()
+        resource = GuardedNoteResource()
+
+        with self.assertRaises(QueryTooExpensive) as cm:
+            guard.check_filters(resource, {'content__icontains': 'a'})
+
+        self.assertEqual(str(cm.exception), "Filtering with 'content__icontains' is too expensive on its own, as the field isn't indexed. Narrow the query with a filter on an indexed field as well.")
+
+        # Unindexed, but cheap.
+        guard.check_filters(resource, {'title__exact': 'a'})
+        # Indexed.
+        guard.check_filters(resource, {'slug__icontains': 'a'})
+        # Narrowed by an indexed filter.
+        guard.check_filters(resource, {'content__icontains': 'a', 'author__exact': 1})
+        self.assertRaises(QueryTooExpensive, guard.check_filters, resource, {'content__icontains': 'a', 'slug__icontains': 'a'})
+
+        guard = QueryCostGuard(lookup_costs={'regex': FORBIDDEN}, max_relation_depth=0)
+        guard.check_filters(resource, {'content__icontains': 'a'})
+        self.assertRaises(QueryTooExpensive, guard.check_filters, resource, {'slug__regex': 'a'})
+
+        with self.assertRaises(QueryTooExpensive) as cm:
+            guard.check_filters(resource, {'author__username__exact': 'a'})
+
+        self.assertEqual(str(cm.exception), "'author__username__exact' follows too many relations. No more than 0 may be followed.")
+
+    def test_check_ordering(self):
+        guard = QueryCostGuard()
+        resource = GuardedNoteResource()
+        guard.check_ordering(resource, ['-slug', 'author__username'])
+
+        with self.assertRaises(QueryTooExpensive) as cm:
+            guard.check_ordering(resource, ['-title'])
+
+        self.assertEqual(str(cm.exception), "Ordering by 'title' is not allowed, as the field isn't indexed.")
+
+        QueryCostGuard(allow_unindexed_ordering=True).check_ordering(resource, ['-title'])
+        self.assertRaises(QueryTooExpensive, QueryCostGuard(max_relation_depth=0).check_ordering, resource, ['author__username'])
+
+    def test_get_list(self):
+        resource = GuardedNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        request.GET = {'content__icontains': 'post'}
+        resp = resource.wrap_view('dispatch_list')(request)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(json.loads(resp.content.decode('utf-8')), {'error': "Filtering with 'content__icontains' is too expensive on its own, as the field isn't indexed. Narrow the query with a filter on an indexed field as well."})
+
+        request.GET = {'order_by': 'title'}
+        resp = resource.wrap_view('dispatch_list')(request)
+        self.assertEqual(resp.status_code, 400)
+
+        request.GET = {'slug__icontains': 'post', 'order_by': '-slug'}
+        resp = resource.wrap_view('dispatch_list')(request)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_explain(self):
+        guard = QueryCostGuard(allow_table_scans=False)
+        resource = GuardedNoteResource()
+
+        # Off by default.
+        with self.assertNumQueries(0):
+            guard.check_query(resource, Note.objects.filter(title='a'))
+
+        with override_settings(TASTYPIE_EXPLAIN_QUERIES=True):
+            guard.check_query(resource, Note.objects.filter(pk__in=[1, 2]))
+
+            with self.assertRaises(QueryTooExpensive) as cm:
+                guard.check_query(resource, Note.objects.filter(title='a'))
+
+        self.assertEqual(str(cm.exception), "The query would scan the whole 'core_note' table. Narrow the query with a filter on an indexed field.")
+
+    def test_plan_parsing(self):
+        guard = QueryCostGuard()
+        plan = "Sort  (cost=64.73..66.53 rows=720 width=72)\n  ->  Seq Scan on core_note  (cost=0.00..30.70 rows=720 width=72)"
+        self.assertEqual(guard.get_plan_cost(plan), 66.53)
+        self.assertEqual(guard.get_plan_scans(plan), ['core_note'])
+        self.assertEqual(guard.get_plan_cost('3 0 0 SCAN core_note'), None)
+        self.assertEqual(guard.get_plan_scans('3 0 0 SCAN core_note\n6 0 0 SCAN auth_user USING INDEX foo'), ['core_note'])
+
+        guard = QueryCostGuard(explain=True, max_cost=50)
+        guard.get_plan_cost = lambda plan: 66.53
+        self.assertRaises(QueryTooExpensive, guard.check_query, GuardedNoteResource(), Note.objects.all())
@@ -16,19 +16,20 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.exceptions import FieldError, MultipleObjectsReturned, ObjectDoesNotExist, ImproperlyConfigured
 from django.core import mail
+from django.db import connection
 from time import mktime
 try:
     from django.urls import reverse
 except ImportError:
     from django.core.urlresolvers import reverse
-from django.http import HttpRequest, QueryDict, Http404
+from django.http import HttpRequest, HttpResponse, QueryDict, Http404
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from tastypie.compat import timezone
 
 from tastypie.authentication import BasicAuthentication
-from tastypie.authorization import Authorization
+from tastypie.authorization import Authorization, ReadOnlyAuthorization
 from tastypie.bundle import Bundle
 from tastypie.exceptions import (
     InvalidFilterError, InvalidSortError, ImmediateHttpResponse, BadRequest,
@@ -37,6 +38,7 @@ from tastypie.exceptions import (
 )
 from tastypie import fields, http
 from tastypie.compat import force_str
+from tastypie.filterexpressions import parse_filter_expression
 from tastypie.paginator import Paginator
 from tastypie.resources import (
     ALL, ALL_WITH_RELATIONS, convert_post_to_put, convert_post_to_patch,
@@ -373,6 +375,54 @@ class ResourceTestCase(TestCase):
         # Note - automatic resource naming.
         self.assertEqual(nouri._meta.resource_name, 'nouribasic')
 
+    def test_fields_shared(self):
+        basic = BasicResource()
+        other = BasicResource()
+
+        # The fields are shared until they're looked up, but not the table.
+        self.assertIs(dict(basic.fields.items())['name'], BasicResource.base_fields['name'])
+        self.assertIs(dict(other.fields.items())['name'], BasicResource.base_fields['name'])
+        self.assertIsNot(basic.fields, other.fields)
+
+        del basic.fields['view_count']
+        self.assertNotIn('view_count', basic.fields)
+        self.assertIn('view_count', other.fields)
+
+        # Looking a field up gives the instance its own copy, once.
+        name = basic.fields['name']
+        self.assertIsNot(name, BasicResource.base_fields['name'])
+        self.assertIs(basic.fields['name'], name)
+        self.assertIs(basic.fields.get('name'), name)
+        self.assertIs(basic.name, name)
+        self.assertEqual(name.instance_name, 'name')
+
+        # So changing it in place doesn't leak to other instances.
+        class ReadOnlyNameResource(BasicResource):
+            def __init__(self, *args, **kwargs):
+                super(ReadOnlyNameResource, self).__init__(*args, **kwargs)
+                self.fields['name'].readonly = True
+
+        self.assertTrue(ReadOnlyNameResource().fields['name'].readonly)
+        self.assertFalse(ReadOnlyNameResource.base_fields['name'].readonly)
+        self.assertFalse(BasicResource().fields['name'].readonly)
+
+        # Related fields take their names from the resource they belong to.
+        detailed = DetailedNoteResource()
+        self.assertEqual(detailed.fields['user'].api_name, detailed._meta.api_name)
+        self.assertEqual(detailed.fields['user'].resource_name, 'detailednotes')
+
+    def test_lazy_defaults(self):
+        # Created when first used, then shared.
+        self.assertTrue(isinstance(BasicResource._meta.serializer, Serializer))
+        self.assertIs(BasicResource._meta.serializer, AnotherBasicResource._meta.serializer)
+        self.assertIs(BasicResource._meta.throttle, AnotherBasicResource._meta.throttle)
+
+        class DefaultResource(Resource):
+            pass
+
+        self.assertTrue(isinstance(DefaultResource._meta.authorization, ReadOnlyAuthorization))
+        self.assertIs(DefaultResource._meta.authorization.resource_meta, DefaultResource._meta)
+
     def test_inheritance(self):
         mrofr = MROFieldResource()
         self.assertEqual(len(mrofr.fields), 3)
@@ -1496,6 +1546,37 @@ class MyContainerModelResource(ModelResource):
         always_return_data = True
 
 
+class SparseUserResource(ModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'sparseusers'
+        fields = ['id', 'username', 'email', 'first_name']
+        sparse_fields = ['id', 'username', 'email']
+
+
+class SparseSubjectResource(SubjectResource):
+    class Meta(SubjectResource.Meta):
+        resource_name = 'sparsesubjects'
+        sparse_fields = ['name']
+
+
+class SparseNoteResource(ModelResource):
+    author = fields.ForeignKey(SparseUserResource, 'author', full=True, null=True)
+    subjects = fields.ManyToManyField(SparseSubjectResource, 'subjects', full=True)
+
+    class Meta:
+        queryset = Note.objects.filter(is_active=True).select_related('author').prefetch_related('subjects')
+        resource_name = 'sparsenotes'
+        sparse_fields = ALL
+        authorization = Authorization()
+
+    def get_resource_uri(self, bundle_or_obj=None, url_name='api_dispatch_list'):
+        if bundle_or_obj is None:
+            return '/api/v1/sparsenotes/'
+
+        return '/api/v1/sparsenotes/%s/' % bundle_or_obj.obj.id
+
+
 @override_settings(ROOT_URLCONF='core.tests.resource_urls')
 class ModelResourceTestCase(TestCase):
     fixtures = ['note_testdata.json']
@@ -2198,6 +2279,38 @@ class ModelResourceTestCase(TestCase):
         # Make sure that fields that don't have attributes can't be filtered on.
         self.assertRaises(InvalidFilterError, resource.build_filters, filters={'notes__hello_world': 'News'})
 
+    def test_build_filters_table(self):
+        resource = RelatedNoteResource()
+
+        with patch.object(RelatedNoteResource, 'check_filtering', autospec=True, side_effect=RelatedNoteResource.check_filtering) as check_filtering:
+            self.assertEqual(resource.build_filters(filters={'subjects__name__startswith': 'News'}), {'subjects__name__startswith': 'News'})
+            self.assertEqual(resource.build_filters(filters={'subjects__name__startswith': 'Photos'}), {'subjects__name__startswith': 'Photos'})
+
+        self.assertEqual(check_filtering.call_count, 1)
+        self.assertEqual(resource.get_filter_table(), {'subjects__name__startswith': ('subjects', 'startswith', 'subjects__name__startswith')})
+
+        # Bad filters are checked every time, with the same message.
+        for i in range(2):
+            with self.assertRaises(InvalidFilterError) as cm:
+                resource.build_filters(filters={'author__username__startswith': 'j'})
+
+            self.assertEqual(str(cm.exception), "Lookups are not allowed more than one level deep on the 'author' field.")
+
+        self.assertEqual(resource.build_filters(filters={'author__username__startswith': 'j'}, ignore_bad_filters=True), {})
+        self.assertEqual(len(resource.get_filter_table()), 1)
+
+        # Replacing the filtering starts over.
+        resource._meta.filtering = dict(resource._meta.filtering, subjects=['exact'])
+
+        try:
+            self.assertEqual(resource.get_filter_table(), {})
+            self.assertRaises(InvalidFilterError, resource.build_filters, filters={'subjects__name__startswith': 'News'})
+        finally:
+            del resource._meta.filtering
+
+        resource.clear_filter_table()
+        self.assertEqual(resource.get_filter_table(), {})
+
     def test_custom_build_filters(self):
         """
         A test derived from an example in the documentation (under Advanced Filtering).
@@ -3904,6 +4017,71 @@ class ModelResourceTestCase(TestCase):
 
         self.assertEqual(schema, expected_schema)
 
+    def test_get_schema_cached(self):
+        resource = NoteResource()
+        request = HttpRequest()
+        request.GET = {'format': 'json'}
+        request.method = 'GET'
+
+        with patch.object(resource, 'build_schema', wraps=resource.build_schema) as build_schema:
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 200)
+            etag = resp['ETag']
+            self.assertTrue(etag.startswith('"'))
+
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp['ETag'], etag)
+            self.assertEqual(build_schema.call_count, 1)
+
+            request.META['HTTP_IF_NONE_MATCH'] = etag
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp['ETag'], etag)
+            self.assertEqual(resp.content, b'')
+
+            request.META['HTTP_IF_NONE_MATCH'] = '"stale"'
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 200)
+
+            # Each format is cached separately.
+            request.GET = {'format': 'xml'}
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp['ETag'], etag)
+            self.assertEqual(build_schema.call_count, 2)
+
+            resource.clear_schema_cache()
+            request.GET = {'format': 'json'}
+            resource.get_schema(request)
+            self.assertEqual(build_schema.call_count, 3)
+
+    def test_get_schema_create_response(self):
+        class HeaderNoteResource(NoteResource):
+            def create_response(self, request, data, response_class=HttpResponse, **response_kwargs):
+                data['extra'] = True
+                response = super(HeaderNoteResource, self).create_response(request, data, response_class=response_class, **response_kwargs)
+                response['X-Schema'] = 'yes'
+                return response
+
+        resource = HeaderNoteResource()
+        request = HttpRequest()
+        request.GET = {'format': 'json'}
+        request.method = 'GET'
+
+        with patch.object(resource, 'build_schema', wraps=resource.build_schema) as build_schema:
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp['X-Schema'], 'yes')
+            self.assertTrue(json.loads(resp.content.decode('utf-8'))['extra'])
+            etag = resp['ETag']
+
+            # Still built once & conditional.
+            request.META['HTTP_IF_NONE_MATCH'] = etag
+            resp = resource.get_schema(request)
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(build_schema.call_count, 1)
+
     def test_get_schema_with_related_resource_not_in_urls(self):
         """
         Test case for #1439. Need to handle schemas for related resources that
@@ -5193,6 +5371,606 @@ class ModelResourceTestCase(TestCase):
         self.assertEqual(resp.status_code, 200)
 
 
+class SparseFieldsetTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def setUp(self):
+        super(SparseFieldsetTestCase, self).setUp()
+        subject = Subject.objects.create(name='News', url='/news/')
+        Note.objects.get(pk=1).subjects.add(subject)
+        self.resource = SparseNoteResource()
+
+    def get_list(self, **params):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = params
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.resource.get_list(request)
+
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content.decode('utf-8'))['objects'], [query['sql'] for query in queries]
+
+    def test_unselected(self):
+        objects, queries = self.get_list()
+        self.assertEqual(sorted(objects[0].keys()), ['author', 'content', 'created', 'id', 'is_active', 'resource_uri', 'slug', 'subjects', 'title', 'updated'])
+        self.assertEqual(sorted(objects[0]['author'].keys()), ['email', 'first_name', 'id', 'resource_uri', 'username'])
+
+    def test_fields(self):
+        objects, queries = self.get_list(fields='id,title')
+        self.assertEqual(len(objects), 4)
+        self.assertEqual(objects[0], {'id': 1, 'title': 'First Post!'})
+
+        # Just the count & the notes, with no join, prefetch or unused columns.
+        self.assertEqual(len(queries), 2)
+        self.assertFalse('JOIN' in queries[1])
+        self.assertFalse('"content"' in queries[1])
+
+    def test_fields_nested(self):
+        objects, queries = self.get_list(fields='title,author.username,subjects.name')
+        self.assertEqual(objects[0], {
+            'title': 'First Post!',
+            'author': {'username': 'johndoe'},
+            'subjects': [{'name': 'News'}],
+        })
+        self.assertEqual(len(queries), 3)
+        self.assertTrue('JOIN' in queries[1])
+        self.assertFalse('"content"' in queries[1])
+
+        objects, queries = self.get_list(fields='title,author')
+        self.assertEqual(sorted(objects[0]['author'].keys()), ['email', 'first_name', 'id', 'resource_uri', 'username'])
+
+    def test_exclude(self):
+        objects, queries = self.get_list(exclude='content,subjects,author.email')
+        self.assertEqual(sorted(objects[0].keys()), ['author', 'created', 'id', 'is_active', 'resource_uri', 'slug', 'title', 'updated'])
+        self.assertEqual(sorted(objects[0]['author'].keys()), ['first_name', 'id', 'resource_uri', 'username'])
+        self.assertEqual(len(queries), 2)
+        self.assertFalse('"content"' in queries[1].split('FROM')[0])
+
+    def test_fields_and_exclude(self):
+        objects, queries = self.get_list(fields='title,author', exclude='author.email,author.id')
+        self.assertEqual(objects[0], {'title': 'First Post!', 'author': {'first_name': '', 'resource_uri': '', 'username': 'johndoe'}})
+
+    def test_detail(self):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = {'fields': 'title,subjects.name'}
+        resp = self.resource.get_detail(request, pk=1)
+        self.assertEqual(json.loads(resp.content.decode('utf-8')), {'title': 'First Post!', 'subjects': [{'name': 'News'}]})
+
+    def test_not_allowed(self):
+        request = HttpRequest()
+        request.method = 'GET'
+
+        for value in ('nope', 'author.first_name', 'title.foo', 'author..username'):
+            request.GET = {'fields': value}
+            self.assertRaises(BadRequest, self.resource.get_list, request)
+
+        request.GET = {'exclude': 'author.first_name'}
+        self.assertRaises(BadRequest, self.resource.get_list, request)
+
+    def test_dehydrate_hooks(self):
+        class HookedNoteResource(SparseNoteResource):
+            summary = fields.CharField(attribute='title')
+
+            def dehydrate_summary(self, bundle):
+                return '%s: %s' % (bundle.data['summary'], bundle.obj.content[:4])
+
+        self.resource = HookedNoteResource()
+        objects, queries = self.get_list(fields='id,summary')
+        self.assertEqual(objects[0], {'id': 1, 'summary': 'First Post!: This'})
+        # The hook reads ``content``, so it isn't deferred (which would cost
+        # a query per note). Nor are the related lookups dropped.
+        self.assertEqual(len(queries), 3)
+        self.assertTrue('"content"' in queries[1])
+
+        class DehydratingNoteResource(SparseNoteResource):
+            def dehydrate(self, bundle):
+                bundle.data['length'] = len(bundle.obj.content)
+                return bundle
+
+        self.resource = DehydratingNoteResource()
+        objects, queries = self.get_list(exclude='content,subjects,author')
+        self.assertEqual(objects[0]['length'], len(Note.objects.get(pk=1).content))
+        self.assertEqual(len(queries), 3)
+        self.assertTrue('"content"' in queries[1])
+
+    def test_not_enabled(self):
+        resource = NoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = {'fields': 'title'}
+        resp = resource.get_list(request)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertTrue('content' in data['objects'][0])
+
+
+class DehydrationMemoTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def get_list(self, resource, request):
+        resp = resource.get_list(request)
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content.decode('utf-8'))['objects']
+
+    def test_related_dehydrated_once(self):
+        resource = SparseNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with patch.object(SparseUserResource, 'full_dehydrate', autospec=True, side_effect=SparseUserResource.full_dehydrate) as full_dehydrate:
+            objects = self.get_list(resource, request)
+
+        # Four notes, by two authors.
+        self.assertEqual([note['author']['username'] for note in objects], ['johndoe', 'johndoe', 'janedoe', 'janedoe'])
+        self.assertEqual(full_dehydrate.call_count, 2)
+
+        # A fresh memo per response.
+        User.objects.filter(pk=1).update(username='johnny')
+        objects = self.get_list(resource, request)
+        self.assertEqual(objects[0]['author']['username'], 'johnny')
+
+    def test_changed_per_parent(self):
+        class FlaggingNoteResource(SparseNoteResource):
+            def dehydrate(self, bundle):
+                # Only changes this note's copy of the author.
+                if bundle.obj.pk == 1:
+                    bundle.data['author'].data['username'] = 'first'
+
+                return bundle
+
+        resource = FlaggingNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with patch.object(SparseUserResource, 'full_dehydrate', autospec=True, side_effect=SparseUserResource.full_dehydrate) as full_dehydrate:
+            objects = self.get_list(resource, request)
+
+        self.assertEqual([note['author']['username'] for note in objects], ['first', 'johndoe', 'janedoe', 'janedoe'])
+        self.assertEqual(full_dehydrate.call_count, 2)
+
+    def test_opt_out(self):
+        class UnmemoizedNoteResource(SparseNoteResource):
+            author = fields.ForeignKey(SparseUserResource, 'author', full=True, null=True, memoize=False)
+
+            class Meta(SparseNoteResource.Meta):
+                pass
+
+        resource = UnmemoizedNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with patch.object(SparseUserResource, 'full_dehydrate', autospec=True, side_effect=SparseUserResource.full_dehydrate) as full_dehydrate:
+            self.get_list(resource, request)
+
+        self.assertEqual(full_dehydrate.call_count, 4)
+
+    def test_not_memoized_outside_get_views(self):
+        resource = SparseNoteResource()
+        request = HttpRequest()
+        note = Note.objects.get(pk=1)
+
+        with patch.object(SparseUserResource, 'full_dehydrate', autospec=True, side_effect=SparseUserResource.full_dehydrate) as full_dehydrate:
+            resource.full_dehydrate(resource.build_bundle(obj=note, request=request))
+            resource.full_dehydrate(resource.build_bundle(obj=note, request=request))
+
+        self.assertEqual(full_dehydrate.call_count, 2)
+
+
+class BatchedNoteResource(ModelResource):
+    subjects = fields.ManyToManyField(SparseSubjectResource, 'subjects', full=True)
+
+    class Meta:
+        queryset = Note.objects.filter(is_active=True)
+        resource_name = 'batchednotes'
+        fields = ['title']
+        authorization = Authorization()
+
+    def get_resource_uri(self, bundle_or_obj=None, url_name='api_dispatch_list'):
+        return ''
+
+
+class DehydrateManyTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def setUp(self):
+        super(DehydrateManyTestCase, self).setUp()
+        news = Subject.objects.create(name='News', url='/news/')
+        photos = Subject.objects.create(name='Photos', url='/photos/')
+        Note.objects.get(pk=1).subjects.add(news, photos)
+        Note.objects.get(pk=4).subjects.add(photos)
+
+    def get_list(self, resource):
+        request = HttpRequest()
+        request.method = 'GET'
+        resp = resource.get_list(request)
+        self.assertEqual(resp.status_code, 200)
+        return [[subject['name'] for subject in note['subjects']] for note in json.loads(resp.content.decode('utf-8'))['objects']]
+
+    def test_one_query_per_page(self):
+        # The count, the notes & every note's subjects.
+        with self.assertNumQueries(3):
+            subjects = self.get_list(BatchedNoteResource())
+
+        self.assertEqual(subjects, [['News', 'Photos'], [], ['Photos'], []])
+
+    def test_callable_attribute_falls_back(self):
+        class CallableNoteResource(BatchedNoteResource):
+            subjects = fields.ManyToManyField(SparseSubjectResource, attribute=lambda bundle: bundle.obj.subjects.all(), full=True)
+
+            class Meta(BatchedNoteResource.Meta):
+                pass
+
+        with self.assertNumQueries(6):
+            subjects = self.get_list(CallableNoteResource())
+
+        self.assertEqual(subjects, [['News', 'Photos'], [], ['Photos'], []])
+
+    def test_dehydrate_many_unsaved(self):
+        field = fields.ToManyField(SubjectResource, 'subjects')
+        self.assertEqual(field.dehydrate_many([Bundle(obj=Note())]), None)
+        self.assertEqual(field.dehydrate_many([]), [])
+
+
+class ColumnNoteResource(ModelResource):
+    flag = fields.BooleanField(default=True)
+
+    class Meta:
+        queryset = Note.objects.filter(is_active=True).order_by('pk')
+        resource_name = 'columnnotes'
+        excludes = ['resource_uri']
+        include_resource_uri = False
+        authorization = Authorization()
+        column_dehydration = True
+
+
+class ColumnUserResource(ModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'users'
+        fields = ['id', 'username']
+
+
+class ColumnUriNoteResource(ModelResource):
+    author = fields.ForeignKey(ColumnUserResource, 'author', null=True)
+
+    class Meta:
+        queryset = Note.objects.filter(is_active=True).order_by('pk')
+        resource_name = 'notes'
+        api_name = 'v1'
+        fields = ['title', 'author']
+
+
+class ColumnDehydrationTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def get_list(self, resource, **params):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = params
+        resp = resource.get_list(request)
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content.decode('utf-8'))
+
+    def test_get_column_plan(self):
+        resource = ColumnNoteResource()
+        plan = resource.get_column_plan(resource.get_object_list(None))
+        self.assertEqual([(name, column) for name, field, column, uri_resource in plan], [
+            ('flag', None),
+            ('id', 'id'),
+            ('title', 'title'),
+            ('slug', 'slug'),
+            ('content', 'content'),
+            ('is_active', 'is_active'),
+            ('created', 'created'),
+            ('updated', 'updated'),
+        ])
+
+        # Only querysets are handled.
+        self.assertEqual(resource.get_column_plan(list(resource.get_object_list(None))), None)
+
+    def test_same_output(self):
+        class RowNoteResource(ColumnNoteResource):
+            class Meta(ColumnNoteResource.Meta):
+                column_dehydration = False
+
+        with self.assertNumQueries(2):
+            columns = self.get_list(ColumnNoteResource())
+
+        self.assertEqual(columns, self.get_list(RowNoteResource()))
+        self.assertEqual([note['id'] for note in columns['objects']], [1, 2, 4, 6])
+        self.assertEqual(columns['objects'][0]['flag'], True)
+        self.assertEqual(columns['objects'][0]['created'], '2010-03-30T20:05:00')
+
+        self.assertEqual(
+            self.get_list(ColumnNoteResource(), limit='2', offset='1'),
+            self.get_list(RowNoteResource(), limit='2', offset='1'),
+        )
+
+    def test_detected(self):
+        self.assertTrue(ColumnUserResource._meta.column_dehydration)
+        self.assertTrue(ColumnUriNoteResource._meta.column_dehydration)
+        # ``absolute_url`` calls a model method.
+        self.assertFalse(NoteResource._meta.column_dehydration)
+
+        class OptOutNoteResource(ColumnUriNoteResource):
+            class Meta(ColumnUriNoteResource.Meta):
+                column_dehydration = False
+
+        resource = OptOutNoteResource()
+        self.assertEqual(resource.get_column_plan(resource.get_object_list(None)), None)
+
+    def test_build_bundle_overridden(self):
+        class TaggedBundleResource(ModelResource):
+            def build_bundle(self, obj=None, data=None, request=None, objects_saved=None, via_uri=None):
+                bundle = super(TaggedBundleResource, self).build_bundle(obj=obj, data=data, request=request, objects_saved=objects_saved, via_uri=via_uri)
+                bundle.data['tag'] = 'built'
+                return bundle
+
+        # Overridden on a base class, so the bundles still need building.
+        class TaggedNoteResource(TaggedBundleResource):
+            class Meta:
+                queryset = Note.objects.filter(is_active=True).order_by('pk')
+                resource_name = 'notes'
+                fields = ['title']
+
+        self.assertFalse(TaggedNoteResource._meta.column_dehydration)
+        resource = TaggedNoteResource()
+        self.assertEqual(resource.get_column_plan(resource.get_object_list(None)), None)
+        self.assertEqual(self.get_list(resource)['objects'][0]['tag'], 'built')
+
+    def test_uris(self):
+        class RowUriNoteResource(ColumnUriNoteResource):
+            class Meta(ColumnUriNoteResource.Meta):
+                column_dehydration = False
+
+        Note.objects.filter(pk=4).update(author=None)
+        resource = ColumnUriNoteResource()
+        plan = resource.get_column_plan(resource.get_object_list(None))
+        self.assertEqual([(name, column) for name, field, column, uri_resource in plan], [
+            ('resource_uri', 'id'),
+            ('author', 'author_id'),
+            ('title', 'title'),
+        ])
+
+        with self.assertNumQueries(2):
+            columns = self.get_list(resource)
+
+        self.assertEqual(columns, self.get_list(RowUriNoteResource()))
+        self.assertEqual(columns['objects'][:3], [
+            {'resource_uri': '/api/v1/notes/1/', 'author': '/api/v1/users/1/', 'title': 'First Post!'},
+            {'resource_uri': '/api/v1/notes/2/', 'author': '/api/v1/users/1/', 'title': 'Another Post'},
+            {'resource_uri': '/api/v1/notes/4/', 'author': None, 'title': 'Recent Volcanic Activity.'},
+        ])
+
+    def test_get_resource_uris(self):
+        resource = ColumnUserResource(api_name='v1')
+        self.assertEqual(resource.get_resource_uris([3, 1, 12]), ['/api/v1/users/3/', '/api/v1/users/1/', '/api/v1/users/12/'])
+        self.assertEqual(resource.get_resource_uris(['a']), ['/api/v1/users/a/'])
+        self.assertEqual(resource.get_resource_uris([]), [])
+
+    def test_ineligible_falls_back(self):
+        class HookNoteResource(ColumnNoteResource):
+            class Meta(ColumnNoteResource.Meta):
+                pass
+
+            def dehydrate_title(self, bundle):
+                return bundle.obj.title.upper()
+
+        class MethodNoteResource(ColumnNoteResource):
+            title = fields.CharField(attribute=lambda bundle: bundle.obj.title.upper())
+
+            class Meta(ColumnNoteResource.Meta):
+                pass
+
+        class AuthorNoteResource(ColumnNoteResource):
+            author = fields.ForeignKey(UserResource, 'author', null=True)
+
+            class Meta(ColumnNoteResource.Meta):
+                pass
+
+        for resource_class in (HookNoteResource, MethodNoteResource, AuthorNoteResource):
+            resource = resource_class()
+            self.assertEqual(resource.get_column_plan(resource.get_object_list(None)), None)
+
+        self.assertEqual(self.get_list(HookNoteResource())['objects'][0]['title'], 'FIRST POST!')
+
+    def test_empty_value(self):
+        class RequiredNoteResource(ColumnNoteResource):
+            author = fields.IntegerField(attribute='author_id')
+
+            class Meta(ColumnNoteResource.Meta):
+                pass
+
+        Note.objects.filter(pk=1).update(author=None)
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with self.assertRaises(fields.ApiFieldError):
+            RequiredNoteResource().get_list(request)
+
+    def test_convert_column(self):
+        self.assertEqual(fields.IntegerField().convert_column([1, '2', None]), [1, 2, None])
+        self.assertEqual(fields.BooleanField().convert_column([True, 0]), [True, False])
+
+        class UpperField(fields.CharField):
+            def convert(self, value):
+                return value.upper()
+
+        self.assertEqual(UpperField().convert_column(['a', 'b']), ['A', 'B'])
+
+
+class CompoundFilterNoteResource(ModelResource):
+    class Meta:
+        queryset = Note.objects.all().order_by('pk')
+        resource_name = 'compoundnotes'
+        fields = ['id', 'title', 'slug', 'is_active', 'author']
+        filtering = {
+            'id': ['exact', 'in'],
+            'title': ['exact', 'startswith'],
+            'slug': ALL,
+            'is_active': ['exact'],
+        }
+        authorization = Authorization()
+        compound_filtering = True
+        max_filter_terms = 4
+        max_filter_depth = 2
+
+
+class CompoundFilterTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def get_ids(self, **params):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = QueryDict('', mutable=True)
+        request.GET.update(params)
+        resp = CompoundFilterNoteResource().wrap_view('dispatch_list')(request)
+        data = json.loads(resp.content.decode('utf-8'))
+
+        if resp.status_code != 200:
+            return resp.status_code, data['error']
+
+        return [note['id'] for note in data['objects']]
+
+    def test_parse_filter_expression(self):
+        self.assertEqual(parse_filter_expression('title:Hello'), ('term', 'title', 'Hello'))
+        self.assertEqual(parse_filter_expression('or(slug:a, not(title__startswith:"Re: (1), \\"x\\""))'), ('or', [
+            ('term', 'slug', 'a'),
+            ('not', [('term', 'title__startswith', 'Re: (1), "x"')]),
+        ]))
+        self.assertEqual(parse_filter_expression("and(id__in:'1,2',is_active:true)"), ('and', [
+            ('term', 'id__in', '1,2'),
+            ('term', 'is_active', 'true'),
+        ]))
+
+        for expression, message in (
+            ('', "Invalid filter expression at position 0: expected a filter or one of and, or, not."),
+            ('title', "Invalid filter expression at position 5: expected ':'."),
+            ('xor(title:a)', "Invalid filter expression at position 3: unknown operator 'xor'."),
+            ('or(title:a', "Invalid filter expression at position 10: expected ')'."),
+            ('not(title:a,slug:b)', "Invalid filter expression at position 19: 'not' takes a single filter."),
+            ('title:"a', "Invalid filter expression at position 8: unterminated quoted value."),
+            ('title:a)', "Invalid filter expression at position 7: unexpected ')'."),
+        ):
+            with self.assertRaises(InvalidFilterError) as cm:
+                parse_filter_expression(expression)
+
+            self.assertEqual(str(cm.exception), message)
+
+    def test_limits(self):
+        with self.assertRaises(InvalidFilterError) as cm:
+            parse_filter_expression('or(a:1,b:2,c:3)', max_terms=2)
+
+        self.assertEqual(str(cm.exception), "The filter expression has too many terms. No more than 2 are allowed.")
+
+        with self.assertRaises(InvalidFilterError) as cm:
+            parse_filter_expression('or(a:1,and(b:2,not(c:3)))', max_depth=2)
+
+        self.assertEqual(str(cm.exception), "The filter expression is nested too deeply. No more than 2 levels are allowed.")
+        self.assertEqual(self.get_ids(filter='or(id:1,id:2,id:3,id:4,id:5)'), (400, "The filter expression has too many terms. No more than 4 are allowed."))
+
+    def test_get_list(self):
+        self.assertEqual(self.get_ids(filter='or(slug:first-post,title__startswith:Recent)'), [1, 4])
+        self.assertEqual(self.get_ids(filter='not(is_active:true)'), [3, 5])
+        self.assertEqual(self.get_ids(filter='and(is_active:true,not(id__in:"1,2"))'), [4, 6])
+
+        # Combined with the plain filters, in one query.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get_ids(filter='or(slug:first-post,slug:hello-world)', is_active='true'), [1])
+
+    def test_same_rules(self):
+        self.assertEqual(self.get_ids(filter='or(id:1,title__endswith:x)'), (400, "'endswith' is not an allowed filter on the 'title' field."))
+        self.assertEqual(self.get_ids(filter='author:1'), (400, "The 'author' field does not allow filtering."))
+        self.assertEqual(self.get_ids(filter='content:x'), (400, "The 'content' field does not allow filtering."))
+
+    def test_disabled(self):
+        resource = NoteResource()
+        self.assertEqual(resource._meta.compound_filtering, False)
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = {'filter': 'bogus('}
+        self.assertEqual(resource.wrap_view('dispatch_list')(request).status_code, 200)
+
+
+class AggregateNoteResource(ModelResource):
+    author = fields.ForeignKey(ColumnUserResource, 'author', null=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'aggregatenotes'
+        api_name = 'v1'
+        fields = ['id', 'title', 'is_active', 'created', 'author']
+        filtering = {
+            'is_active': ['exact'],
+        }
+        authorization = Authorization()
+        aggregations = {
+            'id': ['count'],
+            'created': ['min', 'max'],
+        }
+        aggregate_group_by = ['author', 'is_active']
+
+
+class AggregateTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def get_aggregate(self, **params):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = QueryDict('', mutable=True)
+
+        for key, value in params.items():
+            request.GET.setlist(key, value if isinstance(value, list) else [value])
+
+        resp = AggregateNoteResource().wrap_view('get_aggregate')(request)
+        data = json.loads(resp.content.decode('utf-8'))
+
+        if resp.status_code != 200:
+            return resp.status_code, data['error']
+
+        return data['objects']
+
+    def test_urls(self):
+        names = [url.name for url in AggregateNoteResource().urls]
+        self.assertTrue(names.index('api_get_aggregate') < names.index('api_dispatch_detail'))
+        self.assertFalse('api_get_aggregate' in [url.name for url in NoteResource().urls])
+
+    def test_aggregate(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_aggregate(aggregate='id__count'), [{'id__count': 6}])
+
+        self.assertEqual(self.get_aggregate(aggregate='id__count', is_active='true'), [{'id__count': 4}])
+
+    def test_group_by(self):
+        Note.objects.filter(pk=6).update(author=None)
+
+        with self.assertNumQueries(1):
+            groups = self.get_aggregate(aggregate='id__count,created__max', group_by='author', is_active='true')
+
+        self.assertEqual(groups, [
+            {'author': None, 'id__count': 1, 'created__max': '2010-04-02T10:05:00'},
+            {'author': '/api/v1/users/1/', 'id__count': 2, 'created__max': '2010-03-31T20:05:00'},
+            {'author': '/api/v1/users/2/', 'id__count': 1, 'created__max': '2010-04-01T20:05:00'},
+        ])
+
+        groups = self.get_aggregate(aggregate='id__count', group_by=['author', 'is_active'])
+        self.assertEqual([(group['author'], group['is_active'], group['id__count']) for group in groups], [
+            (None, True, 1),
+            ('/api/v1/users/1/', False, 1),
+            ('/api/v1/users/1/', True, 2),
+            ('/api/v1/users/2/', False, 1),
+            ('/api/v1/users/2/', True, 1),
+        ])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.get_aggregate(), (400, "Please provide at least one 'aggregate', like 'id__count'."))
+        self.assertEqual(self.get_aggregate(aggregate='id'), (400, "Invalid aggregate 'id'. Please use the field name, '__' and one of avg, count, max, min, sum."))
+        self.assertEqual(self.get_aggregate(aggregate='title__count'), (400, "'count' is not an allowed aggregate on the 'title' field."))
+        self.assertEqual(self.get_aggregate(aggregate='id__sum'), (400, "'sum' is not an allowed aggregate on the 'id' field."))
+        self.assertEqual(self.get_aggregate(aggregate='id__count', group_by='title'), (400, "The 'title' field can not be used to group by."))
+
+
 class BasicAuthResourceTestCase(TestCase):
     fixtures = ['note_testdata.json']
 
@@ -5242,6 +6020,32 @@ class BasicAuthResourceTestCase(TestCase):
         resp = resource.dispatch_list(request)
         self.assertEqual(resp.status_code, 200)
 
+    def test_identifier_memoized_on_request(self):
+        resource = BasicAuthNoteResource()
+        request = HttpRequest()
+        request.GET = {'format': 'json'}
+        request.method = 'GET'
+
+        john_doe = User.objects.get(username='johndoe')
+        john_doe.set_password('pass')
+        john_doe.save()
+        request.META['HTTP_AUTHORIZATION'] = 'Basic %s' % base64.b64encode('johndoe:pass'.encode('utf-8')).decode('utf-8')
+
+        with patch.object(BasicAuthentication, 'get_identifier', autospec=True, return_value='johndoe') as mocked:
+            resp = resource.dispatch_list(request)
+            self.assertEqual(resp.status_code, 200)
+            # ``throttle_check`` & ``log_throttled_access`` share one lookup.
+            self.assertEqual(mocked.call_count, 1)
+
+            resp = resource.get_multiple(request, pk_list='1;2')
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(mocked.call_count, 2)
+
+        result = resource.get_authentication_result(request)
+        self.assertTrue(result.backend is resource._meta.authentication)
+        self.assertEqual(result.user, john_doe)
+        self.assertEqual(resource.get_identifier(request), 'johndoe')
+
 
 # Test out the 500 behavior.
 class YouFail(Exception):
@@ -0,0 +1,265 @@
+from contextvars import copy_context
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.http import HttpRequest
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from tastypie import fields
+from tastypie.authorization import Authorization
+from tastypie.resources import ModelResource
+from tastypie.timing import DehydrationProfiler, InMemoryMetricsSink, \
+    RequestTimer, get_dehydration_profiler, request_timed
+
+from core.models import Note, Subject
+
+
+User = get_user_model()
+
+
+class TimedNoteResource(ModelResource):
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'timednotes'
+        authorization = Authorization()
+        timing = True
+        metrics = InMemoryMetricsSink()
+
+
+class UntimedNoteResource(TimedNoteResource):
+    class Meta(TimedNoteResource.Meta):
+        timing = None
+
+
+class ProfiledUserResource(ModelResource):
+    class Meta:
+        queryset = User.objects.all()
+        resource_name = 'users'
+        fields = ['username']
+
+
+class ProfiledNoteResource(ModelResource):
+    author = fields.ToOneField(ProfiledUserResource, 'author', full=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'profilednotes'
+        authorization = Authorization()
+        fields = ['title', 'slug']
+        filtering = {'slug': ['exact']}
+
+    def dehydrate_slug(self, bundle):
+        return bundle.data['slug'].upper()
+
+
+class RequestTimerTestCase(TestCase):
+    def test_phases(self):
+        timer = RequestTimer()
+
+        with timer:
+            with timer.phase('query'):
+                list(Note.objects.all())
+
+            with timer.phase('query'):
+                list(Note.objects.all())
+
+        self.assertEqual(timer.queries, 2)
+        self.assertEqual(list(timer.phases), ['query'])
+        self.assertTrue(timer.duration >= timer.phases['query'] > 0)
+
+        timer.phases = {'serialize': 0.0012, 'query': 0.0034}
+        timer.duration = 0.005
+        self.assertEqual(timer.server_timing(), 'query;dur=3.40, serialize;dur=1.20, total;dur=5.00, queries;desc="2"')
+
+    def test_metrics_sink(self):
+        sink = InMemoryMetricsSink()
+        request = HttpRequest()
+        request.method = 'GET'
+        timer = RequestTimer()
+        timer.queries = 3
+        timer.duration = 0.5
+        timer.phases = {'query': 0.25}
+        sink.record(TimedNoteResource(), request, timer)
+        sink.record(TimedNoteResource(), request, timer)
+        self.assertEqual(sink.get_stats(), {
+            'timednotes GET': {'requests': 2, 'queries': 6, 'time': 1.0, 'phases': {'query': 0.5}},
+        })
+
+        sink.reset()
+        self.assertEqual(sink.get_stats(), {})
+
+
+class ResourceTimingTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def setUp(self):
+        super(ResourceTimingTestCase, self).setUp()
+        TimedNoteResource._meta.metrics.reset()
+
+    def get_list(self, resource):
+        request = HttpRequest()
+        request.method = 'GET'
+        return request, resource.wrap_view('dispatch_list')(request)
+
+    def test_get_list(self):
+        received = []
+
+        def receiver(sender, resource, request, timer, **kwargs):
+            received.append((sender, timer))
+
+        request_timed.connect(receiver)
+        self.addCleanup(request_timed.disconnect, receiver)
+
+        request, resp = self.get_list(TimedNoteResource())
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.has_header('Server-Timing'))
+        self.assertFalse(hasattr(request, '_tastypie_timer'))
+
+        stats = TimedNoteResource._meta.metrics.get_stats()['timednotes GET']
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['queries'], 2)
+        self.assertEqual(sorted(stats['phases']), ['authenticate', 'dehydrate', 'query', 'render', 'serialize', 'throttle'])
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0][0], TimedNoteResource)
+        self.assertEqual(received[0][1].queries, 2)
+
+    def test_server_timing_header(self):
+        with override_settings(DEBUG=True):
+            request, resp = self.get_list(TimedNoteResource())
+
+        self.assertTrue(resp['Server-Timing'].startswith('authenticate;dur='))
+        self.assertTrue(resp['Server-Timing'].endswith(', queries;desc="2"'))
+
+    def test_opt_in(self):
+        with override_settings(DEBUG=True):
+            request, resp = self.get_list(UntimedNoteResource())
+            self.assertFalse(resp.has_header('Server-Timing'))
+
+            with override_settings(TASTYPIE_TIMING=True):
+                request, resp = self.get_list(UntimedNoteResource())
+                self.assertTrue(resp.has_header('Server-Timing'))
+
+            request, resp = self.get_list(TimedNoteResource())
+            self.assertTrue(resp.has_header('Server-Timing'))
+
+
+class ProfiledSubjectResource(ModelResource):
+    class Meta:
+        queryset = Subject.objects.all()
+        resource_name = 'subjects'
+        fields = ['name']
+
+
+class ProfiledSubjectNoteResource(ModelResource):
+    subjects = fields.ToManyField(ProfiledSubjectResource, 'subjects', full=True)
+
+    class Meta:
+        queryset = Note.objects.all()
+        resource_name = 'profiledsubjectnotes'
+        fields = ['title']
+
+
+class DehydrationProfilerTestCase(TestCase):
+    fixtures = ['note_testdata.json']
+
+    def test_profile(self):
+        resource = ProfiledNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+        resource.get_list(request)
+        self.assertEqual(get_dehydration_profiler(), None)
+
+        with DehydrationProfiler() as profiler:
+            self.assertEqual(get_dehydration_profiler(), profiler)
+            resource.get_list(request)
+            resource.get_list(request)
+
+        self.assertEqual(get_dehydration_profiler(), None)
+        stats = dict(((stat['resource'], stat['field'], stat['hook']), stat) for stat in profiler.get_stats())
+        self.assertEqual(sorted(stats, key=str), [
+            ('ProfiledNoteResource', 'author', 'ToOneField.dehydrate'),
+            ('ProfiledNoteResource', 'resource_uri', 'CharField.dehydrate'),
+            ('ProfiledNoteResource', 'resource_uri', 'dehydrate_resource_uri'),
+            ('ProfiledNoteResource', 'slug', 'CharField.dehydrate'),
+            ('ProfiledNoteResource', 'slug', 'dehydrate_slug'),
+            ('ProfiledNoteResource', 'title', 'CharField.dehydrate'),
+            ('ProfiledNoteResource', None, 'dehydrate'),
+            ('ProfiledUserResource', 'resource_uri', 'CharField.dehydrate'),
+            ('ProfiledUserResource', 'resource_uri', 'dehydrate_resource_uri'),
+            ('ProfiledUserResource', 'username', 'CharField.dehydrate'),
+            ('ProfiledUserResource', None, 'dehydrate'),
+        ])
+
+        # Six notes, twice.
+        self.assertEqual(stats[('ProfiledNoteResource', 'title', 'CharField.dehydrate')]['calls'], 12)
+        self.assertEqual(stats[('ProfiledNoteResource', 'title', 'CharField.dehydrate')]['queries'], 0)
+        # A query for each author.
+        self.assertEqual(stats[('ProfiledNoteResource', 'author', 'ToOneField.dehydrate')]['queries'], 12)
+        # The two authors are only dehydrated once per request.
+        self.assertEqual(stats[('ProfiledUserResource', 'username', 'CharField.dehydrate')]['calls'], 4)
+
+        table = profiler.format_table(limit=2).split('\n')
+        self.assertEqual(len(table), 3)
+        self.assertTrue(table[0].startswith('resource'))
+
+        profiler.reset()
+        self.assertEqual(profiler.get_stats(), [])
+
+    def test_nested(self):
+        resource = ProfiledNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with DehydrationProfiler() as outer:
+            with DehydrationProfiler() as inner:
+                resource.get_list(request)
+
+            self.assertEqual(get_dehydration_profiler(), outer)
+
+        self.assertEqual(outer.get_stats(), [])
+        queries = sum(stat['queries'] for stat in inner.get_stats() if stat['hook'] == 'ToOneField.dehydrate')
+        self.assertEqual(queries, 6)
+
+    def test_other_thread(self):
+        resource = ProfiledNoteResource()
+
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        def dehydrate():
+            try:
+                get_dehydration_profiler().measure(resource, 'title', 'query', query)
+            finally:
+                connections.close_all()
+
+        with DehydrationProfiler() as profiler:
+            # Like ``sync_to_async``, run it in another thread with a copy of
+            # the context.
+            thread = threading.Thread(target=copy_context().run, args=(dehydrate,))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(profiler.get_stats()[0]['queries'], 1)
+
+    def test_dehydrate_many(self):
+        subject = Subject.objects.create(name='Cooking', url='http://example.com/cooking')
+        subject.notes.add(*Note.objects.all())
+        resource = ProfiledSubjectNoteResource()
+        request = HttpRequest()
+        request.method = 'GET'
+
+        with DehydrationProfiler() as profiler:
+            resource.get_list(request)
+
+        stats = dict(((stat['resource'], stat['field'], stat['hook']), stat) for stat in profiler.get_stats())
+        # The subjects are dehydrated for the whole page at once, in a query.
+        stat = stats[('ProfiledSubjectNoteResource', 'subjects', 'ToManyField.dehydrate_many')]
+        self.assertEqual(stat['calls'], 1)
+        self.assertEqual(stat['queries'], 1)
+        self.assertNotIn(('ProfiledSubjectNoteResource', 'subjects', 'ToManyField.dehydrate'), stats)
+        # The one subject is only dehydrated once.
+        self.assertEqual(stats[('ProfiledSubjectResource', 'name', 'CharField.dehydrate')]['calls'], 1)
@@ -7,6 +7,7 @@ from django.test import TestCase
 
 from tastypie.exceptions import BadRequest
 from tastypie.serializers import Serializer
+from tastypie.utils.imports import LazyImports, optional_import
 from tastypie.utils.mime import determine_format, build_content_type
 from tastypie.utils.urls import trailing_slash
 from tastypie.utils.timezone import now
@@ -124,3 +125,38 @@ class TimezoneTestCase(TestCase):
 
         with mock.patch('django.utils.timezone.now', return_value=without_tz):
             self.assertEqual(now().isoformat(), '2013-08-07T22:54:52')
+
+
+class LazyImportsTestCase(TestCase):
+    def setUp(self):
+        self.loads = []
+
+        def load():
+            self.loads.append(1)
+            return {'fake': 'module', 'other': None}
+
+        self.namespace = {'__name__': 'fakemodule'}
+        self.imports = LazyImports(self.namespace, {'fake': load, 'other': load})
+
+    def test_get(self):
+        self.assertEqual(self.namespace, {'__name__': 'fakemodule'})
+        self.assertEqual(self.imports.get('fake'), 'module')
+        self.assertEqual(self.imports.get('other'), None)
+        self.assertEqual(self.imports.get('fake'), 'module')
+        self.assertEqual(len(self.loads), 1)
+        self.assertEqual(self.namespace['fake'], 'module')
+        self.assertRaises(AttributeError, self.imports.get, 'missing')
+
+    def test_is_available(self):
+        self.assertTrue(self.imports.is_available('json', 'json'))
+        self.assertFalse(self.imports.is_available('json', 'json', 'not_a_real_module'))
+        self.assertEqual(self.loads, [])
+
+        # Once imported, the result is used instead.
+        self.imports.get('fake')
+        self.assertTrue(self.imports.is_available('fake', 'not_a_real_module'))
+        self.assertFalse(self.imports.is_available('other', 'json'))
+
+    def test_optional_import(self):
+        self.assertEqual(optional_import('json').__name__, 'json')
+        self.assertEqual(optional_import('not_a_real_module'), None)
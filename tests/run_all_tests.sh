@@ -9,11 +9,13 @@ major=${arrIN[0]}
 minor=${arrIN[1]}
 
 ALL="core customuser basic alphanumeric slashless namespaced related validation gis gis_spatialite content_gfk authorization"
+# Not run by default, as they take a while.
+OPTIONAL="benchmarks"
 
 if [ $# -eq 0 ]; then
     PYTESTPATHS=$ALL
 elif [ $1 == '-h' ]; then
-    echo "Valid arguments are: $ALL"
+    echo "Valid arguments are: $ALL $OPTIONAL"
 else
     PYTESTPATHS=$@
 fi
@@ -0,0 +1,46 @@
+import os
+
+from settings import *  # noqa
+INSTALLED_APPS.append('django.contrib.sessions')
+INSTALLED_APPS.append('profilingtests')
+INSTALLED_APPS.append('benchmarks')
+
+ROOT_URLCONF = 'benchmarks.urls'
+
+# Benchmarks measure the API, not query logging or password hashing.
+DEBUG = False
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# The number of notes each benchmark is run against.
+BENCHMARK_SIZES = (10, 100, 500)
+# How many times each request is timed. The best run is reported.
+BENCHMARK_REPEAT = 5
+BENCHMARK_BASELINES = os.path.join(BASE_PATH, 'benchmarks', 'baselines.json')
+# Set ``BENCHMARK_UPDATE=1`` to (re)write the baselines with this run's
+# results, rather than comparing against them.
+BENCHMARK_UPDATE = bool(os.environ.get('BENCHMARK_UPDATE'))
+# How much slower/bigger than the baseline a run may be before it fails.
+# Times are compared relative to a calibration workload run on the same
+# machine, so the baselines don't depend on where they were recorded.
+BENCHMARK_TIME_TOLERANCE = 2.0
+BENCHMARK_MEMORY_TOLERANCE = 1.5
+# Where the results of each run are written.
+BENCHMARK_REPORT = os.environ.get('BENCHMARK_REPORT', os.path.join(BASE_PATH, 'benchmarks', 'report.txt'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': True,
+    'handlers': {
+        'simple': {
+            'level': 'ERROR',
+            'class': 'core.utils.SimpleHandler',
+        }
+    },
+    'loggers': {
+        'django.request': {
+            'handlers': ['simple'],
+            'level': 'ERROR',
+            'propagate': False,
+        },
+    }
+}